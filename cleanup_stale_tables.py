@@ -0,0 +1,32 @@
+# -------------------------------
+# Clean Up Stale Test Tables
+# -------------------------------
+# Finds tables left behind by crashed or interrupted runs (by name prefix)
+# and removes them in parallel.
+#
+# Usage:
+#   python cleanup_stale_tables.py                    # list stale tables (dry run)
+#   python cleanup_stale_tables.py --delete           # remove them
+#   python cleanup_stale_tables.py --prefix delta_dml --delete
+#   python cleanup_stale_tables.py --cluster --delete # inside the Kubernetes cluster
+
+import argparse
+
+from tests.cleanup import STALE_TABLE_PREFIX
+
+parser = argparse.ArgumentParser(description="Find and remove stale delta-rs test tables")
+parser.add_argument("--prefix", default=STALE_TABLE_PREFIX,
+                    help=f"table name prefix to match (default: {STALE_TABLE_PREFIX})")
+parser.add_argument("--delete", action="store_true", help="remove the stale tables (default: list only)")
+parser.add_argument("--cluster", action="store_true", help="use the in-cluster configuration (no login)")
+args = parser.parse_args()
+
+if args.cluster:
+    from tests.config_cluster import cleanup_stale_tables
+else:
+    from tests.config import cleanup_stale_tables
+    from tests.session import login
+
+    login()
+
+cleanup_stale_tables(prefix=args.prefix, dry_run=not args.delete)
@@ -53,17 +53,15 @@ echo "[2/2] Copying test files to pod..."
 
 # Copy main runner
 kubectl cp -c "$CONTAINER" "$SCRIPT_DIR/run_cluster.py" "$NAMESPACE/$POD_NAME:$REMOTE_DIR/run_cluster.py"
+kubectl cp -c "$CONTAINER" "$SCRIPT_DIR/cleanup_stale_tables.py" "$NAMESPACE/$POD_NAME:$REMOTE_DIR/cleanup_stale_tables.py"
 
 # Copy test modules
 kubectl cp -c "$CONTAINER" "$SCRIPT_DIR/tests/__init__.py" "$NAMESPACE/$POD_NAME:$REMOTE_DIR/tests/__init__.py" 2>/dev/null || \
     kubectl exec -n "$NAMESPACE" -c "$CONTAINER" "$POD_NAME" -- touch "$REMOTE_DIR/tests/__init__.py"
-kubectl cp -c "$CONTAINER" "$SCRIPT_DIR/tests/config.py" "$NAMESPACE/$POD_NAME:$REMOTE_DIR/tests/config.py"
-kubectl cp -c "$CONTAINER" "$SCRIPT_DIR/tests/config_cluster.py" "$NAMESPACE/$POD_NAME:$REMOTE_DIR/tests/config_cluster.py"
-kubectl cp -c "$CONTAINER" "$SCRIPT_DIR/tests/test_write_operations.py" "$NAMESPACE/$POD_NAME:$REMOTE_DIR/tests/test_write_operations.py"
-kubectl cp -c "$CONTAINER" "$SCRIPT_DIR/tests/test_read_operations.py" "$NAMESPACE/$POD_NAME:$REMOTE_DIR/tests/test_read_operations.py"
-kubectl cp -c "$CONTAINER" "$SCRIPT_DIR/tests/test_dml_operations.py" "$NAMESPACE/$POD_NAME:$REMOTE_DIR/tests/test_dml_operations.py"
-kubectl cp -c "$CONTAINER" "$SCRIPT_DIR/tests/test_maintenance.py" "$NAMESPACE/$POD_NAME:$REMOTE_DIR/tests/test_maintenance.py"
-kubectl cp -c "$CONTAINER" "$SCRIPT_DIR/tests/test_advanced.py" "$NAMESPACE/$POD_NAME:$REMOTE_DIR/tests/test_advanced.py"
+for module in "$SCRIPT_DIR"/tests/*.py; do
+    [ "$(basename "$module")" = "__init__.py" ] && continue
+    kubectl cp -c "$CONTAINER" "$module" "$NAMESPACE/$POD_NAME:$REMOTE_DIR/tests/$(basename "$module")"
+done
 
 echo ""
 echo "=============================================="
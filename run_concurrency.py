@@ -0,0 +1,14 @@
+# -------------------------------
+# Concurrency Test Runner
+# -------------------------------
+# Tests: concurrent readers and writers (append, merge, optimize) on one table
+#
+# The tests start worker processes with the "spawn" method, which re-imports
+# this script in every worker, so all work happens under the __main__ guard.
+
+import sys
+
+from tests.runner import main
+
+if __name__ == "__main__":
+    sys.exit(main(default_categories=["concurrency"], title="CONCURRENCY TESTS"))
@@ -3,7 +3,9 @@
 # -------------------------------
 # Runs feature store sanity check tests with Delta format
 
-from tests.test_feature_store import run_all_feature_store_tests
+import sys
+
+from tests.runner import main
 
 if __name__ == "__main__":
-    run_all_feature_store_tests()
+    sys.exit(main(default_categories=["feature_store"], title="FEATURE STORE TESTS"))
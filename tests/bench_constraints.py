@@ -0,0 +1,211 @@
+# -------------------------------
+# Benchmark: Constraint Enforcement Overhead
+# -------------------------------
+# Benchmarks: append and merge throughput as the number and complexity of
+# CHECK constraints grows; cost of adding a constraint to a large table
+#
+# Every write evaluates all CHECK constraints against the new rows, and
+# dt.alter.add_constraint first validates the expression against all
+# existing data. Throughput is compared against the same table without
+# constraints.
+
+from tests.config import (
+    get_table_path,
+    cleanup_test_tables,
+    scaled,
+)
+from tests.session import login
+from tests.bench_utils import timed
+from tests.fixture_cache import clone_fixture
+
+import pyarrow as pa
+from deltalake import write_deltalake, DeltaTable
+from deltalake.exceptions import DeltaError
+
+NUM_VALUE_COLUMNS = 10
+
+# Constraint expression templates by complexity; {a} and {b} are value columns.
+# delta-rs cannot serialize every SQL function into the table metadata (e.g.
+# length() fails with "Unable to convert expression to string")
+CONSTRAINT_TEMPLATES = {
+    "simple": "{a} >= 0",
+    "range": "{a} >= 0 AND {a} < 1000000000000 AND {b} - {a} > -1000000000000",
+    "string": "substr(label, 1, 4) = 'row_' AND label LIKE 'row_%' AND {a} % 1 = 0",
+}
+
+
+def _make_batch(first_id: int, num_rows: int) -> pa.Table:
+    """Rows with an id, NUM_VALUE_COLUMNS non-negative int columns and a label; satisfy all templates."""
+    ids = pa.array(range(first_id, first_id + num_rows), pa.int64())
+    columns = {"id": ids}
+    for i in range(NUM_VALUE_COLUMNS):
+        columns[f"c{i}"] = pa.array(range(i, i + num_rows), pa.int64())
+    columns["label"] = pa.array([f"row_{i}" for i in range(first_id, first_id + num_rows)])
+    return pa.table(columns)
+
+
+def _write_rows(table_path: str, num_rows: int):
+    """Fixture: a table of num_rows rows that satisfy all templates."""
+    write_deltalake(table_path, _make_batch(0, num_rows), mode="overwrite")
+
+
+def _constraints(complexity: str, count: int) -> dict:
+    """Build `count` named constraints of one complexity, spread over the value columns."""
+    template = CONSTRAINT_TEMPLATES[complexity]
+    return {
+        f"chk_{complexity}_{i}": template.format(a=f"c{i % NUM_VALUE_COLUMNS}", b=f"c{(i + 1) % NUM_VALUE_COLUMNS}")
+        for i in range(count)
+    }
+
+
+def _measure_writes(table_path: str, rows: int, batch_rows: int, writes: int) -> dict:
+    """Time appends of new rows and merges that update half and insert half of a batch."""
+    append_s = 0.0
+    for w in range(writes):
+        elapsed, _ = timed(write_deltalake, table_path, _make_batch(rows + w * batch_rows, batch_rows), mode="append")
+        append_s += elapsed
+    rows += writes * batch_rows
+
+    merge_s = 0.0
+    for _ in range(writes):
+        # Half of the batch matches existing ids, half is new
+        source = _make_batch(rows - batch_rows // 2, batch_rows)
+        merger = (
+            DeltaTable(table_path)
+            .merge(source, predicate="t.id = s.id", source_alias="s", target_alias="t")
+            .when_matched_update_all()
+            .when_not_matched_insert_all()
+        )
+        elapsed, _ = timed(merger.execute)
+        merge_s += elapsed
+        rows += batch_rows - batch_rows // 2
+
+    return {
+        "append_rows_per_s": writes * batch_rows / append_s,
+        "merge_rows_per_s": writes * batch_rows / merge_s,
+    }
+
+
+def bench_constraint_write_overhead(counts=(0, 1, 5, 20), complexities=("simple", "range", "string"),
+                                    initial_rows: int = 100_000, batch_rows: int = 50_000, writes: int = 5):
+    """Benchmark append and merge throughput with growing numbers of CHECK constraints.
+
+    Args:
+        counts: Numbers of constraints per table (0 is the baseline)
+        complexities: Constraint templates to use (see CONSTRAINT_TEMPLATES)
+        initial_rows: Rows in each table before constraints are added (multiplied by the scale factor)
+        batch_rows: Rows per append and per merge source (multiplied by the scale factor)
+        writes: Appends and merges timed per table
+    """
+    print("\n=== Benchmark: Constraint Write Overhead ===")
+
+    initial_rows = scaled(initial_rows)
+    batch_rows = scaled(batch_rows)
+    results = {}
+    baseline = None
+
+    for complexity in complexities:
+        for count in counts:
+            if count == 0 and baseline is not None:
+                results[(complexity, 0)] = baseline
+                continue
+
+            table_path = get_table_path(f"delta_bench_constraints_{complexity}_{count}")
+            write_deltalake(table_path, _make_batch(0, initial_rows), mode="overwrite")
+            add_s = 0.0
+            if count:
+                add_s, _ = timed(DeltaTable(table_path).alter.add_constraint, _constraints(complexity, count))
+
+            result = _measure_writes(table_path, initial_rows, batch_rows, writes)
+            result["add_constraints_s"] = add_s
+            if count == 0:
+                baseline = result
+            results[(complexity, count)] = result
+
+            slowdown = ""
+            if baseline and count:
+                slowdown = (f" ({result['append_rows_per_s'] / baseline['append_rows_per_s']:.0%} / "
+                            f"{result['merge_rows_per_s'] / baseline['merge_rows_per_s']:.0%} of baseline)")
+            print(f"[BENCH] {count} {complexity} constraints: add={add_s * 1000:.1f}ms "
+                  f"append={result['append_rows_per_s']:.0f} rows/s merge={result['merge_rows_per_s']:.0f} rows/s"
+                  f"{slowdown}")
+
+    print(f"[PASS] Benchmarked write throughput with {len(results)} constraint configurations")
+    return {"constraint_write_overhead": {f"{c}_{n}": r for (c, n), r in results.items()}}
+
+
+def bench_constraint_validation(sizes=(100_000, 1_000_000, 5_000_000), complexities=("simple", "range", "string")):
+    """Benchmark adding a constraint to existing tables of growing size.
+
+    add_constraint scans all existing data to check it satisfies the
+    expression before committing.
+
+    Args:
+        sizes: Table sizes in rows (multiplied by the scale factor)
+        complexities: Constraint templates to add (see CONSTRAINT_TEMPLATES)
+    """
+    print("\n=== Benchmark: Constraint Validation on Existing Data ===")
+
+    results = {}
+    for size in sizes:
+        num_rows = scaled(size)
+        table_path = clone_fixture(_write_rows, f"delta_bench_constraint_validation_{size}", num_rows=num_rows)
+
+        for complexity in complexities:
+            add_s, _ = timed(DeltaTable(table_path).alter.add_constraint, _constraints(complexity, 1))
+            results[f"{complexity}_{num_rows}"] = {"rows": num_rows, "add_s": add_s}
+            print(f"[BENCH] add {complexity} constraint on {num_rows} rows: {add_s * 1000:.1f}ms "
+                  f"({num_rows / add_s:.0f} rows/s validated)")
+
+        # A violating constraint must be rejected after scanning, without a commit
+        version_before = DeltaTable(table_path).version()
+        try:
+            DeltaTable(table_path).alter.add_constraint({"chk_violated": "c0 < 0"})
+        except DeltaError as e:
+            assert "failed validation check" in str(e), f"Constraint rejected for another reason: {e}"
+            print(f"[PASS] Violating constraint rejected: {str(e).splitlines()[0]}")
+        else:
+            raise AssertionError("Constraint violated by existing data was accepted")
+        version_after = DeltaTable(table_path).version()
+        assert version_after == version_before, \
+            f"Rejected constraint committed version {version_after} (was {version_before})"
+
+    print(f"[PASS] Benchmarked constraint validation on {len(sizes)} table sizes")
+    return {"constraint_validation": results}
+
+
+def run_all_constraint_benchmarks():
+    """Run all constraint benchmarks."""
+    print("\n" + "=" * 50)
+    print("CONSTRAINT BENCHMARKS")
+    print("=" * 50)
+
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
+
+    benchmarks = [
+        bench_constraint_write_overhead,
+        bench_constraint_validation,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for benchmark in benchmarks:
+        try:
+            benchmark()
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {benchmark.__name__}: {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print(f"CONSTRAINT BENCHMARKS COMPLETE: {passed} passed, {failed} failed")
+    print("=" * 50)
+
+    # Cleanup test tables
+    cleanup_test_tables()
+
+
+if __name__ == "__main__":
+    run_all_constraint_benchmarks()
@@ -0,0 +1,343 @@
+# -------------------------------
+# Benchmark: Feature Group Ingest and Read
+# -------------------------------
+# Benchmarks: feature group insert latency, offline materialization time and
+# offline read throughput, swept over DataFrame sizes; online/offline read and
+# feature vector lookup latency under concurrency; freshness lag from insert
+# until the data is visible offline and online under steady ingest
+#
+# Feature group ingest latency is an SLA, so the insert latency percentiles
+# are the headline numbers. Runs against Hopsworks (remote backend) or the
+# local stand-in in tests/local_hopsworks.py (local backend).
+
+from tests.config import scaled
+from tests.session import login
+from tests.bench_utils import timed, summarize_latencies, format_latency_summary
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+def _feature_frame(first_id: int, num_rows: int) -> pd.DataFrame:
+    """Build a feature DataFrame with a primary key, numeric and string features."""
+    ids = np.arange(first_id, first_id + num_rows, dtype=np.int64)
+    return pd.DataFrame({
+        "id": ids,
+        "amount": ids * 0.5,
+        "category": pd.Series(ids % 10).astype(str).radd("cat_"),
+    })
+
+
+def _benchmark_size(fs, num_rows: int, inserts: int, online_enabled: bool) -> dict:
+    """Insert `inserts` batches of new keys into a fresh feature group, then read it back."""
+    mode = "online" if online_enabled else "offline"
+    name = f"bench_ingest_{mode}_{num_rows}"
+    fg = fs.get_or_create_feature_group(
+        name=name,
+        version=1,
+        primary_key=["id"],
+        online_enabled=online_enabled,
+        time_travel_format="DELTA",
+    )
+
+    insert_latencies = []
+    materialization_latencies = []
+    try:
+        for batch in range(inserts):
+            df = _feature_frame(batch * num_rows, num_rows)
+            insert_s, (job, _) = timed(
+                fg.insert,
+                df,
+                wait=False,
+                write_options={"start_offline_materialization": online_enabled},
+            )
+            insert_latencies.append(insert_s)
+
+            # Offline data is only complete once the materialization job finished
+            if job is not None:
+                materialization_s, state = timed(job.get_final_state)
+                if state != "SUCCEEDED":
+                    raise Exception(f"Offline materialization job ended in state {state}")
+                materialization_latencies.append(materialization_s)
+
+        read_s, result = timed(fg.read, online=False)
+        expected_rows = inserts * num_rows
+        assert len(result) == expected_rows, f"Expected {expected_rows} rows, got {len(result)}"
+    finally:
+        fg.delete()
+
+    insert_summary = summarize_latencies(insert_latencies)
+    materialization_summary = summarize_latencies(materialization_latencies)
+    print(f"[BENCH] {mode} fg, {num_rows} rows insert: {format_latency_summary(insert_summary)} "
+          f"({num_rows / insert_summary['mean']:.0f} rows/s)")
+    if materialization_latencies:
+        print(f"[BENCH] {mode} fg, {num_rows} rows materialization: "
+              f"{format_latency_summary(materialization_summary)}")
+    print(f"[BENCH] {mode} fg, {num_rows} rows read: {expected_rows} rows in {read_s * 1000:.1f}ms "
+          f"({expected_rows / read_s:.0f} rows/s)")
+
+    return {
+        "insert": insert_summary,
+        "materialization": materialization_summary,
+        "read_s": read_s,
+        "read_rows_per_s": expected_rows / read_s,
+    }
+
+
+def bench_feature_group_ingest(project, sizes=(1_000, 10_000, 100_000), inserts: int = 3,
+                               online_modes=(False, True), max_insert_p95_s: float | None = None):
+    """Benchmark feature group inserts and offline reads for several DataFrame sizes.
+
+    Args:
+        project: Hopsworks project (or the local stand-in)
+        sizes: Rows per insert to sweep (multiplied by the scale factor)
+        inserts: Inserts per size, each with new primary keys
+        online_modes: online_enabled values to sweep; online-enabled feature
+            groups start an offline materialization job per insert, which is
+            timed separately
+        max_insert_p95_s: Fail if the p95 insert latency of any size exceeds this
+    """
+    print("\n=== Benchmark: Feature Group Ingest and Read ===")
+
+    fs = project.get_feature_store()
+    results = {}
+
+    for online_enabled in online_modes:
+        mode = "online" if online_enabled else "offline"
+        results[mode] = {}
+        for size in sizes:
+            num_rows = scaled(size)
+            results[mode][num_rows] = _benchmark_size(fs, num_rows, inserts, online_enabled)
+
+    if max_insert_p95_s is not None:
+        slow = {
+            f"{mode} {rows}": r["insert"]["p95"] for mode, by_size in results.items() for rows, r in by_size.items()
+            if r["insert"]["p95"] > max_insert_p95_s
+        }
+        assert not slow, f"Insert p95 above {max_insert_p95_s}s for sizes: {slow}"
+        print(f"[PASS] Insert p95 within {max_insert_p95_s}s for all sizes")
+
+    print(f"[PASS] Benchmarked feature group ingest for {len(sizes)} DataFrame sizes "
+          f"in {len(online_modes)} online modes")
+    return {"feature_group_ingest": results}
+
+
+def _timed_calls(fn, args_list: list[tuple], concurrency: int) -> list[float]:
+    """Call fn once per args tuple from `concurrency` threads; returns the latencies."""
+    def call(args):
+        return timed(fn, *args)[0]
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(call, args_list))
+
+
+def bench_read_latency(project, num_rows: int = 10_000, reads: int = 50, lookups: int = 500,
+                       concurrency: int = 8):
+    """Benchmark offline reads, online reads and feature vector lookups under concurrency.
+
+    Args:
+        project: Hopsworks project (or the local stand-in)
+        num_rows: Rows in the online-enabled feature group (multiplied by the scale factor)
+        reads: Full reads per mode (online and offline)
+        lookups: Single-entity feature vector lookups (random primary keys)
+        concurrency: Threads issuing requests at the same time
+    """
+    print("\n=== Benchmark: Online vs Offline Read Latency ===")
+
+    fs = project.get_feature_store()
+    num_rows = scaled(num_rows)
+    fg = fs.get_or_create_feature_group(
+        name="bench_read_latency",
+        version=1,
+        primary_key=["id"],
+        online_enabled=True,
+        time_travel_format="DELTA",
+    )
+    fv = None
+    results = {}
+
+    try:
+        _, (job, _) = timed(fg.insert, _feature_frame(0, num_rows), wait=True)
+        if job is not None and job.get_final_state() != "SUCCEEDED":
+            raise Exception(f"Offline materialization job ended in state {job.get_final_state()}")
+
+        fv = fs.create_feature_view(name="bench_read_latency_fv", version=1, query=fg.select_all())
+        fv.init_serving()
+
+        for online in (False, True):
+            latencies = _timed_calls(lambda: fg.read(online=online), [()] * reads, concurrency)
+            results["online_read" if online else "offline_read"] = summarize_latencies(latencies)
+
+        keys = [({"id": random.randrange(num_rows)},) for _ in range(lookups)]
+        results["feature_vector"] = summarize_latencies(_timed_calls(fv.get_feature_vector, keys, concurrency))
+    finally:
+        if fv is not None:
+            fv.delete()
+        fg.delete()
+
+    for name, summary in results.items():
+        print(f"[BENCH] {name} ({concurrency} threads): {format_latency_summary(summary)}")
+
+    print(f"[PASS] Benchmarked read latency on {num_rows} rows with {concurrency} threads")
+    return {"read_latency": results}
+
+
+def _feature_vector_found(fv, entry: dict) -> bool:
+    """Whether an online lookup of entry returns a feature vector."""
+    try:
+        vector = fv.get_feature_vector(entry)
+    except Exception:
+        return False
+    return bool(vector) and any(value is not None for value in vector)
+
+
+def bench_freshness_lag(project, duration_s: float = 30.0, ingest_interval_s: float = 1.0,
+                        batch_rows: int = 1_000, poll_interval_s: float = 0.2, grace_s: float = 120.0):
+    """Benchmark the lag from fg.insert until the rows are visible offline and online.
+
+    One thread inserts a batch of new keys every ingest_interval_s (without
+    waiting for materialization); two pollers record when each batch shows
+    up in offline reads and in online feature vector lookups (of its first,
+    middle and last key, since online ingestion can make a batch visible in
+    parts). The lag is measured from the start of the insert call.
+
+    Args:
+        project: Hopsworks project (or the local stand-in)
+        duration_s: How long to keep ingesting
+        ingest_interval_s: Seconds between insert starts
+        batch_rows: Rows per insert (multiplied by the scale factor)
+        poll_interval_s: Seconds between visibility checks
+        grace_s: How long to wait after ingest for the last batches to appear
+    """
+    print("\n=== Benchmark: Freshness Lag under Steady Ingest ===")
+
+    fs = project.get_feature_store()
+    batch_rows = scaled(batch_rows)
+    fg = fs.get_or_create_feature_group(
+        name="bench_freshness",
+        version=1,
+        primary_key=["id"],
+        online_enabled=True,
+        time_travel_format="DELTA",
+    )
+    fv = None
+    insert_started = {}       # batch -> perf_counter at insert start
+    insert_latencies = []
+    visible = {"offline": {}, "online": {}}  # batch -> lag seconds
+    ingest_done = threading.Event()
+
+    def ingest():
+        batch = 0
+        deadline = time.perf_counter() + duration_s
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            insert_started[batch] = started
+            df = _feature_frame(batch * batch_rows, batch_rows).assign(batch=batch)
+            fg.insert(df, wait=False, write_options={"start_offline_materialization": True})
+            insert_latencies.append(time.perf_counter() - started)
+            batch += 1
+            time.sleep(max(0.0, ingest_interval_s - (time.perf_counter() - started)))
+        ingest_done.set()
+
+    def pending(mode):
+        return [b for b in list(insert_started) if b not in visible[mode]]
+
+    def poll(mode, is_visible):
+        deadline = None
+        while True:
+            if ingest_done.is_set():
+                deadline = deadline or time.perf_counter() + grace_s
+                if not pending(mode) or time.perf_counter() > deadline:
+                    return
+            for batch in is_visible(pending(mode)):
+                visible[mode][batch] = time.perf_counter() - insert_started[batch]
+            time.sleep(poll_interval_s)
+
+    def offline_visible(batches):
+        if not batches:
+            return []
+        try:
+            present = set(fg.select(["batch"]).read(online=False)["batch"])
+        except Exception:
+            return []  # table not created yet
+        return [b for b in batches if b in present]
+
+    def online_visible(batches):
+        def found(batch):
+            first = batch * batch_rows
+            return all(_feature_vector_found(fv, {"id": first + offset})
+                       for offset in sorted({0, batch_rows // 2, batch_rows - 1}))
+        return [b for b in batches if found(b)]
+
+    try:
+        fv = fs.create_feature_view(name="bench_freshness_fv", version=1, query=fg.select_all())
+        fv.init_serving()
+
+        threads = [
+            threading.Thread(target=ingest),
+            threading.Thread(target=poll, args=("offline", offline_visible)),
+            threading.Thread(target=poll, args=("online", online_visible)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        if fv is not None:
+            fv.delete()
+        fg.delete()
+
+    results = {"insert": summarize_latencies(insert_latencies), "batches": len(insert_started)}
+    print(f"[BENCH] insert ({len(insert_started)} batches of {batch_rows} rows): "
+          f"{format_latency_summary(results['insert'])}")
+    for mode in ("offline", "online"):
+        results[f"{mode}_lag"] = summarize_latencies(list(visible[mode].values()))
+        missing = len(insert_started) - len(visible[mode])
+        print(f"[BENCH] {mode} freshness lag: {format_latency_summary(results[f'{mode}_lag'])}"
+              + (f" ({missing} batches not visible within {grace_s}s)" if missing else ""))
+        results[f"{mode}_missing"] = missing
+
+    assert results["offline_missing"] == 0, f"{results['offline_missing']} batches never became visible offline"
+    print(f"[PASS] Measured freshness lag over {duration_s}s of ingest")
+    return {"freshness_lag": results}
+
+
+def run_all_feature_store_benchmarks(project=None):
+    """Run all feature store benchmarks."""
+    print("\n" + "=" * 50)
+    print("FEATURE STORE BENCHMARKS")
+    print("=" * 50)
+
+    # Connect to Hopsworks if not provided
+    if project is None:
+        project = login()
+
+    benchmarks = [
+        bench_feature_group_ingest,
+        bench_read_latency,
+        bench_freshness_lag,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for benchmark in benchmarks:
+        try:
+            benchmark(project)
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {benchmark.__name__}: {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print(f"FEATURE STORE BENCHMARKS COMPLETE: {passed} passed, {failed} failed")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    run_all_feature_store_benchmarks()
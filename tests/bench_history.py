@@ -0,0 +1,149 @@
+# -------------------------------
+# Benchmark: History and Metadata Query Latency
+# -------------------------------
+# Benchmarks: dt.history(limit) and dt.metadata() as the _delta_log grows,
+# compared with the persisted commitInfo index in tests/history_index.py
+#
+# Audit and lineage tooling reads the commit history repeatedly. history()
+# reads commit files from the log on every call, so its cost grows with the
+# number of versions requested; the index pays that cost once (cold build)
+# and afterwards only reads the commits added since its last update.
+
+from tests.config import (
+    get_table_path,
+    cleanup_test_tables,
+    scaled,
+)
+from tests.session import login
+from tests.bench_utils import timed, summarize_latencies, format_latency_summary, delta_log_stats, resolve_filesystem
+from tests.history_index import update_history_index, query_history, drop_history_index
+
+import pyarrow as pa
+from pyarrow.fs import FileType
+from deltalake import write_deltalake, DeltaTable
+
+
+def _append(table_path: str, version: int):
+    """Append one small commit."""
+    write_deltalake(table_path, pa.table({"version": pa.array([version], pa.int64())}), mode="append")
+
+
+def _drop_table(table_path: str):
+    """Remove the table and its persisted history index, so the next append starts a new log."""
+    drop_history_index(table_path)
+    fs, path = resolve_filesystem(table_path)
+    if fs.get_file_info(path).type != FileType.NotFound:
+        fs.delete_dir(path)
+
+
+def _latencies(fn, repeats: int, *args, **kwargs) -> dict:
+    """Call fn `repeats` times and summarize the latencies."""
+    return summarize_latencies([timed(fn, *args, **kwargs)[0] for _ in range(repeats)])
+
+
+def bench_history_latency(log_lengths=(100, 1000, 5000), limits=(1, 10, 100, None), repeats: int = 5):
+    """Benchmark history and metadata queries against log length, with and without the index.
+
+    For each log length the table is recreated (and its index dropped) and
+    grown by single-row appends to that length, so repeated runs measure the
+    same logs. At each length: table load, dt.history(limit) for every limit, dt.metadata(),
+    a cold index build, an incremental index update after one more commit
+    and a warm index query are timed.
+
+    Args:
+        log_lengths: Numbers of commits in the log (multiplied by the scale factor)
+        limits: history() limits to time (None reads the whole history)
+        repeats: Calls timed per query
+    """
+    print("\n=== Benchmark: History and Metadata Query Latency ===")
+
+    table_path = get_table_path("delta_bench_history")
+    results = {}
+
+    try:
+        for log_length in log_lengths:
+            target = max(1, scaled(log_length))
+            _drop_table(table_path)
+            versions = 0
+            while versions < target:
+                _append(table_path, versions)
+                versions += 1
+
+            log = delta_log_stats(table_path)
+            load = _latencies(DeltaTable, repeats, table_path)
+            dt = DeltaTable(table_path)
+            stage = {
+                "commits": log["commit_files"],
+                "checkpoints": log["checkpoint_files"],
+                "load": load,
+                "metadata": _latencies(dt.metadata, repeats),
+                "history": {},
+            }
+            print(f"[BENCH] {versions} versions ({log['commit_files']} commits, "
+                  f"{log['checkpoint_files']} checkpoints): load {format_latency_summary(load)}")
+            print(f"[BENCH]   metadata(): {format_latency_summary(stage['metadata'])}")
+
+            for limit in limits:
+                summary = _latencies(dt.history, repeats, limit)
+                stage["history"][str(limit)] = summary
+                print(f"[BENCH]   history(limit={limit}): {format_latency_summary(summary)}")
+
+            drop_history_index(table_path)
+            stage["index_cold_s"], entries = timed(update_history_index, table_path)
+
+            _append(table_path, versions)
+            versions += 1
+            stage["index_incremental_s"], entries = timed(update_history_index, table_path)
+            stage["index_warm"] = _latencies(query_history, repeats, table_path, 10)
+            print(f"[BENCH]   index: cold build {stage['index_cold_s'] * 1000:.1f}ms, "
+                  f"incremental {stage['index_incremental_s'] * 1000:.1f}ms, "
+                  f"warm query(10) {format_latency_summary(stage['index_warm'])}")
+
+            # The index must agree with delta-rs
+            assert len(entries) == versions, f"Index has {len(entries)} entries for {versions} versions"
+            expected = [(h["version"], h.get("operation")) for h in DeltaTable(table_path).history(10)]
+            actual = [(h["version"], h.get("operation")) for h in query_history(table_path, 10)]
+            assert actual == expected, f"Index history {actual} differs from dt.history() {expected}"
+
+            results[versions] = stage
+    finally:
+        drop_history_index(table_path)
+
+    print(f"[PASS] Benchmarked history queries at {len(results)} log lengths; index matches dt.history()")
+    return {"history_latency": results}
+
+
+def run_all_history_benchmarks():
+    """Run all history benchmarks."""
+    print("\n" + "=" * 50)
+    print("HISTORY BENCHMARKS")
+    print("=" * 50)
+
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
+
+    benchmarks = [
+        bench_history_latency,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for benchmark in benchmarks:
+        try:
+            benchmark()
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {benchmark.__name__}: {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print(f"HISTORY BENCHMARKS COMPLETE: {passed} passed, {failed} failed")
+    print("=" * 50)
+
+    # Cleanup test tables
+    cleanup_test_tables()
+
+
+if __name__ == "__main__":
+    run_all_history_benchmarks()
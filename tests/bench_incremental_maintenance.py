@@ -0,0 +1,169 @@
+# -------------------------------
+# Benchmark: Incremental Maintenance
+# -------------------------------
+# Benchmarks: bounded-time, partition-by-partition compaction
+# (tests/incremental_maintenance.py) on a table with many small files spread
+# unevenly over its partitions: files fixed per minute per run, runs needed
+# to finish a pass, and the read latency of a concurrent reader compared to
+# the same reader without maintenance running.
+#
+# The reader runs in a thread of this process and loads the table afresh for
+# every scan, so it picks up each compaction commit.
+
+from tests.config import (
+    cleanup_test_tables,
+    scaled,
+)
+from tests.session import login
+from tests.bench_utils import timed, summarize_latencies, format_latency_summary
+from tests.fixture_cache import clone_fixture
+from tests.incremental_maintenance import compact_incrementally, drop_maintenance_state, partition_file_stats
+from tests.validation import assert_same_rows
+
+import random
+import threading
+import time
+
+import pyarrow as pa
+from deltalake import write_deltalake, DeltaTable
+
+
+def _write_skewed_small_files(table_path: str, partitions: int, appends: int, rows_per_file: int):
+    """Append small files to a random subset of partitions; low partition numbers are picked more often."""
+    rng = random.Random(0)
+    for k in range(appends):
+        chosen = sorted({min(int(rng.paretovariate(1.0)) - 1, partitions - 1) for _ in range(partitions // 4 + 1)})
+        parts = [f"p{p:04d}" for p in chosen for _ in range(rows_per_file)]
+        write_deltalake(table_path, pa.table({
+            "part": pa.array(parts),
+            "append": pa.array([k] * len(parts), pa.int64()),
+            "value": pa.array(range(len(parts)), pa.int64()),
+        }), mode="append", partition_by=["part"])
+
+
+def _reader(table_path: str, stop: threading.Event, latencies: list, errors: list):
+    """Scan the latest version of the table until stop is set."""
+    while not stop.is_set():
+        try:
+            latencies.append(timed(lambda: DeltaTable(table_path).to_pyarrow_table())[0])
+        except Exception as e:
+            errors.append(str(e))
+
+
+def _read_while(table_path: str, fn) -> tuple:
+    """Run fn() with a concurrent reader; returns (fn result, reader latency summary, reader errors)."""
+    stop = threading.Event()
+    latencies, errors = [], []
+    reader = threading.Thread(target=_reader, args=(table_path, stop, latencies, errors), daemon=True)
+    reader.start()
+    try:
+        result = fn()
+    finally:
+        stop.set()
+        reader.join()
+    return result, summarize_latencies(latencies), errors
+
+
+def bench_incremental_maintenance(partitions: int = 200, appends: int = 500, rows_per_file: int = 100,
+                                  time_budget_s: float = 5.0, baseline_s: float = 5.0, max_runs: int = 100):
+    """Benchmark incremental compaction runs of a fixed time budget until a pass is done.
+
+    Args:
+        partitions: Partitions of the table
+        appends: Appends writing the small files (multiplied by the scale factor)
+        rows_per_file: Rows per data file
+        time_budget_s: Time budget of each maintenance run
+        baseline_s: Seconds the reader runs alone before maintenance starts
+        max_runs: Give up after this many runs
+    """
+    print("\n=== Benchmark: Incremental Maintenance ===")
+
+    appends = scaled(appends)
+    build_s, table_path = timed(clone_fixture, _write_skewed_small_files, "delta_bench_incremental",
+                                partitions=partitions, appends=appends, rows_per_file=rows_per_file)
+    drop_maintenance_state(table_path)
+    dt = DeltaTable(table_path)
+    stats = partition_file_stats(dt)
+    files_before = len(dt.file_uris())
+    data_before = dt.to_pyarrow_dataset()
+    print(f"[SETUP] {files_before} files in {len(stats)} partitions prepared in {build_s:.1f}s, "
+          f"worst partition {stats[0]['small_files']} small files, median "
+          f"{stats[len(stats) // 2]['small_files']}")
+
+    _, baseline, baseline_errors = _read_while(table_path, lambda: time.sleep(baseline_s))
+    print(f"[BENCH] reads without maintenance: {format_latency_summary(baseline)}")
+
+    def maintain() -> list[dict]:
+        runs = []
+        while len(runs) < max_runs and (not runs or runs[-1]["pending"]):
+            result = compact_incrementally(table_path, time_budget_s)
+            fixed = result["files_removed"] - result["files_added"]
+            result["files_fixed_per_min"] = 60 * fixed / result["elapsed_s"] if result["elapsed_s"] else 0.0
+            print(f"[BENCH] run {len(runs) + 1}: {len(result['compacted'])} partitions, {fixed} files fixed "
+                  f"in {result['elapsed_s']:.2f}s ({result['files_fixed_per_min']:.0f} files/min), "
+                  f"{result['pending']} pending")
+            runs.append(result)
+        return runs
+
+    runs, during, reader_errors = _read_while(table_path, maintain)
+    print(f"[BENCH] reads during maintenance: {format_latency_summary(during)}")
+    if baseline["p50"]:
+        print(f"[BENCH] reader p50 slowdown: {100 * (during['p50'] / baseline['p50'] - 1):.1f}%")
+
+    assert not baseline_errors + reader_errors, f"Reader errors: {(baseline_errors + reader_errors)[:3]}"
+    assert runs[-1]["pending"] == 0, f"Pass not finished after {max_runs} runs"
+    # Budget estimates come from the measured throughput, so a run can still overrun a little
+    overrun = max(r["elapsed_s"] - time_budget_s for r in runs)
+    print(f"[BENCH] largest budget overrun: {max(overrun, 0.0):.2f}s")
+    dt = DeltaTable(table_path)
+    assert_same_rows(data_before, dt.to_pyarrow_dataset())
+
+    fixed = sum(r["files_removed"] - r["files_added"] for r in runs)
+    elapsed = sum(r["elapsed_s"] for r in runs)
+    print(f"[PASS] {fixed} files fixed in {len(runs)} runs of {time_budget_s:g}s budget "
+          f"({60 * fixed / elapsed:.0f} files/min overall), {len(dt.file_uris())} files left")
+    drop_maintenance_state(table_path)
+    return {
+        "files_before": files_before,
+        "runs": [{k: v for k, v in r.items() if k != "compacted"} for r in runs],
+        "files_fixed": fixed,
+        "files_fixed_per_min": 60 * fixed / elapsed if elapsed else 0.0,
+        "reads_baseline": baseline,
+        "reads_during_maintenance": during,
+    }
+
+
+def run_all_incremental_maintenance_benchmarks():
+    """Run all incremental maintenance benchmarks."""
+    print("\n" + "=" * 50)
+    print("INCREMENTAL MAINTENANCE BENCHMARKS")
+    print("=" * 50)
+
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
+
+    benchmarks = [
+        bench_incremental_maintenance,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for benchmark in benchmarks:
+        try:
+            benchmark()
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {benchmark.__name__}: {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print(f"INCREMENTAL MAINTENANCE BENCHMARKS COMPLETE: {passed} passed, {failed} failed")
+    print("=" * 50)
+
+    # Cleanup test tables
+    cleanup_test_tables()
+
+
+if __name__ == "__main__":
+    run_all_incremental_maintenance_benchmarks()
@@ -0,0 +1,210 @@
+# -------------------------------
+# Benchmark: Ingest and Maintenance Cycle
+# -------------------------------
+# Benchmarks: a production-like cycle of streaming appends, periodic
+# compaction, checkpoints and vacuum, run in simulated time
+#
+# Each iteration is one simulated minute with one append; compaction,
+# checkpoints and vacuum run when their simulated interval has passed.
+# Nothing sleeps, so days of operation run in minutes. At a fixed simulated
+# interval the driver samples table load latency, live and stored file
+# data file counts, _delta_log file count and size, and scan latency, giving
+# a timeline that shows how a maintenance schedule keeps (or fails to keep)
+# the table healthy.
+#
+# Vacuum and log cleanup cannot see simulated time, so both run with a zero
+# retention period at the vacuum interval: vacuum deletes every data file
+# removed before it, and cleanup_metadata every log file older than the last
+# checkpoint. Log cleanup after checkpoints is disabled on the table
+# (delta.enableExpiredLogCleanup), so only the schedule removes log files.
+
+from tests.config import (
+    get_table_path,
+    cleanup_test_tables,
+    scaled,
+)
+from tests.session import login
+from tests.bench_utils import timed, delta_log_stats, directory_stats
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+from deltalake import write_deltalake, DeltaTable
+
+MINUTES_PER_HOUR = 60
+MINUTES_PER_DAY = 24 * MINUTES_PER_HOUR
+
+
+def _append_batch(table_path: str, minute: int, rows: int):
+    """Append the rows ingested in one simulated minute."""
+    first_id = minute * rows
+    data = pa.table({
+        "id": pa.array(range(first_id, first_id + rows), pa.int64()),
+        "minute": pa.array([minute] * rows, pa.int64()),
+        "value": pa.array([float(i) for i in range(rows)]),
+    })
+    write_deltalake(table_path, data, mode="append")
+
+
+def _sample(table_path: str, minute: int, total_rows: int) -> dict:
+    """Measure the table state at one point of the simulated timeline."""
+    load_s, dt = timed(DeltaTable, table_path)
+    log = delta_log_stats(table_path)
+    stored = directory_stats(table_path)
+
+    scan_s, table = timed(dt.to_pyarrow_table)
+    assert table.num_rows == total_rows, f"Expected {total_rows} rows at minute {minute}, got {table.num_rows}"
+    # Rows ingested during the last simulated hour, the typical freshness query
+    recent = ds.field("minute") >= minute - MINUTES_PER_HOUR
+    recent_scan_s, _ = timed(dt.to_pyarrow_dataset().to_table, filter=recent)
+
+    return {
+        "minute": minute,
+        "version": dt.version(),
+        "load_s": load_s,
+        "live_files": len(dt.file_uris()),
+        # Includes files removed by compaction but not vacuumed yet
+        "stored_data_files": stored["files"] - log["files"],
+        "log_files": log["files"],
+        "log_commits": log["commit_files"],
+        "log_checkpoints": log["checkpoint_files"],
+        "log_bytes": log["total_bytes"],
+        "scan_s": scan_s,
+        "recent_scan_s": recent_scan_s,
+    }
+
+
+def _print_sample(sample: dict):
+    day, minute = divmod(sample["minute"], MINUTES_PER_DAY)
+    print(f"[BENCH] day {day} {minute // 60:02d}:{minute % 60:02d} v{sample['version']}: "
+          f"load={sample['load_s'] * 1000:.1f}ms files={sample['live_files']} live/"
+          f"{sample['stored_data_files']} stored log={sample['log_files']} files ({sample['log_commits']} commits "
+          f"{sample['log_checkpoints']} checkpoints) {sample['log_bytes'] / 1024:.0f}KiB "
+          f"scan={sample['scan_s'] * 1000:.1f}ms recent={sample['recent_scan_s'] * 1000:.1f}ms")
+
+
+def bench_maintenance_cycle(simulated_days: float = 3, rows_per_append: int = 1_000,
+                            compact_every_min: int = MINUTES_PER_HOUR,
+                            checkpoint_every_min: int = 6 * MINUTES_PER_HOUR,
+                            vacuum_every_min: int = MINUTES_PER_DAY,
+                            sample_every_min: int = MINUTES_PER_HOUR,
+                            print_every_samples: int = 6):
+    """Run append -> compact -> checkpoint -> vacuum in simulated time and sample table health.
+
+    Automatic checkpoints are disabled on the table (delta.checkpointInterval),
+    so only the schedule creates them. Expired log files are cleaned up with
+    each vacuum. An interval of 0 disables that step,
+    e.g. to compare against a table that is never compacted.
+
+    Args:
+        simulated_days: Length of the simulated run, one append per simulated
+            minute (multiplied by the scale factor, like the rows per append)
+        rows_per_append: Rows per append (multiplied by the scale factor)
+        compact_every_min: Simulated minutes between optimize.compact() runs
+        checkpoint_every_min: Simulated minutes between create_checkpoint() runs
+        vacuum_every_min: Simulated minutes between vacuum and log cleanup runs
+        sample_every_min: Simulated minutes between table health samples
+        print_every_samples: Print every this many samples (all are returned)
+    """
+    print("\n=== Benchmark: Ingest and Maintenance Cycle ===")
+
+    table_path = get_table_path("delta_bench_maintenance_cycle")
+    rows_per_append = scaled(rows_per_append)
+    minutes = scaled(int(simulated_days * MINUTES_PER_DAY))
+    print(f"[SETUP] {minutes} simulated minutes, {rows_per_append} rows per append, compact every "
+          f"{compact_every_min}min, checkpoint every {checkpoint_every_min}min, vacuum every {vacuum_every_min}min")
+
+    write_deltalake(
+        table_path,
+        pa.table({"id": pa.array([], pa.int64()), "minute": pa.array([], pa.int64()),
+                  "value": pa.array([], pa.float64())}),
+        mode="overwrite",
+        configuration={
+            "delta.checkpointInterval": str(2 ** 31 - 1),
+            "delta.logRetentionDuration": "interval 0 seconds",
+            "delta.enableExpiredLogCleanup": "false",
+        },
+    )
+
+    def due(interval, minute):
+        return interval and minute % interval == 0
+
+    maintenance = {"append": [], "compact": [], "checkpoint": [], "vacuum": [], "log_cleanup": []}
+    # The empty table is the first sample, so there is one however short the run
+    timeline = [_sample(table_path, 0, 0)]
+    for minute in range(1, minutes + 1):
+        elapsed, _ = timed(_append_batch, table_path, minute, rows_per_append)
+        maintenance["append"].append(elapsed)
+
+        # Sample before this minute's maintenance, when the table is in its worst state
+        if minute % sample_every_min == 0:
+            timeline.append(_sample(table_path, minute, minute * rows_per_append))
+            if len(timeline) % print_every_samples == 0:
+                _print_sample(timeline[-1])
+
+        if due(compact_every_min, minute):
+            elapsed, _ = timed(DeltaTable(table_path).optimize.compact)
+            maintenance["compact"].append(elapsed)
+        if due(checkpoint_every_min, minute):
+            elapsed, _ = timed(DeltaTable(table_path).create_checkpoint)
+            maintenance["checkpoint"].append(elapsed)
+        if due(vacuum_every_min, minute):
+            elapsed, _ = timed(DeltaTable(table_path).vacuum, retention_hours=0, dry_run=False,
+                               enforce_retention_duration=False)
+            maintenance["vacuum"].append(elapsed)
+            elapsed, _ = timed(DeltaTable(table_path).cleanup_metadata)
+            maintenance["log_cleanup"].append(elapsed)
+
+    if timeline[-1]["minute"] != minutes:
+        timeline.append(_sample(table_path, minutes, minutes * rows_per_append))
+
+    for step, durations in maintenance.items():
+        if durations:
+            print(f"[BENCH] {step}: {len(durations)} runs, mean {sum(durations) / len(durations) * 1000:.1f}ms, "
+                  f"max {max(durations) * 1000:.1f}ms")
+
+    first, last = timeline[0], timeline[-1]
+    print(f"[INFO] Load latency {first['load_s'] * 1000:.1f}ms -> {last['load_s'] * 1000:.1f}ms, "
+          f"scan {first['scan_s'] * 1000:.1f}ms -> {last['scan_s'] * 1000:.1f}ms, "
+          f"live files {first['live_files']} -> {last['live_files']}, "
+          f"log files {first['log_files']} -> {last['log_files']}")
+    print(f"[PASS] Simulated {minutes} minutes of ingest and maintenance ({len(timeline)} samples)")
+    return {
+        "timeline": timeline,
+        "maintenance": {step: {"runs": len(d), "total_s": sum(d)} for step, d in maintenance.items()},
+    }
+
+
+def run_all_maintenance_cycle_benchmarks():
+    """Run all maintenance cycle benchmarks."""
+    print("\n" + "=" * 50)
+    print("MAINTENANCE CYCLE BENCHMARKS")
+    print("=" * 50)
+
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
+
+    benchmarks = [
+        bench_maintenance_cycle,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for benchmark in benchmarks:
+        try:
+            benchmark()
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {benchmark.__name__}: {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print(f"MAINTENANCE CYCLE BENCHMARKS COMPLETE: {passed} passed, {failed} failed")
+    print("=" * 50)
+
+    # Cleanup test tables
+    cleanup_test_tables()
+
+
+if __name__ == "__main__":
+    run_all_maintenance_cycle_benchmarks()
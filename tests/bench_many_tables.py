@@ -0,0 +1,162 @@
+# -------------------------------
+# Benchmark: Many Small Tables
+# -------------------------------
+# Benchmarks: aggregate throughput and latency of table creates, loads and
+# appends from many threads as the number of tables grows into the thousands
+#
+# A multi-tenant feature store holds thousands of small tables, so namenode
+# metadata operations (directory and file creates, lookups, listings), not
+# data size, limit scaling. Every table holds a few rows. Compare the flat
+# and nested table layouts with --table-layout (see tests/layout.py).
+#
+# Tables left by an earlier repetition, a warmup or an aborted run are removed
+# first, so creates always measure creating a new table.
+
+from tests.config import (
+    get_table_path,
+    get_created_tables,
+    find_stale_tables,
+    cleanup_test_tables,
+    scaled,
+)
+from tests.session import login
+from tests.bench_utils import timed, summarize_latencies, format_latency_summary, resolve_filesystem
+import tests.layout as layout
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+from pyarrow.fs import FileType
+from deltalake import write_deltalake, DeltaTable
+
+# Name prefix of the benchmark's tables
+TABLE_PREFIX = "delta_bench_many_"
+
+
+def _small_batch(table_index: int, rows: int) -> pa.Table:
+    return pa.table({
+        "id": pa.array(range(rows), pa.int64()),
+        "table": pa.array([table_index] * rows, pa.int64()),
+    })
+
+
+def _create(table_index: int, rows: int):
+    write_deltalake(get_table_path(f"{TABLE_PREFIX}{table_index}"), _small_batch(table_index, rows), mode="error")
+
+
+def _drop(table_name: str):
+    fs, path = resolve_filesystem(get_table_path(table_name, track=False))
+    if fs.get_file_info(path).type != FileType.NotFound:
+        fs.delete_dir(path)
+
+
+def _drop_existing_tables(concurrency: int) -> int:
+    """Remove the benchmark's tables left by earlier runs; returns how many were found."""
+    names = set(find_stale_tables(TABLE_PREFIX))
+    names.update(name for name in get_created_tables() if name.startswith(TABLE_PREFIX))
+    if names:
+        _run_concurrently(_drop, [(name,) for name in sorted(names)], concurrency)
+    return len(names)
+
+
+def _load(table_index: int):
+    DeltaTable(get_table_path(f"{TABLE_PREFIX}{table_index}")).version()
+
+
+def _append(table_index: int, rows: int):
+    write_deltalake(get_table_path(f"{TABLE_PREFIX}{table_index}"), _small_batch(table_index, rows), mode="append")
+
+
+def _run_concurrently(fn, args_list: list[tuple], concurrency: int) -> dict:
+    """Call fn once per args tuple from `concurrency` threads.
+
+    Returns:
+        Dict with the latency summary and the aggregate operations per second
+    """
+    def call(args):
+        return timed(fn, *args)[0]
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        wall_s, latencies = timed(lambda: list(pool.map(call, args_list)))
+    return {"latency": summarize_latencies(latencies), "ops_per_s": len(args_list) / wall_s}
+
+
+def bench_many_tables(table_counts=(100, 1_000, 5_000), operations: int = 500, concurrency: int = 32,
+                      rows_per_table: int = 10):
+    """Benchmark creates, loads and appends across a growing number of small tables.
+
+    At each stage the missing tables are created concurrently (timed), then
+    `operations` loads and `operations` appends hit randomly chosen distinct
+    tables.
+
+    Args:
+        table_counts: Numbers of tables after each stage (multiplied by the scale factor)
+        operations: Loads and appends per stage
+        concurrency: Threads issuing operations at the same time
+        rows_per_table: Rows per create and per append
+    """
+    print(f"\n=== Benchmark: Many Small Tables ({layout.TABLE_LAYOUT} layout) ===")
+
+    dropped = _drop_existing_tables(concurrency)
+    if dropped:
+        print(f"[SETUP] Removed {dropped} tables left by earlier runs")
+
+    rng = random.Random(0)
+    tables = 0
+    results = {}
+    for count in table_counts:
+        target = scaled(count)
+        stage = {}
+        if target > tables:
+            stage["create"] = _run_concurrently(
+                _create, [(i, rows_per_table) for i in range(tables, target)], concurrency)
+            tables = target
+
+        sample = rng.sample(range(tables), min(operations, tables))
+        stage["load"] = _run_concurrently(_load, [(i,) for i in sample], concurrency)
+        stage["append"] = _run_concurrently(_append, [(i, rows_per_table) for i in sample], concurrency)
+
+        for op, result in stage.items():
+            print(f"[BENCH] {tables} tables, {op}: {result['ops_per_s']:.1f} ops/s, "
+                  f"{format_latency_summary(result['latency'])}")
+        results[tables] = stage
+
+    print(f"[PASS] Benchmarked {tables} tables at {len(results)} stages with {concurrency} threads")
+    return {"layout": layout.TABLE_LAYOUT, "many_tables": results}
+
+
+def run_all_many_tables_benchmarks():
+    """Run all many-tables benchmarks."""
+    print("\n" + "=" * 50)
+    print("MANY TABLES BENCHMARKS")
+    print("=" * 50)
+
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
+
+    benchmarks = [
+        bench_many_tables,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for benchmark in benchmarks:
+        try:
+            benchmark()
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {benchmark.__name__}: {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print(f"MANY TABLES BENCHMARKS COMPLETE: {passed} passed, {failed} failed")
+    print("=" * 50)
+
+    # Cleanup test tables
+    cleanup_test_tables()
+
+
+if __name__ == "__main__":
+    run_all_many_tables_benchmarks()
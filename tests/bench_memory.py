@@ -0,0 +1,247 @@
+# -------------------------------
+# Benchmark: Peak Memory of DML and Maintenance
+# -------------------------------
+# Benchmarks: peak RSS of merge, compact and z-order as the table grows, and
+# how max_spill_size and max_concurrent_tasks change it
+#
+# These operations run in the delta-rs Rust runtime and can take far more
+# memory than the table size suggests, which is what gets a pod OOM-killed.
+# Every measurement runs in its own spawned process (run_in_process), so
+# allocator caches and buffers kept by earlier measurements do not hide the
+# peak. A measurement whose process gets killed (where memory runs out) or
+# whose operation fails is recorded with that outcome and the sweep goes on;
+# RSS is sampled with tests/memory.py.
+
+from tests.config import (
+    cleanup_test_tables,
+    scaled,
+)
+from tests.session import login
+from tests.fixture_cache import clone_fixture
+from tests.memory import sample_rss, format_memory, run_in_process, MiB
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from deltalake import write_deltalake, DeltaTable
+
+OPERATIONS = ("merge", "compact", "z_order")
+
+# Fraction of the table's rows in the merge source (half updates, half inserts)
+MERGE_SOURCE_FRACTION = 0.1
+
+
+def _write_small_files(table_path: str, num_rows: int, files: int):
+    """Write num_rows rows as `files` appends, so compact has files to rewrite."""
+    rows_per_file = max(1, num_rows // files)
+    for start in range(0, num_rows, rows_per_file):
+        ids = pa.array(range(start, min(start + rows_per_file, num_rows)), pa.int64())
+        write_deltalake(table_path, pa.table({
+            "id": ids,
+            "key": pc.bit_wise_and(ids, 1023),
+            "value": pc.cast(ids, pa.float64()),
+            "name": pc.cast(ids, pa.string()),
+        }), mode="append")
+
+
+def _merge_source(num_rows: int) -> pa.Table:
+    """Rows updating the last half and inserting as many new ids past the end."""
+    size = max(2, int(num_rows * MERGE_SOURCE_FRACTION))
+    ids = pa.array(range(num_rows - size // 2, num_rows - size // 2 + size), pa.int64())
+    return pa.table({
+        "id": ids,
+        "key": pc.bit_wise_and(ids, 1023),
+        "value": pc.cast(ids, pa.float64()),
+        "name": pc.cast(ids, pa.string()),
+    })
+
+
+def _run_operation(table_path: str, operation: str, num_rows: int, max_spill_size, max_concurrent_tasks):
+    dt = DeltaTable(table_path)
+    if operation == "merge":
+        (
+            dt.merge(_merge_source(num_rows), "t.id = s.id", source_alias="s", target_alias="t",
+                     max_spill_size=max_spill_size)
+            .when_matched_update_all()
+            .when_not_matched_insert_all()
+            .execute()
+        )
+    elif operation == "compact":
+        dt.optimize.compact(max_concurrent_tasks=max_concurrent_tasks, max_spill_size=max_spill_size)
+    else:
+        dt.optimize.z_order(["key", "id"], max_concurrent_tasks=max_concurrent_tasks,
+                            max_spill_size=max_spill_size)
+
+
+def _measure_operation(table_path, operation, num_rows, max_spill_size, max_concurrent_tasks) -> dict:
+    """Run one operation with RSS sampling (in a spawned process) and return the samples."""
+    with sample_rss() as rss:
+        _run_operation(table_path, operation, num_rows, max_spill_size, max_concurrent_tasks)
+    return rss
+
+
+def _measure(table_path: str, operation: str, num_rows: int, max_spill_size=None,
+             max_concurrent_tasks=None) -> dict:
+    """Peak RSS of one operation, measured in a fresh process.
+
+    Returns a dict with "outcome" (completed, failed or killed), "error"
+    and, if completed, "rss" (the samples of tests/memory.py).
+    """
+    outcome = run_in_process(_measure_operation, table_path, operation, num_rows, max_spill_size,
+                             max_concurrent_tasks)
+    if outcome["killed"]:
+        return {"outcome": "killed", "error": f"{operation} process died ({outcome['killed']})"}
+    if outcome["error"] is not None:
+        return {"outcome": "failed", "error": f"{operation} failed: {outcome['error']}"}
+    return {"outcome": "completed", "error": None, "rss": outcome["result"]}
+
+
+def _linear_fit(xs: list, ys: list) -> tuple[float, float]:
+    """Least-squares slope and intercept of ys over xs."""
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread if spread else 0.0
+    return slope, mean_y - slope * mean_x
+
+
+def bench_memory_vs_input_size(sizes=(100_000, 1_000_000, 5_000_000), operations=OPERATIONS,
+                               files: int = 50):
+    """Benchmark the peak RSS of each operation at several table sizes.
+
+    Reports the peak over the process baseline per size, the peak per
+    million rows and a linear fit (MiB per million rows plus a fixed part),
+    to size pod memory for a given table.
+
+    Args:
+        sizes: Table row counts (multiplied by the scale factor)
+        operations: Operations to measure, from OPERATIONS
+        files: Data files the rows are written as
+    """
+    print("\n=== Benchmark: Peak Memory vs Input Size ===")
+
+    results = {}
+    for operation in operations:
+        points = {}
+        for size in sizes:
+            num_rows = scaled(size)
+            # Every operation rewrites its table, so each one gets a fresh clone
+            table_path = clone_fixture(_write_small_files, f"delta_bench_memory_{operation}",
+                                       num_rows=num_rows, files=files)
+            measured = _measure(table_path, operation, num_rows)
+            if measured["outcome"] != "completed":
+                points[num_rows] = {"outcome": measured["outcome"], "error": measured["error"]}
+                print(f"[BENCH] {operation} on {num_rows} rows: {measured['outcome']}: {measured['error'][:200]}")
+                continue
+            rss = measured["rss"]
+            points[num_rows] = {
+                "outcome": "completed",
+                "error": None,
+                "peak_delta_bytes": rss["peak_delta_bytes"],
+                "mib_per_million_rows": rss["peak_delta_bytes"] / MiB / (num_rows / 1e6),
+                "duration_s": rss["duration_s"],
+            }
+            print(f"[BENCH] {operation} on {num_rows} rows: {format_memory(rss)}, "
+                  f"{points[num_rows]['mib_per_million_rows']:.1f}MiB per million rows")
+
+        completed = {rows: p for rows, p in points.items() if p["outcome"] == "completed"}
+        killed = [rows for rows, p in points.items() if p["outcome"] == "killed"]
+        slope = intercept = None
+        if completed:
+            slope, intercept = _linear_fit(
+                [rows / 1e6 for rows in completed], [p["peak_delta_bytes"] / MiB for p in completed.values()])
+            print(f"[BENCH] {operation}: peak ~ {intercept:.1f}MiB + {slope:.1f}MiB per million rows "
+                  f"(fit over {len(completed)} completed sizes)")
+        if killed:
+            print(f"[BENCH] {operation}: killed from {min(killed)} rows")
+        results[operation] = {"sizes": points, "mib_per_million_rows": slope, "fixed_mib": intercept,
+                              "smallest_killed_rows": min(killed) if killed else None}
+
+    measured = sum(len(r["sizes"]) for r in results.values())
+    completed = sum(p["outcome"] == "completed" for r in results.values() for p in r["sizes"].values())
+    print(f"[PASS] Measured peak memory of {len(results)} operations at {len(sizes)} sizes "
+          f"({completed} of {measured} completed)")
+    return {"memory_vs_size": results}
+
+
+def bench_memory_options(num_rows: int = 2_000_000, operations=OPERATIONS,
+                         spill_sizes=(None, 256 * MiB, 64 * MiB), concurrent_tasks=(None, 1, 4),
+                         files: int = 50):
+    """Benchmark how max_spill_size and max_concurrent_tasks change peak RSS and duration.
+
+    Merge takes no max_concurrent_tasks, so it is only measured across the
+    spill sizes. None leaves an option at its delta-rs default.
+
+    Args:
+        num_rows: Table rows (multiplied by the scale factor)
+        operations: Operations to measure, from OPERATIONS
+        spill_sizes: max_spill_size values in bytes
+        concurrent_tasks: max_concurrent_tasks values
+        files: Data files the rows are written as
+    """
+    print("\n=== Benchmark: Peak Memory vs Spill and Concurrency Options ===")
+
+    num_rows = scaled(num_rows)
+    results = {}
+    for operation in operations:
+        tasks_values = (None,) if operation == "merge" else concurrent_tasks
+        for spill in spill_sizes:
+            for tasks in tasks_values:
+                table_path = clone_fixture(_write_small_files, f"delta_bench_memory_{operation}",
+                                           num_rows=num_rows, files=files)
+                measured = _measure(table_path, operation, num_rows, spill, tasks)
+                label = (f"{operation} spill={'default' if spill is None else f'{spill // MiB}MiB'} "
+                         f"tasks={'default' if tasks is None else tasks}")
+                results[label] = {
+                    "operation": operation,
+                    "max_spill_size": spill,
+                    "max_concurrent_tasks": tasks,
+                    "outcome": measured["outcome"],
+                    "error": measured["error"],
+                }
+                if measured["outcome"] != "completed":
+                    print(f"[BENCH] {label}: {measured['outcome']}: {measured['error'][:200]}")
+                    continue
+                rss = measured["rss"]
+                results[label].update({"peak_delta_bytes": rss["peak_delta_bytes"], "duration_s": rss["duration_s"]})
+                print(f"[BENCH] {label}: {format_memory(rss)}, {rss['duration_s']:.2f}s")
+
+    completed = sum(r["outcome"] == "completed" for r in results.values())
+    print(f"[PASS] Measured {len(results)} option combinations on {num_rows} rows ({completed} completed)")
+    return {"rows": num_rows, "memory_options": results}
+
+
+def run_all_memory_benchmarks():
+    """Run all memory benchmarks."""
+    print("\n" + "=" * 50)
+    print("MEMORY BENCHMARKS")
+    print("=" * 50)
+
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
+
+    benchmarks = [
+        bench_memory_vs_input_size,
+        bench_memory_options,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for benchmark in benchmarks:
+        try:
+            benchmark()
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {benchmark.__name__}: {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print(f"MEMORY BENCHMARKS COMPLETE: {passed} passed, {failed} failed")
+    print("=" * 50)
+
+    # Cleanup test tables
+    cleanup_test_tables()
+
+
+if __name__ == "__main__":
+    run_all_memory_benchmarks()
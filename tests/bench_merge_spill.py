@@ -0,0 +1,231 @@
+# -------------------------------
+# Benchmark: Merge Under a Memory Limit
+# -------------------------------
+# Benchmarks: MERGE of a source and target larger than a memory limit,
+# enforced on a spawned process, compared with the same merge without a limit
+#
+# The merge tests fit in memory, but ingest pods have a hard memory limit and
+# a merge over it gets the pod OOM-killed without an error. Here every merge
+# runs in its own spawned process that sets RLIMIT_AS (address space) to its
+# size after loading the table and building the source plus the limit, and
+# passes max_spill_size (the DataFusion memory pool) a fraction of the limit
+# so the merge can spill before it runs out. Every merge, the unlimited
+# baseline included, uses streamed_exec, so only the limit differs. Outcomes:
+#   - completed: the merge committed and the table holds the expected rows
+#   - failed:    the merge raised an error and committed nothing
+#   - killed:    the process died (an allocation failure aborts the Rust
+#                runtime), which is what an OOM-killed pod looks like
+# The benchmark reports the smallest limit a merge completed under and the
+# largest one that killed it. It fails if the unlimited merge does not
+# complete, a completed merge lost rows or a failed one committed anyway.
+#
+# An rlimit is used rather than a cgroup because creating cgroups needs
+# privileges the pods do not have. It bounds address space, not RSS, so
+# thread stacks and allocator reservations count against it as well.
+
+from tests.config import (
+    cleanup_test_tables,
+    scaled,
+)
+from tests.session import login
+from tests.fixture_cache import clone_fixture
+from tests.memory import sample_rss, run_in_process, MiB
+
+import os
+import resource
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from deltalake import write_deltalake, DeltaTable
+
+# Memory limits (on top of the process after setup); None is the in-memory baseline
+MEMORY_LIMITS = (None, 1024 * MiB, 512 * MiB, 256 * MiB, 128 * MiB, 64 * MiB)
+
+# Fraction of the memory limit given to the merge as max_spill_size
+SPILL_FRACTION = 0.5
+
+
+def _write_target(table_path: str, num_rows: int, files: int):
+    """Write ids 0..num_rows-1 with non-negative values as `files` appends."""
+    rows_per_file = max(1, num_rows // files)
+    for start in range(0, num_rows, rows_per_file):
+        ids = pa.array(range(start, min(start + rows_per_file, num_rows)), pa.int64())
+        write_deltalake(table_path, pa.table({
+            "id": ids,
+            "key": pc.bit_wise_and(ids, 1023),
+            "value": pc.cast(ids, pa.float64()),
+            "name": pc.cast(ids, pa.string()),
+        }), mode="append")
+
+
+def _merge_source(num_rows: int, source_rows: int) -> pa.Table:
+    """Rows updating the last half of the target and inserting as many past its end, with negative values."""
+    ids = pa.array(range(num_rows - source_rows // 2, num_rows - source_rows // 2 + source_rows), pa.int64())
+    return pa.table({
+        "id": ids,
+        "key": pc.bit_wise_and(ids, 1023),
+        "value": pc.negate(pc.cast(ids, pa.float64())),
+        "name": pc.cast(ids, pa.string()),
+    })
+
+
+def _address_space_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _limited_merge(table_path, num_rows, source_rows, memory_limit) -> dict:
+    """Merge under the memory limit (in a spawned process) and return its memory samples and metrics."""
+    dt = DeltaTable(table_path)
+    source = _merge_source(num_rows, source_rows)
+    spill = None
+    if memory_limit is not None:
+        spill = int(memory_limit * SPILL_FRACTION)
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (_address_space_bytes() + memory_limit, hard))
+    with sample_rss() as rss:
+        # Streamed in every run, unlimited included, so the slowdown is the limit's alone
+        metrics = (
+            dt.merge(source, "t.id = s.id", source_alias="s", target_alias="t",
+                     streamed_exec=True, max_spill_size=spill)
+            .when_matched_update_all()
+            .when_not_matched_insert_all()
+            .execute()
+        )
+    rss.pop("series")
+    return {"memory": rss, "metrics": metrics}
+
+
+def _run_merge(table_path: str, num_rows: int, source_rows: int, memory_limit) -> dict:
+    """Run one merge in a fresh process; returns its report, with outcome "killed" if the process died."""
+    outcome = run_in_process(_limited_merge, table_path, num_rows, source_rows, memory_limit)
+    if outcome["killed"]:
+        return {"outcome": "killed", "error": f"merge process died ({outcome['killed']})"}
+    if outcome["error"] is not None:
+        return {"outcome": "failed", "error": outcome["error"]}
+    return {"outcome": "completed", "error": None, **outcome["result"]}
+
+
+def _verify(table_path: str, num_rows: int, source_rows: int, version_before: int, outcome: str):
+    """Check a completed merge holds the expected rows and a failed one committed nothing."""
+    dt = DeltaTable(table_path)
+    if outcome != "completed":
+        assert dt.version() == version_before, f"Failed merge committed version {dt.version()}"
+        return
+    values = dt.to_pyarrow_table(columns=["value"]).column("value")
+    assert len(values) == num_rows + source_rows - source_rows // 2, f"Expected merged row count, got {len(values)}"
+    merged = pc.sum(pc.less(values, 0)).as_py() or 0
+    assert merged == source_rows, f"Expected {source_rows} rows from the source, got {merged}"
+
+
+def bench_merge_memory_limit(num_rows: int = 5_000_000, source_fraction: float = 0.5,
+                             memory_limits=MEMORY_LIMITS, files: int = 50):
+    """Benchmark a merge under decreasing memory limits against the same merge without one.
+
+    Reports the outcome of each limit, the source rows merged per second and
+    the slowdown relative to the unlimited merge.
+
+    Args:
+        num_rows: Target table rows (multiplied by the scale factor)
+        source_fraction: Source rows as a fraction of the target (half updates, half inserts)
+        memory_limits: Memory limits in bytes; None runs without a limit
+        files: Data files the target is written as
+    """
+    print("\n=== Benchmark: Merge Under a Memory Limit ===")
+
+    num_rows = scaled(num_rows)
+    source_rows = max(2, int(num_rows * source_fraction))
+    target_path = clone_fixture(_write_target, "delta_bench_merge_spill", num_rows=num_rows, files=files)
+    target_bytes = sum(pa.table(DeltaTable(target_path).get_add_actions(flatten=True)).column("size_bytes").to_pylist())
+    source_bytes = _merge_source(num_rows, source_rows).nbytes
+    print(f"[SETUP] target {num_rows} rows ({target_bytes / MiB:.1f}MiB on storage), "
+          f"source {source_rows} rows ({source_bytes / MiB:.1f}MiB in memory)")
+
+    results = {}
+    for memory_limit in memory_limits:
+        label = "no limit" if memory_limit is None else f"limit {memory_limit // MiB}MiB"
+        table_path = clone_fixture(_write_target, "delta_bench_merge_spill", num_rows=num_rows, files=files)
+        version_before = DeltaTable(table_path).version()
+        result = _run_merge(table_path, num_rows, source_rows, memory_limit)
+        if result["outcome"] != "killed":
+            _verify(table_path, num_rows, source_rows, version_before, result["outcome"])
+
+        entry = {"memory_limit": memory_limit, "outcome": result["outcome"], "error": result.get("error")}
+        if result["outcome"] == "completed":
+            duration_s = result["memory"]["duration_s"]
+            entry.update({
+                "duration_s": duration_s,
+                "source_rows_per_s": source_rows / duration_s,
+                "peak_delta_bytes": result["memory"]["peak_delta_bytes"],
+            })
+            baseline = results.get("no limit")
+            slowdown = (f", {duration_s / baseline['duration_s']:.2f}x the unlimited merge"
+                        if baseline and baseline["outcome"] == "completed" else "")
+            print(f"[BENCH] {label}: completed in {duration_s:.2f}s ({entry['source_rows_per_s']:.0f} source rows/s), "
+                  f"peak +{entry['peak_delta_bytes'] / MiB:.1f}MiB{slowdown}")
+        else:
+            print(f"[BENCH] {label}: {result['outcome']}: {result['error'][:200]}")
+        results[label] = entry
+
+    unlimited = results.get("no limit")
+    assert unlimited is None or unlimited["outcome"] == "completed", f"Unlimited merge failed: {unlimited['error']}"
+
+    def limits(outcome):
+        return [entry["memory_limit"] for entry in results.values()
+                if entry["memory_limit"] is not None and entry["outcome"] == outcome]
+
+    completed, killed = limits("completed"), limits("killed")
+    smallest_completed = min(completed) if completed else None
+    largest_killed = max(killed) if killed else None
+    if smallest_completed is not None:
+        print(f"[BENCH] smallest limit completed: {smallest_completed // MiB}MiB")
+    if largest_killed is not None:
+        print(f"[BENCH] largest limit that killed the merge process: {largest_killed // MiB}MiB")
+
+    print(f"[PASS] {len(completed)} completed, {len(limits('failed'))} failed cleanly and {len(killed)} killed "
+          f"of {len(results)} merges")
+    return {
+        "rows": num_rows,
+        "source_rows": source_rows,
+        "target_bytes": target_bytes,
+        "source_bytes": source_bytes,
+        "smallest_completed_limit": smallest_completed,
+        "largest_killed_limit": largest_killed,
+        "merges": results,
+    }
+
+
+def run_all_merge_spill_benchmarks():
+    """Run all memory-limited merge benchmarks."""
+    print("\n" + "=" * 50)
+    print("MERGE SPILL BENCHMARKS")
+    print("=" * 50)
+
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
+
+    benchmarks = [
+        bench_merge_memory_limit,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for benchmark in benchmarks:
+        try:
+            benchmark()
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {benchmark.__name__}: {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print(f"MERGE SPILL BENCHMARKS COMPLETE: {passed} passed, {failed} failed")
+    print("=" * 50)
+
+    # Cleanup test tables
+    cleanup_test_tables()
+
+
+if __name__ == "__main__":
+    run_all_merge_spill_benchmarks()
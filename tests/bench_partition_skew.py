@@ -0,0 +1,201 @@
+# -------------------------------
+# Benchmark: Partition Skew
+# -------------------------------
+# Benchmarks: partitioned writes and merges when rows are Zipf-distributed
+# over the partitions, compared with balanced partitions at the same total
+# size
+#
+# The partitioned tests spread rows evenly over a few partitions, but real
+# feature data is skewed: a few hot partitions (large customers, recent
+# days) hold most rows. Measured per distribution:
+#   - write: duration, peak writer memory (RSS over the baseline), files and
+#     bytes per partition (largest, median, smallest)
+#   - merge: an upsert whose keys follow the same distribution: duration,
+#     peak memory, files rewritten
+#   - reads: scan latency of every partition on its own; the slowest one
+#     relative to the median is the straggler a per-partition job waits for
+#
+# Each distribution runs in its own spawned process (run_in_process), so
+# memory kept by an earlier run does not hide a peak.
+
+from tests.config import (
+    get_table_path,
+    cleanup_test_tables,
+    scaled,
+)
+from tests.session import login
+from tests.bench_utils import timed, summarize_latencies, percentile
+from tests.memory import sample_rss, run_in_process, MiB
+
+import numpy as np
+import pyarrow as pa
+from deltalake import write_deltalake, DeltaTable
+
+# Zipf exponents compared; 0 is the balanced baseline
+SKEW_EXPONENTS = (0.0, 1.0, 1.5)
+
+
+def _skewed_table(num_rows: int, partitions: int, exponent: float, seed: int = 0) -> pa.Table:
+    """Rows whose partition follows a Zipf distribution with the given exponent (0: uniform)."""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, partitions + 1) ** exponent
+    part_index = rng.choice(partitions, size=num_rows, p=weights / weights.sum())
+    labels = pa.array([f"p{i:04d}" for i in range(partitions)])
+    return pa.table({
+        "id": pa.array(np.arange(num_rows, dtype=np.int64)),
+        "part": labels.take(pa.array(part_index)),
+        "value": pa.array(rng.random(num_rows)),
+    })
+
+
+def _spread(values: list) -> dict:
+    """Largest, median and smallest value and the largest over the mean."""
+    mean = sum(values) / len(values)
+    return {
+        "max": max(values),
+        "median": percentile(values, 50),
+        "min": min(values),
+        "max_over_mean": max(values) / mean if mean else 0.0,
+    }
+
+
+def _partition_layout(dt: DeltaTable) -> dict:
+    """Files and bytes per partition of the current snapshot."""
+    actions = pa.table(dt.get_add_actions(flatten=True)).select(["partition.part", "size_bytes"]).to_pylist()
+    files, size = {}, {}
+    for row in actions:
+        files[row["partition.part"]] = files.get(row["partition.part"], 0) + 1
+        size[row["partition.part"]] = size.get(row["partition.part"], 0) + row["size_bytes"]
+    return {"partitions": len(size), "files": _spread(list(files.values())), "bytes": _spread(list(size.values()))}
+
+
+def _run_distribution(table_path: str, num_rows: int, partitions: int, exponent: float,
+                      merge_fraction: float) -> dict:
+    """Write, merge into and scan one table of the given distribution."""
+    data = _skewed_table(num_rows, partitions, exponent)
+    with sample_rss() as write_rss:
+        write_s, _ = timed(write_deltalake, table_path, data, mode="overwrite", partition_by=["part"])
+    dt = DeltaTable(table_path)
+    layout = _partition_layout(dt)
+
+    # Updates of a random sample of rows, so they hit partitions in proportion to their size
+    rng = np.random.default_rng(1)
+    sample = data.take(pa.array(rng.choice(num_rows, size=max(1, int(num_rows * merge_fraction)),
+                                           replace=False)))
+    source = sample.set_column(2, "value", pa.array(rng.random(sample.num_rows)))
+    with sample_rss() as merge_rss:
+        merge_s, metrics = timed(
+            dt.merge(source, "t.id = s.id AND t.part = s.part", source_alias="s", target_alias="t")
+            .when_matched_update_all()
+            .execute
+        )
+
+    dt = DeltaTable(table_path)
+    partition_values = dt.partitions()
+    # The first scan of a process pays one-off setup, which would pass for a straggler
+    dt.to_pyarrow_table(partitions=[("part", "=", partition_values[0]["part"])])
+    reads = summarize_latencies([
+        timed(dt.to_pyarrow_table, partitions=[("part", "=", values["part"])])[0]
+        for values in partition_values
+    ])
+    return {
+        "write_s": write_s,
+        "write_peak_delta_bytes": write_rss["peak_delta_bytes"],
+        "layout": layout,
+        "merge_s": merge_s,
+        "merge_peak_delta_bytes": merge_rss["peak_delta_bytes"],
+        "merge_files_rewritten": metrics.get("num_target_files_removed", 0),
+        "partition_reads": reads,
+        "read_straggler_ratio": reads["max"] / reads["p50"] if reads["p50"] else 0.0,
+    }
+
+
+def _measure(*args) -> dict:
+    """Run _run_distribution(*args) in a fresh process, so peaks are not hidden by memory kept from earlier runs."""
+    outcome = run_in_process(_run_distribution, *args)
+    if outcome["killed"]:
+        raise Exception(f"Partition skew process died ({outcome['killed']})")
+    if outcome["error"] is not None:
+        raise Exception(f"Partition skew run failed: {outcome['error']}")
+    return outcome["result"]
+
+
+def bench_partition_skew(num_rows: int = 2_000_000, partitions: int = 100, exponents=SKEW_EXPONENTS,
+                         merge_fraction: float = 0.05):
+    """Benchmark partitioned write, merge and per-partition reads for balanced and Zipf-skewed data.
+
+    Args:
+        num_rows: Total rows per table (multiplied by the scale factor)
+        partitions: Distinct partition values
+        exponents: Zipf exponents of the partition distribution (0: balanced)
+        merge_fraction: Fraction of the rows updated by the merge
+    """
+    print("\n=== Benchmark: Partition Skew ===")
+
+    num_rows = scaled(num_rows)
+    results = {}
+    for exponent in exponents:
+        label = "balanced" if exponent == 0 else f"zipf {exponent:g}"
+        table_path = get_table_path(f"delta_bench_skew_{len(results)}")
+        result = _measure(table_path, num_rows, partitions, exponent, merge_fraction)
+        results[label] = result
+        layout, reads = result["layout"], result["partition_reads"]
+        print(f"[BENCH] {label} write: {result['write_s']:.2f}s, "
+              f"peak +{result['write_peak_delta_bytes'] / MiB:.1f}MiB, "
+              f"{layout['partitions']} partitions, bytes per partition max/median/min "
+              f"{layout['bytes']['max'] / MiB:.2f}/{layout['bytes']['median'] / MiB:.2f}/"
+              f"{layout['bytes']['min'] / MiB:.3f}MiB (max {layout['bytes']['max_over_mean']:.1f}x mean), "
+              f"files per partition max {layout['files']['max']}")
+        print(f"[BENCH] {label} merge: {result['merge_s']:.2f}s, "
+              f"peak +{result['merge_peak_delta_bytes'] / MiB:.1f}MiB, "
+              f"{result['merge_files_rewritten']} files rewritten")
+        print(f"[BENCH] {label} partition reads: p50 {reads['p50'] * 1000:.1f}ms, "
+              f"max {reads['max'] * 1000:.1f}ms (straggler {result['read_straggler_ratio']:.1f}x median)")
+
+    baseline = results.get("balanced")
+    if baseline and baseline["read_straggler_ratio"]:
+        for label, result in results.items():
+            if label == "balanced":
+                continue
+            print(f"[BENCH] {label} vs balanced: write {result['write_s'] / baseline['write_s']:.2f}x, "
+                  f"merge {result['merge_s'] / baseline['merge_s']:.2f}x, "
+                  f"straggler {result['read_straggler_ratio'] / baseline['read_straggler_ratio']:.1f}x")
+
+    print(f"[PASS] Benchmarked {len(results)} partition distributions of {num_rows} rows")
+    return {"rows": num_rows, "partitions": partitions, "skew": results}
+
+
+def run_all_partition_skew_benchmarks():
+    """Run all partition skew benchmarks."""
+    print("\n" + "=" * 50)
+    print("PARTITION SKEW BENCHMARKS")
+    print("=" * 50)
+
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
+
+    benchmarks = [
+        bench_partition_skew,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for benchmark in benchmarks:
+        try:
+            benchmark()
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {benchmark.__name__}: {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print(f"PARTITION SKEW BENCHMARKS COMPLETE: {passed} passed, {failed} failed")
+    print("=" * 50)
+
+    # Cleanup test tables
+    cleanup_test_tables()
+
+
+if __name__ == "__main__":
+    run_all_partition_skew_benchmarks()
@@ -0,0 +1,149 @@
+# -------------------------------
+# Benchmark: Restore Cost
+# -------------------------------
+# Benchmarks: dt.restore on tables with many files and long histories, to
+# versions at different distances from the latest one
+#
+# Restore is used for incident rollback. Its cost depends on how many files
+# differ between the current and the target version: every file only in the
+# current version is removed and every file only in the target is re-added.
+# Measured per distance: restore latency, add/remove actions written (from
+# the restore metrics and the commit file) and the next table load time.
+
+from tests.config import (
+    cleanup_test_tables,
+    scaled,
+)
+from tests.session import login
+from tests.bench_utils import timed, commit_action_counts, delta_log_stats
+from tests.fixture_cache import clone_fixture
+
+import pyarrow as pa
+from deltalake import write_deltalake, DeltaTable
+
+
+def _build_history(table_path: str, num_files: int, versions: int, rows_per_file: int,
+                   delete_every: int):
+    """Append `versions` commits that together add about num_files files.
+
+    Each commit writes one file per partition value, so the files per commit
+    are num_files / versions. Every delete_every appends, the rows of an
+    earlier append are deleted, which removes exactly that append's files;
+    restoring across such a delete has to re-add them.
+    """
+    files_per_version = max(1, num_files // versions)
+    parts = pa.array([f"p{i:05d}" for i in range(files_per_version)]).take(
+        pa.array([i // rows_per_file for i in range(files_per_version * rows_per_file)])
+    )
+    for version in range(versions):
+        data = pa.table({
+            "part": parts,
+            "version": pa.array([version] * len(parts), pa.int64()),
+            "value": pa.array(range(len(parts)), pa.int64()),
+        })
+        write_deltalake(table_path, data, mode="append", partition_by=["part"])
+        if delete_every and (version + 1) % delete_every == 0:
+            DeltaTable(table_path).delete(f"version = {version - delete_every // 2}")
+
+
+def bench_restore_cost(num_files: int = 100_000, versions: int = 100, distances=(1, 10, 50, 100),
+                       rows_per_file: int = 10, delete_every: int = 10):
+    """Benchmark restoring a table with many files to versions at several distances.
+
+    Before each measured restore the table is restored back to the latest
+    appended version (untimed), so every distance starts from the same state.
+
+    Args:
+        num_files: Data files written over the history (multiplied by the scale factor)
+        versions: Appends used to build the history
+        distances: How many versions back to restore
+        rows_per_file: Rows written per data file
+        delete_every: Delete an earlier append's rows after every this many
+            appends (0 for an append-only history)
+    """
+    print("\n=== Benchmark: Restore Cost ===")
+
+    num_files = scaled(num_files)
+
+    # The history is built once and cloned from the fixture cache on later runs
+    build_s, table_path = timed(clone_fixture, _build_history, "delta_bench_restore", num_files=num_files,
+                                versions=versions, rows_per_file=rows_per_file, delete_every=delete_every)
+    latest = DeltaTable(table_path).version()
+    load_s, dt = timed(DeltaTable, table_path)
+    files = len(dt.file_uris())
+    log = delta_log_stats(table_path)
+    print(f"[SETUP] {files} files over {latest + 1} versions prepared in {build_s:.1f}s "
+          f"(_delta_log: {log['commit_files']} commits, {log['checkpoint_files']} checkpoints, "
+          f"{log['total_bytes']} bytes), load {load_s * 1000:.1f}ms")
+
+    results = {}
+    for distance in distances:
+        target = latest - distance
+        if target < 0:
+            print(f"[INFO] Skipping distance {distance}: history has only {latest + 1} versions")
+            continue
+
+        dt = DeltaTable(table_path)
+        if dt.version() != latest:
+            dt.restore(latest)
+
+        restore_s, metrics = timed(dt.restore, target)
+        actions = commit_action_counts(table_path, dt.version())
+        next_load_s, dt = timed(DeltaTable, table_path)
+
+        expected_files = len(DeltaTable(table_path, version=target).file_uris())
+        restored_files = len(dt.file_uris())
+        assert restored_files == expected_files, \
+            f"Expected {expected_files} files after restore to version {target}, got {restored_files}"
+
+        results[distance] = {
+            "target_version": target,
+            "restore_s": restore_s,
+            "removed_files": metrics.get("numRemovedFile"),
+            "restored_files": metrics.get("numRestoredFile"),
+            "add_actions": actions.get("add", 0),
+            "remove_actions": actions.get("remove", 0),
+            "next_load_s": next_load_s,
+        }
+        print(f"[BENCH] restore {distance} versions back (to v{target}): {restore_s * 1000:.1f}ms, "
+              f"{actions.get('add', 0)} adds, {actions.get('remove', 0)} removes, "
+              f"next load {next_load_s * 1000:.1f}ms")
+
+    print(f"[PASS] Benchmarked restore on a {files}-file table at {len(results)} distances")
+    return {"files": files, "versions": latest + 1, "initial_load_s": load_s, "restore": results}
+
+
+def run_all_restore_benchmarks():
+    """Run all restore benchmarks."""
+    print("\n" + "=" * 50)
+    print("RESTORE BENCHMARKS")
+    print("=" * 50)
+
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
+
+    benchmarks = [
+        bench_restore_cost,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for benchmark in benchmarks:
+        try:
+            benchmark()
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {benchmark.__name__}: {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print(f"RESTORE BENCHMARKS COMPLETE: {passed} passed, {failed} failed")
+    print("=" * 50)
+
+    # Cleanup test tables
+    cleanup_test_tables()
+
+
+if __name__ == "__main__":
+    run_all_restore_benchmarks()
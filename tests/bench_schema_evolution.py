@@ -0,0 +1,213 @@
+# -------------------------------
+# Benchmark: Schema Evolution Cost
+# -------------------------------
+# Benchmarks: repeated schema merges on wide tables, nested struct evolution,
+# overwrite with schema change
+#
+# Every schema change commits a metaData action carrying the full schema
+# string, so on wide tables each such commit is large and every later table
+# load has to parse it. Measured per write: latency, size of the commit file,
+# total _delta_log size and the time to load the table afterwards. A plain
+# append (same schema, no metaData action) is measured as the baseline.
+
+from tests.config import (
+    get_table_path,
+    cleanup_test_tables,
+    scaled,
+)
+from tests.session import login
+from tests.bench_utils import timed, delta_log_stats, commit_file_size
+
+import pyarrow as pa
+from deltalake import write_deltalake, DeltaTable
+
+
+def _wide_table(column_names: list[str], num_rows: int) -> pa.Table:
+    """Build a table with one int64 column per name (all sharing one array)."""
+    values = pa.array(range(num_rows), pa.int64())
+    return pa.table({name: values for name in column_names})
+
+
+def _nested_table(field_names: list[str], num_rows: int, depth: int = 1) -> pa.Table:
+    """Build a table with an id column and a struct column nested `depth` levels deep.
+
+    The innermost struct has the given fields; every level above it is a
+    struct with one field (level_1, level_2, ...) holding the level below.
+    """
+    values = pa.array(range(num_rows), pa.int64())
+    features = pa.StructArray.from_arrays([values] * len(field_names), field_names)
+    for level in range(depth - 1, 0, -1):
+        features = pa.StructArray.from_arrays([features], [f"level_{level}"])
+    return pa.table({"id": values, "features": features})
+
+
+def _measure_write(table_path: str, data: pa.Table, **write_kwargs) -> dict:
+    """Write data, then reload the table and measure the commit it produced."""
+    write_s, _ = timed(write_deltalake, table_path, data, **write_kwargs)
+    load_s, dt = timed(DeltaTable, table_path)
+    version = dt.version()
+    return {
+        "version": version,
+        "write_s": write_s,
+        "load_s": load_s,
+        "commit_bytes": commit_file_size(table_path, version),
+        "log_bytes": delta_log_stats(table_path)["total_bytes"],
+    }
+
+
+def _print_steps(label: str, baseline: dict, steps: list[dict]):
+    """Print the baseline append and the first/last schema-changing writes."""
+    print(f"[BENCH] {label} plain append: write={baseline['write_s'] * 1000:.1f}ms "
+          f"commit={baseline['commit_bytes']}B load={baseline['load_s'] * 1000:.1f}ms")
+    for name, step in (("first", steps[0]), ("last", steps[-1])):
+        print(f"[BENCH] {label} {name} schema change: write={step['write_s'] * 1000:.1f}ms "
+              f"commit={step['commit_bytes']}B log={step['log_bytes']}B load={step['load_s'] * 1000:.1f}ms")
+
+
+def bench_wide_schema_merge(widths=(100, 500, 1000, 2000), merges: int = 10,
+                            columns_per_merge: int = 10, num_rows: int | None = None):
+    """Benchmark appends with schema_mode='merge' on tables with many columns.
+
+    Args:
+        widths: Initial column counts to benchmark
+        merges: Schema-merging appends per table
+        columns_per_merge: New columns added by each merge
+        num_rows: Rows per write (default 1000 times the scale factor)
+    """
+    print("\n=== Benchmark: Wide Schema Merge ===")
+
+    num_rows = num_rows or scaled(1000)
+    results = {}
+
+    for width in widths:
+        table_path = get_table_path(f"delta_bench_schema_wide_{width}")
+        columns = [f"col_{i}" for i in range(width)]
+
+        write_deltalake(table_path, _wide_table(columns, num_rows), mode="overwrite")
+        baseline = _measure_write(table_path, _wide_table(columns, num_rows), mode="append")
+
+        steps = []
+        for _ in range(merges):
+            columns = columns + [f"col_{len(columns) + i}" for i in range(columns_per_merge)]
+            steps.append(_measure_write(table_path, _wide_table(columns, num_rows),
+                                        mode="append", schema_mode="merge"))
+
+        _print_steps(f"{width} columns:", baseline, steps)
+        results[width] = {"baseline": baseline, "merges": steps}
+
+    print(f"[PASS] Benchmarked schema merges on {len(widths)} table widths")
+    return {"wide_schema_merge": results}
+
+
+def bench_nested_schema_merge(field_counts=(50, 500), depths=(1, 4, 16), merges: int = 10,
+                              fields_per_merge: int = 10, num_rows: int | None = None):
+    """Benchmark schema merges that add fields to a nested struct column.
+
+    Every merge adds fields to the innermost struct, so the schema merge has
+    to walk all enclosing struct levels.
+
+    Args:
+        field_counts: Initial number of fields of the innermost struct to benchmark
+        depths: Struct nesting depths to benchmark (1 is a single struct column)
+        merges: Schema-merging appends per table
+        fields_per_merge: New struct fields added by each merge
+        num_rows: Rows per write (default 1000 times the scale factor)
+    """
+    print("\n=== Benchmark: Nested Struct Schema Merge ===")
+
+    num_rows = num_rows or scaled(1000)
+    results = {}
+
+    for depth in depths:
+        for count in field_counts:
+            table_path = get_table_path(f"delta_bench_schema_nested_{depth}_{count}")
+            fields = [f"f_{i}" for i in range(count)]
+
+            write_deltalake(table_path, _nested_table(fields, num_rows, depth), mode="overwrite")
+            baseline = _measure_write(table_path, _nested_table(fields, num_rows, depth), mode="append")
+
+            steps = []
+            for _ in range(merges):
+                fields = fields + [f"f_{len(fields) + i}" for i in range(fields_per_merge)]
+                steps.append(_measure_write(table_path, _nested_table(fields, num_rows, depth),
+                                            mode="append", schema_mode="merge"))
+
+            _print_steps(f"depth {depth}, {count} struct fields:", baseline, steps)
+            results[f"depth_{depth}_fields_{count}"] = {"baseline": baseline, "merges": steps}
+
+    print(f"[PASS] Benchmarked nested schema merges on {len(depths)} depths x {len(field_counts)} struct sizes")
+    return {"nested_schema_merge": results}
+
+
+def bench_overwrite_schema_change(widths=(100, 1000), changes: int = 5, num_rows: int | None = None):
+    """Benchmark overwrites that replace the schema (schema_mode='overwrite').
+
+    Each change renames every column, so every commit carries a new schema
+    and removes all files of the previous version.
+
+    Args:
+        widths: Column counts to benchmark
+        changes: Schema-replacing overwrites per table
+        num_rows: Rows per write (default 1000 times the scale factor)
+    """
+    print("\n=== Benchmark: Overwrite with Schema Change ===")
+
+    num_rows = num_rows or scaled(1000)
+    results = {}
+
+    for width in widths:
+        table_path = get_table_path(f"delta_bench_schema_overwrite_{width}")
+        columns = [f"gen0_col_{i}" for i in range(width)]
+
+        write_deltalake(table_path, _wide_table(columns, num_rows), mode="overwrite")
+        baseline = _measure_write(table_path, _wide_table(columns, num_rows), mode="append")
+
+        steps = []
+        for generation in range(1, changes + 1):
+            columns = [f"gen{generation}_col_{i}" for i in range(width)]
+            steps.append(_measure_write(table_path, _wide_table(columns, num_rows),
+                                        mode="overwrite", schema_mode="overwrite"))
+
+        _print_steps(f"{width} columns:", baseline, steps)
+        results[width] = {"baseline": baseline, "overwrites": steps}
+
+    print(f"[PASS] Benchmarked schema-changing overwrites on {len(widths)} table widths")
+    return {"overwrite_schema_change": results}
+
+
+def run_all_schema_evolution_benchmarks():
+    """Run all schema evolution benchmarks."""
+    print("\n" + "=" * 50)
+    print("SCHEMA EVOLUTION BENCHMARKS")
+    print("=" * 50)
+
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
+
+    benchmarks = [
+        bench_wide_schema_merge,
+        bench_nested_schema_merge,
+        bench_overwrite_schema_change,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for benchmark in benchmarks:
+        try:
+            benchmark()
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {benchmark.__name__}: {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print(f"SCHEMA EVOLUTION BENCHMARKS COMPLETE: {passed} passed, {failed} failed")
+    print("=" * 50)
+
+    # Cleanup test tables
+    cleanup_test_tables()
+
+
+if __name__ == "__main__":
+    run_all_schema_evolution_benchmarks()
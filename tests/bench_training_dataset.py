@@ -0,0 +1,213 @@
+# -------------------------------
+# Benchmark: Training Dataset Creation
+# -------------------------------
+# Benchmarks: train/test split creation, job queue wait and run time, split
+# retrieval as a Delta feature group grows (rows and versions), and training
+# data from point-in-time joins across several feature groups
+#
+# The training dataset job is polled through its executions, so the time it
+# spends queued is reported separately from the time it runs. Runs against
+# Hopsworks (remote backend) or the local stand-in (local backend), where jobs
+# run synchronously and never queue.
+
+from tests.config import scaled
+from tests.session import login
+from tests.bench_utils import timed
+from tests.orchestration import wait_for_job
+
+import numpy as np
+import pandas as pd
+
+
+def _feature_frame(first_id: int, num_rows: int, feature: str, start_time: pd.Timestamp) -> pd.DataFrame:
+    """Build rows with an id, an event time and one numeric feature."""
+    ids = np.arange(first_id, first_id + num_rows, dtype=np.int64)
+    return pd.DataFrame({
+        "id": ids,
+        "event_time": start_time + pd.to_timedelta(ids, unit="s"),
+        feature: ids * 0.5,
+    })
+
+
+def _time_training_dataset(fv, expected_rows: int, test_size: float, poll_interval_s: float) -> dict:
+    """Create, wait for and retrieve one train/test split of a feature view."""
+    # Return right after submitting the job, so queueing and running can be timed apart
+    create_s, (version, job) = timed(fv.create_train_test_split, test_size=test_size,
+                                     write_options={"wait_for_job": False})
+    job_timing = wait_for_job(job, poll_interval_s)
+    if job_timing["final_status"] != "SUCCEEDED":
+        raise Exception(f"Training dataset job ended with {job_timing['final_status']}")
+
+    retrieve_s, (x_train, x_test, _, _) = timed(fv.get_train_test_split, version)
+    rows = len(x_train) + len(x_test)
+    assert rows == expected_rows, f"Expected {expected_rows} training rows, got {rows}"
+
+    in_memory_s, _ = timed(fv.train_validation_test_split, validation_size=test_size / 2, test_size=test_size / 2)
+
+    return {
+        "rows": rows,
+        "create_s": create_s,
+        "queue_s": job_timing["queue_s"],
+        "run_s": job_timing["run_s"],
+        "retrieve_s": retrieve_s,
+        "in_memory_split_s": in_memory_s,
+    }
+
+
+def _print_timing(label: str, timing: dict):
+    print(f"[BENCH] {label}: create={timing['create_s']:.2f}s queue={timing['queue_s']:.2f}s "
+          f"run={timing['run_s']:.2f}s retrieve={timing['retrieve_s']:.2f}s "
+          f"in-memory split={timing['in_memory_split_s']:.2f}s")
+
+
+def bench_training_dataset_growth(project, stages=(100_000, 1_000_000), inserts_per_stage: int = 10,
+                                  test_size: float = 0.2, poll_interval_s: float = 1.0):
+    """Benchmark training dataset creation while one Delta feature group grows.
+
+    The feature group is grown to each stage size with inserts of new keys
+    (one Delta version each), then a train/test split is created, waited
+    for and retrieved.
+
+    Args:
+        project: Hopsworks project (or the local stand-in)
+        stages: Feature group sizes in rows (multiplied by the scale factor)
+        inserts_per_stage: Inserts used to grow the feature group to each stage
+        test_size: Test split fraction
+        poll_interval_s: Seconds between job polls
+    """
+    print("\n=== Benchmark: Training Dataset Creation vs Feature Group Size ===")
+
+    fs = project.get_feature_store()
+    start_time = pd.Timestamp("2024-01-01")
+    fg = fs.get_or_create_feature_group(
+        name="bench_td_growth",
+        version=1,
+        primary_key=["id"],
+        event_time="event_time",
+        time_travel_format="DELTA",
+    )
+    fv = None
+    results = {}
+
+    try:
+        rows = 0
+        inserts = 0
+        for stage in stages:
+            target = scaled(stage)
+            batch_rows = max(1, (target - rows) // inserts_per_stage)
+            while rows < target:
+                batch = min(batch_rows, target - rows)
+                fg.insert(_feature_frame(rows, batch, "amount", start_time), wait=True)
+                rows += batch
+                inserts += 1
+
+            if fv is None:
+                fv = fs.create_feature_view(name="bench_td_growth_fv", version=1, query=fg.select_all())
+
+            timing = _time_training_dataset(fv, rows, test_size, poll_interval_s)
+            timing["inserts"] = inserts
+            _print_timing(f"{rows} rows, {inserts} inserts", timing)
+            results[rows] = timing
+    finally:
+        if fv is not None:
+            fv.delete()
+        fg.delete()
+
+    print(f"[PASS] Benchmarked training dataset creation at {len(stages)} feature group sizes")
+    return {"training_dataset_growth": results}
+
+
+def bench_point_in_time_join(project, num_feature_groups: int = 3, num_rows: int = 100_000,
+                             inserts_per_group: int = 5, test_size: float = 0.2,
+                             poll_interval_s: float = 1.0):
+    """Benchmark training data built from point-in-time joins of several feature groups.
+
+    A label feature group is joined with num_feature_groups feature groups;
+    every feature group has an event time, so each label row gets the
+    latest feature values at or before its event time.
+
+    Args:
+        project: Hopsworks project (or the local stand-in)
+        num_feature_groups: Feature groups joined to the label feature group
+        num_rows: Rows per feature group (multiplied by the scale factor)
+        inserts_per_group: Inserts (Delta versions) used to fill each feature group
+        test_size: Test split fraction
+        poll_interval_s: Seconds between job polls
+    """
+    print("\n=== Benchmark: Point-in-Time Join Training Dataset ===")
+
+    fs = project.get_feature_store()
+    num_rows = scaled(num_rows)
+    batch_rows = max(1, num_rows // inserts_per_group)
+    start_time = pd.Timestamp("2024-01-01")
+    feature_groups = []
+    fv = None
+
+    try:
+        # Labels are observed after the features, so every label row has a match
+        names = ["label"] + [f"feature_{i}" for i in range(num_feature_groups)]
+        for name in names:
+            fg = fs.get_or_create_feature_group(
+                name=f"bench_pit_{name}",
+                version=1,
+                primary_key=["id"],
+                event_time="event_time",
+                time_travel_format="DELTA",
+            )
+            feature_groups.append(fg)
+            offset = pd.Timedelta(hours=1) if name == "label" else pd.Timedelta(0)
+            for first_id in range(0, num_rows, batch_rows):
+                batch = min(batch_rows, num_rows - first_id)
+                fg.insert(_feature_frame(first_id, batch, name, start_time + offset), wait=True)
+
+        label_fg, *feature_fgs = feature_groups
+        query = label_fg.select_all()
+        for name, fg in zip(names[1:], feature_fgs):
+            query = query.join(fg.select([name]), on=["id"])
+
+        fv = fs.create_feature_view(name="bench_pit_fv", version=1, query=query, labels=["label"])
+        timing = _time_training_dataset(fv, num_rows, test_size, poll_interval_s)
+        _print_timing(f"{num_feature_groups} joined feature groups, {num_rows} rows", timing)
+    finally:
+        if fv is not None:
+            fv.delete()
+        for fg in feature_groups:
+            fg.delete()
+
+    print(f"[PASS] Benchmarked point-in-time join of {num_feature_groups} feature groups")
+    return {"point_in_time_join": timing}
+
+
+def run_all_training_dataset_benchmarks(project=None):
+    """Run all training dataset benchmarks."""
+    print("\n" + "=" * 50)
+    print("TRAINING DATASET BENCHMARKS")
+    print("=" * 50)
+
+    # Connect to Hopsworks if not provided
+    if project is None:
+        project = login()
+
+    benchmarks = [
+        bench_training_dataset_growth,
+        bench_point_in_time_join,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for benchmark in benchmarks:
+        try:
+            benchmark(project)
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {benchmark.__name__}: {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print(f"TRAINING DATASET BENCHMARKS COMPLETE: {passed} passed, {failed} failed")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    run_all_training_dataset_benchmarks()
@@ -0,0 +1,121 @@
+# -------------------------------
+# Shared helpers for benchmarks
+# -------------------------------
+# Latency summaries and table/log size measurements used by the
+# concurrency tests and benchmarks
+
+import json
+import os
+import time
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Return the pct-th percentile of samples using linear interpolation.
+
+    Args:
+        samples: Measured values (any order)
+        pct: Percentile between 0 and 100
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize_latencies(samples: list[float]) -> dict:
+    """Summarize latency samples (seconds) into count, mean and p50/p95/p99/max."""
+    if not samples:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "count": len(samples),
+        "mean": sum(samples) / len(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples),
+    }
+
+
+def format_latency_summary(summary: dict) -> str:
+    """Format a summary from summarize_latencies() in milliseconds."""
+    return (
+        f"n={summary['count']} "
+        f"mean={summary['mean'] * 1000:.1f}ms "
+        f"p50={summary['p50'] * 1000:.1f}ms "
+        f"p95={summary['p95'] * 1000:.1f}ms "
+        f"p99={summary['p99'] * 1000:.1f}ms "
+        f"max={summary['max'] * 1000:.1f}ms"
+    )
+
+
+def resolve_filesystem(uri: str):
+    """Resolve a table URI or local path to a pyarrow filesystem and path."""
+    from pyarrow.fs import FileSystem
+
+    if "://" not in uri:
+        uri = os.path.abspath(uri)
+    elif uri.startswith("hopsfs://"):
+        # HopsFS speaks the HDFS protocol; pyarrow only knows the hdfs scheme
+        uri = "hdfs://" + uri[len("hopsfs://"):]
+    return FileSystem.from_uri(uri)
+
+
+def directory_stats(uri: str) -> dict:
+    """Count files and bytes below a directory (recursive).
+
+    Args:
+        uri: hdfs://, hopsfs:// or local path of the directory
+    """
+    from pyarrow.fs import FileSelector, FileType
+
+    fs, path = resolve_filesystem(uri)
+    infos = fs.get_file_info(FileSelector(path, recursive=True, allow_not_found=True))
+    files = [info for info in infos if info.type == FileType.File]
+    return {"files": len(files), "bytes": sum(info.size for info in files)}
+
+
+def delta_log_stats(table_uri: str) -> dict:
+    """Size of a table's _delta_log: commit files, checkpoints, all files (with _last_checkpoint) and total bytes."""
+    from pyarrow.fs import FileSelector, FileType
+
+    fs, path = resolve_filesystem(table_uri)
+    infos = fs.get_file_info(FileSelector(f"{path}/_delta_log", allow_not_found=True))
+    commits = [i for i in infos if i.type == FileType.File and i.base_name.endswith(".json")]
+    checkpoints = [i for i in infos if i.type == FileType.File and ".checkpoint" in i.base_name]
+    files = [i for i in infos if i.type == FileType.File]
+    return {
+        "files": len(files),
+        "commit_files": len(commits),
+        "commit_bytes": sum(i.size for i in commits),
+        "checkpoint_files": len(checkpoints),
+        "checkpoint_bytes": sum(i.size for i in checkpoints),
+        "total_bytes": sum(i.size for i in files),
+    }
+
+
+def commit_file_size(table_uri: str, version: int) -> int:
+    """Size in bytes of the JSON commit file of one table version."""
+    fs, path = resolve_filesystem(table_uri)
+    return fs.get_file_info(f"{path}/_delta_log/{version:020d}.json").size
+
+
+def commit_action_counts(table_uri: str, version: int) -> dict:
+    """Count the actions (add, remove, metaData, ...) in the commit file of one table version."""
+    fs, path = resolve_filesystem(table_uri)
+    counts = {}
+    with fs.open_input_stream(f"{path}/_delta_log/{version:020d}.json") as f:
+        for line in f.read().decode().splitlines():
+            if line.strip():
+                for action in json.loads(line):
+                    counts[action] = counts.get(action, 0) + 1
+    return counts
+
+
+def timed(fn, *args, **kwargs) -> tuple:
+    """Call fn and return (seconds elapsed, return value)."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
@@ -0,0 +1,279 @@
+# -------------------------------
+# Benchmark: Write-Side File Sizing and Row-Group Tuning
+# -------------------------------
+# Benchmarks: write throughput, bytes stored and downstream scan speed for a
+# sweep of target file size, Parquet row-group size and compression codec
+# and level (WriterProperties), on the schemas our tables typically have
+#
+# All other tests write with the write_deltalake defaults. On HopsFS every
+# file costs a namenode entry and at least one block, so many small files
+# are expensive, while very large row groups make selective scans read more
+# than they need. The benchmark ends with a recommended configuration per
+# schema. The number of rows per file is controlled through
+# target_file_size; delta-rs has no separate max-rows-per-file option.
+#
+# By default each schema gets enough rows to fill MIN_FILES files at the
+# smallest target file size (estimated from the Parquet size of a sample),
+# so the target_file_size sweep actually splits the table.
+
+from tests.config import (
+    get_table_path,
+    cleanup_test_tables,
+    scaled,
+)
+from tests.session import login
+from tests.bench_utils import timed, resolve_filesystem
+
+import io
+import itertools
+import math
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from deltalake import write_deltalake, DeltaTable, WriterProperties
+
+# Default HopsFS (HDFS) block size; files much smaller than this waste namenode capacity
+HOPSFS_BLOCK_SIZE = 128 * 1024 * 1024
+
+MiB = 1024 * 1024
+
+# Files the smallest target_file_size should produce with the default row count
+MIN_FILES = 4
+
+# Rows written to estimate the stored bytes per row of a schema
+SAMPLE_ROWS = 100_000
+
+
+def _narrow_numeric(num_rows: int) -> pa.Table:
+    """Key plus a few numeric features (e.g. aggregates)."""
+    rng = np.random.default_rng(0)
+    columns = {"id": np.arange(num_rows, dtype=np.int64)}
+    for i in range(4):
+        columns[f"f{i}"] = rng.random(num_rows)
+    return pa.table(columns)
+
+
+def _wide_mixed(num_rows: int) -> pa.Table:
+    """Key plus 50 columns of mixed types (ints, doubles, low-cardinality strings)."""
+    rng = np.random.default_rng(1)
+    categories = pa.array([f"category_{i}" for i in range(100)])
+    columns = {"id": np.arange(num_rows, dtype=np.int64)}
+    for i in range(20):
+        columns[f"i{i}"] = rng.integers(0, 1_000_000, num_rows)
+        columns[f"d{i}"] = rng.random(num_rows)
+    for i in range(10):
+        columns[f"s{i}"] = categories.take(rng.integers(0, len(categories), num_rows))
+    return pa.table(columns)
+
+
+def _event_features(num_rows: int) -> pa.Table:
+    """Feature group rows: key, event time, numeric features and a free-text column."""
+    rng = np.random.default_rng(2)
+    ids = np.arange(num_rows, dtype=np.int64)
+    return pa.table({
+        "id": ids,
+        "event_time": pa.array(np.datetime64("2024-01-01") + ids.astype("timedelta64[s]"), pa.timestamp("us")),
+        "amount": rng.random(num_rows) * 1000,
+        "count": rng.integers(0, 100, num_rows),
+        "country": pa.array(["SE", "DE", "US", "IN", "BR"]).take(rng.integers(0, 5, num_rows)),
+        "comment": pa.array([f"event {i} of user {i % 9973}" for i in range(num_rows)]),
+    })
+
+
+# Typical table schemas: name -> function building num_rows rows
+TYPICAL_SCHEMAS = {
+    "narrow_numeric": _narrow_numeric,
+    "wide_mixed": _wide_mixed,
+    "event_features": _event_features,
+}
+
+# Compression codec and level pairs (LZ4_RAW is the non-deprecated Parquet LZ4)
+COMPRESSIONS = (("SNAPPY", None), ("ZSTD", 1), ("ZSTD", 3), ("ZSTD", 9), ("LZ4_RAW", None))
+
+
+def _describe(config: dict) -> str:
+    target = f"{config['target_file_size'] // MiB}MiB" if config["target_file_size"] else "default"
+    row_group = config["max_row_group_size"] or "default"
+    codec = config["compression"] + (f"({config['compression_level']})" if config["compression_level"] else "")
+    return f"file={target} rg={row_group} {codec}"
+
+
+def _row_groups(table_path: str, file_path: str) -> int:
+    """Number of row groups in one data file of a table (read from the Parquet footer)."""
+    fs, path = resolve_filesystem(table_path)
+    with fs.open_input_file(f"{path}/{file_path}") as f:
+        return pq.ParquetFile(f).metadata.num_row_groups
+
+
+def _measure_config(table_path: str, data: pa.Table, config: dict, selective_fraction: float) -> dict:
+    """Overwrite the table with one writer configuration and time writing and scanning it."""
+    properties = WriterProperties(
+        max_row_group_size=config["max_row_group_size"],
+        compression=config["compression"],
+        compression_level=config["compression_level"],
+    )
+    write_s, _ = timed(write_deltalake, table_path, data, mode="overwrite",
+                       target_file_size=config["target_file_size"], writer_properties=properties)
+
+    # Drop the files of the previous configuration so the table only holds this one
+    DeltaTable(table_path).vacuum(retention_hours=0, dry_run=False, enforce_retention_duration=False)
+
+    dt = DeltaTable(table_path)
+    actions = dt.get_add_actions(flatten=True)
+    sizes = actions.column("size_bytes").to_pylist()
+
+    full_scan_s, scanned = timed(dt.to_pyarrow_table)
+    assert scanned.num_rows == data.num_rows, f"Expected {data.num_rows} rows, scanned {scanned.num_rows}"
+    selective_filter = ds.field("id") < int(data.num_rows * selective_fraction)
+    selective_scan_s, _ = timed(dt.to_pyarrow_dataset().to_table, filter=selective_filter)
+
+    return {
+        **config,
+        "write_rows_per_s": data.num_rows / write_s,
+        "bytes": sum(sizes),
+        "files": len(sizes),
+        "mean_file_bytes": sum(sizes) / len(sizes),
+        "row_groups_per_file": _row_groups(table_path, actions.column("path")[0].as_py()),
+        "full_scan_rows_per_s": data.num_rows / full_scan_s,
+        "selective_scan_s": selective_scan_s,
+    }
+
+
+def _default_rows(build, target_file_size: int) -> int:
+    """Rows of a schema that fill MIN_FILES files of target_file_size (at the strongest compression swept)."""
+    sample = io.BytesIO()
+    pq.write_table(build(SAMPLE_ROWS), sample, compression="zstd", compression_level=9)
+    bytes_per_row = len(sample.getvalue()) / SAMPLE_ROWS
+    return math.ceil(MIN_FILES * target_file_size / bytes_per_row)
+
+
+def _recommend(results: list[dict], weights: dict, target_file_bytes: int = HOPSFS_BLOCK_SIZE) -> dict:
+    """Pick the configuration with the best weighted score.
+
+    Write and full scan throughput, selective scan time and bytes stored
+    are scored relative to the best configuration (1.0 = best). The mean
+    file size is scored against target_file_bytes: smaller files cost
+    namenode entries and blocks, larger ones make scans less parallel, so
+    the score is the ratio of the smaller to the larger of the two.
+    """
+    best = {
+        "write": max(r["write_rows_per_s"] for r in results),
+        "scan": max(r["full_scan_rows_per_s"] for r in results),
+        "selective": min(r["selective_scan_s"] for r in results),
+        "bytes": min(r["bytes"] for r in results),
+    }
+
+    def score(r):
+        mean_file_bytes = r["mean_file_bytes"]
+        relative = {
+            "write": r["write_rows_per_s"] / best["write"],
+            "scan": r["full_scan_rows_per_s"] / best["scan"],
+            "selective": best["selective"] / r["selective_scan_s"],
+            "bytes": best["bytes"] / r["bytes"],
+            "file_size": min(mean_file_bytes, target_file_bytes) / max(mean_file_bytes, target_file_bytes),
+        }
+        return sum(weights[k] * relative[k] for k in weights)
+
+    return max(results, key=score)
+
+
+def bench_write_tuning(num_rows: int | None = None, schemas=tuple(TYPICAL_SCHEMAS),
+                       target_file_sizes=(None, 8 * MiB, 32 * MiB, 128 * MiB),
+                       row_group_sizes=(None, 128 * 1024, 1_000_000),
+                       compressions=COMPRESSIONS, selective_fraction: float = 0.01,
+                       weights=None):
+    """Sweep writer settings per schema and recommend a configuration.
+
+    Every combination of target file size, row-group size and compression
+    is written to the same table (overwrite, then vacuum), and timed for
+    write throughput, bytes stored, full scan and a selective id-range scan.
+
+    Args:
+        num_rows: Rows written per configuration (multiplied by the scale factor;
+            default per schema: enough for MIN_FILES files at the smallest target file size)
+        schemas: Names from TYPICAL_SCHEMAS to benchmark
+        target_file_sizes: target_file_size values in bytes (None for the delta-rs default)
+        row_group_sizes: WriterProperties max_row_group_size values (None for the default)
+        compressions: (codec, level) pairs; level None uses the codec default
+        selective_fraction: Fraction of ids read by the selective scan
+        weights: Score weights for write, scan, selective, bytes and file_size
+            (default favours scan speed; file_size scores the mean file size
+            against the HopsFS block size)
+    """
+    print("\n=== Benchmark: Write File Sizing and Row-Group Tuning ===")
+
+    weights = weights or {"write": 1.0, "scan": 2.0, "selective": 1.0, "bytes": 1.0, "file_size": 1.0}
+    smallest_target = min((size for size in target_file_sizes if size), default=None)
+    configs = [
+        {"target_file_size": target, "max_row_group_size": row_group,
+         "compression": codec, "compression_level": level}
+        for target, row_group, (codec, level) in itertools.product(target_file_sizes, row_group_sizes, compressions)
+    ]
+
+    recommended = {}
+    results = {}
+    for schema in schemas:
+        build = TYPICAL_SCHEMAS[schema]
+        rows = num_rows or (_default_rows(build, smallest_target) if smallest_target else 1_000_000)
+        data = build(scaled(rows))
+        table_path = get_table_path(f"delta_bench_write_tuning_{schema}")
+        print(f"[SETUP] {schema}: {data.num_rows} rows, {data.num_columns} columns, "
+              f"{data.nbytes / MiB:.1f}MiB in memory")
+
+        results[schema] = []
+        for config in configs:
+            result = _measure_config(table_path, data, config, selective_fraction)
+            results[schema].append(result)
+            print(f"[BENCH] {schema} {_describe(config)}: write={result['write_rows_per_s']:.0f} rows/s "
+                  f"bytes={result['bytes'] / MiB:.1f}MiB files={result['files']} "
+                  f"rg/file={result['row_groups_per_file']} scan={result['full_scan_rows_per_s']:.0f} rows/s "
+                  f"selective={result['selective_scan_s'] * 1000:.1f}ms")
+
+        recommended[schema] = _recommend(results[schema], weights)
+
+    print("\n[INFO] Recommended writer configuration per schema:")
+    print(f"[INFO] {'schema':<16} {'configuration':<40} {'files':>6} {'mean file':>10} {'of block':>9}")
+    for schema, r in recommended.items():
+        print(f"[INFO] {schema:<16} {_describe(r):<40} {r['files']:>6} "
+              f"{r['mean_file_bytes'] / MiB:>7.1f}MiB {r['mean_file_bytes'] / HOPSFS_BLOCK_SIZE:>9.1%}")
+
+    print(f"[PASS] Benchmarked {len(configs)} writer configurations on {len(schemas)} schemas")
+    return {"write_tuning": results, "recommended": recommended}
+
+
+def run_all_write_tuning_benchmarks():
+    """Run all write tuning benchmarks."""
+    print("\n" + "=" * 50)
+    print("WRITE TUNING BENCHMARKS")
+    print("=" * 50)
+
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
+
+    benchmarks = [
+        bench_write_tuning,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for benchmark in benchmarks:
+        try:
+            benchmark()
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {benchmark.__name__}: {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print(f"WRITE TUNING BENCHMARKS COMPLETE: {passed} passed, {failed} failed")
+    print("=" * 50)
+
+    # Cleanup test tables
+    cleanup_test_tables()
+
+
+if __name__ == "__main__":
+    run_all_write_tuning_benchmarks()
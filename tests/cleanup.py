@@ -0,0 +1,91 @@
+# -------------------------------
+# Parallel cleanup helpers
+# -------------------------------
+# Bounded-concurrency removal with retry and backoff, shared by the remote and
+# cluster configs and the feature store tests. Every removal is a remote
+# round-trip, so removing thousands of tables one at a time is slow.
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Default number of concurrent removals
+CLEANUP_MAX_WORKERS = 16
+
+# Attempts per item (first try included) and base delay for exponential backoff
+CLEANUP_ATTEMPTS = 3
+CLEANUP_BACKOFF_SECONDS = 0.5
+
+# Prefix shared by all tables created by this suite
+STALE_TABLE_PREFIX = "delta_"
+
+
+def _is_not_found(error: Exception) -> bool:
+    """Whether an error says the item does not exist (FileNotFoundError or an HTTP 404 RestAPIError)."""
+    if isinstance(error, FileNotFoundError):
+        return True
+    # hopsworks' RestAPIError keeps the failed requests.Response
+    return getattr(getattr(error, "response", None), "status_code", None) == 404
+
+
+def _remove_with_retry(item, remove_fn, attempts: int, backoff_s: float):
+    """Call remove_fn(item), retrying with exponential backoff and jitter.
+
+    An item that is already gone (FileNotFoundError, or a 404 from the
+    Hopsworks REST API) counts as success.
+    """
+    for attempt in range(attempts):
+        try:
+            remove_fn(item)
+            return
+        except Exception as e:
+            if _is_not_found(e):
+                return
+            if attempt == attempts - 1:
+                raise
+            time.sleep(backoff_s * (2 ** attempt) * (1 + random.random()))
+
+
+def remove_in_parallel(items, remove_fn, describe=str,
+                       max_workers: int = CLEANUP_MAX_WORKERS,
+                       attempts: int = CLEANUP_ATTEMPTS,
+                       backoff_s: float = CLEANUP_BACKOFF_SECONDS) -> list[tuple]:
+    """Remove items concurrently and print a summary of failures.
+
+    Args:
+        items: Items to remove (table names, feature store handles, ...)
+        remove_fn: Function removing a single item
+        describe: Function turning an item into a printable label
+        max_workers: Maximum number of concurrent removals
+        attempts: Attempts per item before giving up
+        backoff_s: Base delay between attempts (doubled each retry)
+
+    Returns:
+        List of (item, error message) for items that could not be removed
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    failures = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as pool:
+        futures = {
+            pool.submit(_remove_with_retry, item, remove_fn, attempts, backoff_s): item
+            for item in items
+        }
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                future.result()
+                print(f"[CLEANUP] Removed: {describe(item)}")
+            except Exception as e:
+                failures.append((item, str(e)))
+
+    elapsed = time.perf_counter() - start
+    print(f"[CLEANUP] Removed {len(items) - len(failures)}/{len(items)} in {elapsed:.1f}s")
+    if failures:
+        print(f"[CLEANUP] {len(failures)} failed after {attempts} attempts:")
+        for item, error in failures:
+            print(f"[CLEANUP]   - {describe(item)}: {error}")
+    return failures
@@ -4,6 +4,9 @@
 
 import os
 
+from tests.cleanup import remove_in_parallel, STALE_TABLE_PREFIX
+from tests.layout import table_subpath, list_table_names, remove_empty_shards
+
 # Hopsworks connection settings
 HOPSWORKS_API_HOST = "127.0.0.1"
 HOPSWORKS_API_PORT = "8182"
@@ -15,6 +18,9 @@ HOPSFS_NAMENODE = "NAMENODE_IP_ADDRESS"
 HOPSFS_NAMENODE_PORT = "NAMENODE_PORT (e.g., 8020)"
 HOPSFS_DATANODE = "DATANODE_IP_ADDRESS"
 
+# Data size multiplier for tests and benchmarks (CLI: --scale, env: DELTARS_SCALE)
+SCALE_FACTOR = float(os.environ.get("DELTARS_SCALE", "1"))
+
 # Track created tables for cleanup
 _created_tables: list[str] = []
 _hopsworks_project = None
@@ -29,6 +35,20 @@ def setup_environment():
     os.environ["LIBHDFS_DEFAULT_USER"] = "test__meb10000"
 
 
+def scaled(n: int) -> int:
+    """Scale a data size by SCALE_FACTOR (at least 1)."""
+    return max(1, int(n * SCALE_FACTOR))
+
+
+def certificates_available() -> bool:
+    """Whether a previous Hopsworks login already materialized the client certificates in PEMS_DIR."""
+    pems_dir = os.environ.get("PEMS_DIR", "")
+    return all(
+        os.path.exists(os.path.join(pems_dir, name))
+        for name in ("ca_chain.pem", "client_cert.pem", "client_key.pem")
+    )
+
+
 def get_table_path(table_name: str, track: bool = True, schema: str = "hdfs") -> str:
     """Generate full path for a delta table and optionally track for cleanup.
 
@@ -39,12 +59,12 @@ def get_table_path(table_name: str, track: bool = True, schema: str = "hdfs") ->
     """
     if track and table_name not in _created_tables:
         _created_tables.append(table_name)
-    return f"{schema}://{HOPSFS_NAMENODE}:{HOPSFS_NAMENODE_PORT}/Projects/{HOPSWORKS_PROJECT_NAME}/{HOPSWORKS_PROJECT_NAME}_Training_Datasets/{table_name}"
+    return f"{schema}://{HOPSFS_NAMENODE}:{HOPSFS_NAMENODE_PORT}{get_hopsfs_path(table_name)}"
 
 
 def get_hopsfs_path(table_name: str) -> str:
     """Get the HopsFS path (without schema prefix) for filesystem operations."""
-    return f"/Projects/{HOPSWORKS_PROJECT_NAME}/{HOPSWORKS_PROJECT_NAME}_Training_Datasets/{table_name}"
+    return f"/Projects/{HOPSWORKS_PROJECT_NAME}/{HOPSWORKS_PROJECT_NAME}_Training_Datasets/{table_subpath(table_name)}"
 
 
 def set_project(project):
@@ -53,6 +73,35 @@ def set_project(project):
     _hopsworks_project = project
 
 
+def _connect_hdfs():
+    """Connect to HopsFS through the pyarrow HDFS client."""
+    from pyarrow.fs import HadoopFileSystem
+    return HadoopFileSystem(host=HOPSFS_NAMENODE, port=int(HOPSFS_NAMENODE_PORT))
+
+
+def _remove_empty_shards(dataset_api, table_names):
+    """Remove the shard directories of the nested layout left empty by removing the tables.
+
+    Lists through the pyarrow HDFS client and removes through the dataset API,
+    like the tables themselves.
+    """
+    from pyarrow.fs import FileSelector
+
+    try:
+        hdfs = _connect_hdfs()
+    except Exception as e:
+        print(f"[CLEANUP] Could not connect to HDFS to remove empty shard directories: {e}")
+        return
+    datasets_dir = f"/Projects/{HOPSWORKS_PROJECT_NAME}/{HOPSWORKS_PROJECT_NAME}_Training_Datasets"
+    removed = remove_empty_shards(
+        datasets_dir, table_names,
+        lambda path: not hdfs.get_file_info(FileSelector(path, allow_not_found=True)),
+        dataset_api.remove,
+    )
+    if removed:
+        print(f"[CLEANUP] Removed {removed} empty shard directories")
+
+
 def cleanup_test_tables():
     """Remove all test tables created during the test run."""
     global _created_tables, _hopsworks_project
@@ -68,19 +117,61 @@ def cleanup_test_tables():
     print(f"\n[CLEANUP] Removing {len(_created_tables)} test tables...")
 
     fs = _hopsworks_project.get_dataset_api()
-
-    for table_name in _created_tables:
-        hopsfs_path = get_hopsfs_path(table_name)
-        try:
-            fs.remove(hopsfs_path)
-            print(f"[CLEANUP] Removed: {table_name}")
-        except Exception as e:
-            print(f"[CLEANUP] Failed to remove {table_name}: {e}")
+    remove_in_parallel(_created_tables, lambda table_name: fs.remove(get_hopsfs_path(table_name)))
+    _remove_empty_shards(fs, _created_tables)
 
     _created_tables.clear()
     print("[CLEANUP] Done")
 
 
+def find_stale_tables(prefix: str = STALE_TABLE_PREFIX) -> list[str]:
+    """List tables left behind by earlier (e.g. crashed) runs.
+
+    Lists through the pyarrow HDFS client rather than the dataset API, which
+    pages its results and needs a Hopsworks login.
+
+    Args:
+        prefix: Table name prefix to match (default "delta_")
+    """
+    from pyarrow.fs import FileSelector, FileType
+
+    fs = _connect_hdfs()
+    datasets_dir = f"/Projects/{HOPSWORKS_PROJECT_NAME}/{HOPSWORKS_PROJECT_NAME}_Training_Datasets"
+
+    def list_subdirs(path):
+        infos = fs.get_file_info(FileSelector(path, allow_not_found=True))
+        return [info.base_name for info in infos if info.type == FileType.Directory]
+
+    return sorted(
+        name for name in list_table_names(datasets_dir, list_subdirs)
+        if name.startswith(prefix) and name not in _created_tables
+    )
+
+
+def cleanup_stale_tables(prefix: str = STALE_TABLE_PREFIX, dry_run: bool = True) -> list[str]:
+    """Find stale tables by prefix and remove them unless dry_run is set.
+
+    Args:
+        prefix: Table name prefix to match (default "delta_")
+        dry_run: Only list the stale tables (default True)
+    """
+    stale = find_stale_tables(prefix)
+    print(f"[CLEANUP] Found {len(stale)} stale tables with prefix '{prefix}'")
+    if dry_run or not stale:
+        for table_name in stale:
+            print(f"[CLEANUP]   - {table_name}")
+        return stale
+
+    if _hopsworks_project is None:
+        print("[CLEANUP] Warning: No Hopsworks project set, cannot remove stale tables")
+        return stale
+
+    fs = _hopsworks_project.get_dataset_api()
+    remove_in_parallel(stale, lambda table_name: fs.remove(get_hopsfs_path(table_name)))
+    _remove_empty_shards(fs, stale)
+    return stale
+
+
 def get_created_tables() -> list[str]:
     """Get list of tables created during this session."""
     return _created_tables.copy()
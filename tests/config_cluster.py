@@ -7,6 +7,9 @@
 
 import os
 
+from tests.cleanup import remove_in_parallel, STALE_TABLE_PREFIX
+from tests.layout import table_subpath, list_table_names, remove_empty_shards
+
 # HopsFS settings (internal cluster DNS)
 HOPSFS_NAMENODE = os.environ.get("HOPSFS_NAMENODE", "namenode.hopsworks.svc.cluster.local")
 HOPSFS_NAMENODE_PORT = os.environ.get("HOPSFS_NAMENODE_PORT", "8020")
@@ -28,12 +31,32 @@ def get_table_path(table_name: str, track: bool = True, schema: str = "hdfs") ->
     """
     if track and table_name not in _created_tables:
         _created_tables.append(table_name)
-    return f"{schema}://{HOPSFS_NAMENODE}:{HOPSFS_NAMENODE_PORT}/Projects/{HOPSWORKS_PROJECT_NAME}/{HOPSWORKS_PROJECT_NAME}_Training_Datasets/{table_name}"
+    return f"{schema}://{HOPSFS_NAMENODE}:{HOPSFS_NAMENODE_PORT}{get_hopsfs_path(table_name)}"
 
 
 def get_hopsfs_path(table_name: str) -> str:
     """Get the HopsFS path (without schema prefix) for filesystem operations."""
-    return f"/Projects/{HOPSWORKS_PROJECT_NAME}/{HOPSWORKS_PROJECT_NAME}_Training_Datasets/{table_name}"
+    return f"/Projects/{HOPSWORKS_PROJECT_NAME}/{HOPSWORKS_PROJECT_NAME}_Training_Datasets/{table_subpath(table_name)}"
+
+
+def _connect_hdfs():
+    """Connect to HopsFS through the pyarrow HDFS client."""
+    from pyarrow.fs import HadoopFileSystem
+    return HadoopFileSystem(host=HOPSFS_NAMENODE, port=int(HOPSFS_NAMENODE_PORT))
+
+
+def _remove_empty_shards(fs, table_names):
+    """Remove the shard directories of the nested layout left empty by removing the tables."""
+    from pyarrow.fs import FileSelector
+
+    datasets_dir = f"/Projects/{HOPSWORKS_PROJECT_NAME}/{HOPSWORKS_PROJECT_NAME}_Training_Datasets"
+    removed = remove_empty_shards(
+        datasets_dir, table_names,
+        lambda path: not fs.get_file_info(FileSelector(path, allow_not_found=True)),
+        fs.delete_dir,
+    )
+    if removed:
+        print(f"[CLEANUP] Removed {removed} empty shard directories")
 
 
 def cleanup_test_tables():
@@ -47,25 +70,60 @@ def cleanup_test_tables():
     print(f"\n[CLEANUP] Removing {len(_created_tables)} test tables...")
 
     try:
-        from pyarrow.fs import HadoopFileSystem
-        fs = HadoopFileSystem(host=HOPSFS_NAMENODE, port=int(HOPSFS_NAMENODE_PORT))
+        fs = _connect_hdfs()
     except Exception as e:
         print(f"[CLEANUP] Could not connect to HDFS: {e}")
         print("[CLEANUP] Tables not cleaned up. Manual cleanup required.")
         return
 
-    for table_name in _created_tables:
-        hopsfs_path = get_hopsfs_path(table_name)
-        try:
-            fs.delete_dir(hopsfs_path)
-            print(f"[CLEANUP] Removed: {table_name}")
-        except Exception as e:
-            print(f"[CLEANUP] Failed to remove {table_name}: {e}")
+    remove_in_parallel(_created_tables, lambda table_name: fs.delete_dir(get_hopsfs_path(table_name)))
+    _remove_empty_shards(fs, _created_tables)
 
     _created_tables.clear()
     print("[CLEANUP] Done")
 
 
+def find_stale_tables(prefix: str = STALE_TABLE_PREFIX) -> list[str]:
+    """List tables left behind by earlier (e.g. crashed) runs.
+
+    Args:
+        prefix: Table name prefix to match (default "delta_")
+    """
+    from pyarrow.fs import FileSelector, FileType
+
+    fs = _connect_hdfs()
+    datasets_dir = f"/Projects/{HOPSWORKS_PROJECT_NAME}/{HOPSWORKS_PROJECT_NAME}_Training_Datasets"
+
+    def list_subdirs(path):
+        infos = fs.get_file_info(FileSelector(path, allow_not_found=True))
+        return [info.base_name for info in infos if info.type == FileType.Directory]
+
+    return sorted(
+        name for name in list_table_names(datasets_dir, list_subdirs)
+        if name.startswith(prefix) and name not in _created_tables
+    )
+
+
+def cleanup_stale_tables(prefix: str = STALE_TABLE_PREFIX, dry_run: bool = True) -> list[str]:
+    """Find stale tables by prefix and remove them unless dry_run is set.
+
+    Args:
+        prefix: Table name prefix to match (default "delta_")
+        dry_run: Only list the stale tables (default True)
+    """
+    stale = find_stale_tables(prefix)
+    print(f"[CLEANUP] Found {len(stale)} stale tables with prefix '{prefix}'")
+    if dry_run or not stale:
+        for table_name in stale:
+            print(f"[CLEANUP]   - {table_name}")
+        return stale
+
+    fs = _connect_hdfs()
+    remove_in_parallel(stale, lambda table_name: fs.delete_dir(get_hopsfs_path(table_name)))
+    _remove_empty_shards(fs, stale)
+    return stale
+
+
 def get_created_tables() -> list[str]:
     """Get list of tables created during this session."""
     return _created_tables.copy()
\ No newline at end of file
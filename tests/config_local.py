@@ -0,0 +1,116 @@
+# -------------------------------
+# Local configuration for tests
+# -------------------------------
+# Use this config to run the delta-rs tests against the local filesystem,
+# e.g. in CI or on a laptop without a Hopsworks cluster. No login, no HopsFS.
+# Tables are created under DELTARS_LOCAL_DIR.
+
+import os
+import shutil
+
+from tests.cleanup import remove_in_parallel, STALE_TABLE_PREFIX
+from tests.layout import table_subpath, list_table_names, remove_empty_shards
+
+# Root directory for local tables (can be overridden via environment)
+LOCAL_TABLES_DIR = os.environ.get("DELTARS_LOCAL_DIR", "/tmp/deltars-test")
+
+# Project name (only used to mirror the HopsFS directory layout)
+HOPSWORKS_PROJECT_NAME = os.environ.get("HOPSWORKS_PROJECT_NAME", "test")
+
+# Track created tables for cleanup
+_created_tables: list[str] = []
+
+
+def get_table_path(table_name: str, track: bool = True, schema: str = "hdfs") -> str:
+    """Generate local path for a delta table and optionally track for cleanup.
+
+    Args:
+        table_name: Name of the delta table
+        track: Whether to track for cleanup (default True)
+        schema: Ignored; local tables are always plain filesystem paths
+    """
+    if track and table_name not in _created_tables:
+        _created_tables.append(table_name)
+    return os.path.join(LOCAL_TABLES_DIR, get_hopsfs_path(table_name).lstrip("/"))
+
+
+def get_hopsfs_path(table_name: str) -> str:
+    """Get the HopsFS-style path (without the local root) of a table."""
+    return f"{get_datasets_dir()}/{table_subpath(table_name)}"
+
+
+def get_datasets_dir() -> str:
+    """HopsFS-style path of the project's Training_Datasets directory (tables live below it)."""
+    return f"/Projects/{HOPSWORKS_PROJECT_NAME}/{HOPSWORKS_PROJECT_NAME}_Training_Datasets"
+
+
+def _remove_table(table_name: str):
+    """Delete one local table directory."""
+    shutil.rmtree(get_table_path(table_name, track=False))
+
+
+def _remove_empty_shards(table_names):
+    """Remove the shard directories of the nested layout left empty by removing the tables."""
+    datasets_dir = os.path.join(LOCAL_TABLES_DIR, get_datasets_dir().lstrip("/"))
+    removed = remove_empty_shards(datasets_dir, table_names, lambda path: not os.listdir(path), os.rmdir)
+    if removed:
+        print(f"[CLEANUP] Removed {removed} empty shard directories")
+
+
+def cleanup_test_tables():
+    """Remove all test tables created during the test run."""
+    global _created_tables
+
+    if not _created_tables:
+        print("[CLEANUP] No tables to clean up")
+        return
+
+    print(f"\n[CLEANUP] Removing {len(_created_tables)} test tables...")
+    remove_in_parallel(_created_tables, _remove_table)
+    _remove_empty_shards(_created_tables)
+
+    _created_tables.clear()
+    print("[CLEANUP] Done")
+
+
+def find_stale_tables(prefix: str = STALE_TABLE_PREFIX) -> list[str]:
+    """List tables left behind by earlier (e.g. crashed) runs.
+
+    Args:
+        prefix: Table name prefix to match (default "delta_")
+    """
+    datasets_dir = os.path.join(LOCAL_TABLES_DIR, get_datasets_dir().lstrip("/"))
+
+    def list_subdirs(path):
+        if not os.path.isdir(path):
+            return []
+        return [name for name in os.listdir(path) if os.path.isdir(os.path.join(path, name))]
+
+    return sorted(
+        name for name in list_table_names(datasets_dir, list_subdirs)
+        if name.startswith(prefix) and name not in _created_tables
+    )
+
+
+def cleanup_stale_tables(prefix: str = STALE_TABLE_PREFIX, dry_run: bool = True) -> list[str]:
+    """Find stale tables by prefix and remove them unless dry_run is set.
+
+    Args:
+        prefix: Table name prefix to match (default "delta_")
+        dry_run: Only list the stale tables (default True)
+    """
+    stale = find_stale_tables(prefix)
+    print(f"[CLEANUP] Found {len(stale)} stale tables with prefix '{prefix}'")
+    if dry_run or not stale:
+        for table_name in stale:
+            print(f"[CLEANUP]   - {table_name}")
+        return stale
+
+    remove_in_parallel(stale, _remove_table)
+    _remove_empty_shards(stale)
+    return stale
+
+
+def get_created_tables() -> list[str]:
+    """Get list of tables created during this session."""
+    return _created_tables.copy()
@@ -0,0 +1,219 @@
+# -------------------------------
+# Data file statistics and data skipping
+# -------------------------------
+# Reports what the add actions of a table's current snapshot
+# (dt.get_add_actions(flatten=True)) tell a reader about each data file, to
+# diagnose why a query reads every file and where to Z-order or change
+# delta.dataSkippingNumIndexedCols / delta.dataSkippingStatsColumns:
+#   - per file: size and row count
+#   - per column: whether it has statistics at all (columns past the indexed
+#     ones do not), the share of files with a min/max, the total null count,
+#     files whose string min/max was truncated, and how much the [min, max]
+#     ranges of the files overlap (if every file overlaps every other, no
+#     filter on the column can skip a file)
+#
+# estimate_files_scanned applies the same min/max and partition value
+# pruning a reader does, for a conjunction of (column, op, value) filters.
+#
+# delta-rs writes string min/max values as prefixes of STATS_TRUNCATE_LENGTH
+# characters (the max with its last character incremented), so a value of
+# exactly that length is reported as truncated.
+
+import bisect
+
+import pyarrow as pa
+from deltalake import DeltaTable
+
+from tests.bench_utils import percentile
+
+# Characters kept of string min/max statistics by the delta-rs writer
+STATS_TRUNCATE_LENGTH = 64
+
+# Leading columns with statistics when delta.dataSkippingNumIndexedCols is not set
+DEFAULT_NUM_INDEXED_COLS = 32
+
+# Filter operators understood by estimate_files_scanned
+FILTER_OPS = ("=", "!=", "<", "<=", ">", ">=", "in")
+
+
+def _leaf_columns(fields, prefix: str = "") -> list[str]:
+    """Dotted names of the leaf columns of a schema, as used by the flattened add actions."""
+    names = []
+    for field in fields:
+        if pa.types.is_struct(field.type):
+            names += _leaf_columns(list(field.type), f"{prefix}{field.name}.")
+        else:
+            names.append(f"{prefix}{field.name}")
+    return names
+
+
+def _spread(values: list) -> dict:
+    if not values:
+        return {"min": None, "median": None, "max": None}
+    return {"min": min(values), "median": percentile(values, 50), "max": max(values)}
+
+
+def _mean_overlap(ranges: list[tuple]) -> float | None:
+    """Mean share of the other files whose [min, max] range overlaps a file's range."""
+    if len(ranges) < 2:
+        return None
+    mins = sorted(low for low, _ in ranges)
+    maxes = sorted(high for _, high in ranges)
+    overlapping = 0
+    for low, high in ranges:
+        # Files starting at or before this one ends, minus those ending before it starts, minus itself
+        overlapping += bisect.bisect_right(mins, high) - bisect.bisect_left(maxes, low) - 1
+    return overlapping / (len(ranges) * (len(ranges) - 1))
+
+
+def _column_stats(rows: list[dict], column: str, partition: bool) -> dict:
+    if partition:
+        return {"partition": True, "indexed": True, "files_with_min_max": len(rows), "coverage": 1.0,
+                "null_count": None, "truncated_files": 0, "mean_overlap": None}
+    if not rows or f"null_count.{column}" not in rows[0]:
+        return {"partition": False, "indexed": False, "files_with_min_max": 0, "coverage": 0.0,
+                "null_count": None, "truncated_files": 0, "mean_overlap": None}
+
+    ranges, truncated, null_counts = [], 0, []
+    for row in rows:
+        low, high = row.get(f"min.{column}"), row.get(f"max.{column}")
+        if row[f"null_count.{column}"] is not None:
+            null_counts.append(row[f"null_count.{column}"])
+        if low is None or high is None:
+            continue
+        ranges.append((low, high))
+        if isinstance(low, str) and STATS_TRUNCATE_LENGTH in (len(low), len(high)):
+            truncated += 1
+    return {
+        "partition": False,
+        "indexed": True,
+        "files_with_min_max": len(ranges),
+        "coverage": len(ranges) / len(rows),
+        "null_count": sum(null_counts) if null_counts else None,
+        "truncated_files": truncated,
+        "mean_overlap": _mean_overlap(ranges),
+    }
+
+
+def file_stats_report(dt: DeltaTable) -> dict:
+    """Per-file and per-column statistics of the current snapshot.
+
+    The report has "files", "rows", "bytes", "file_bytes" and
+    "file_rows" (smallest, median, largest), "files_without_row_count",
+    the skipping configuration ("num_indexed_cols", "stats_columns") and
+    "columns": for every leaf column "partition", "indexed",
+    "files_with_min_max", "coverage", "null_count", "truncated_files" and
+    "mean_overlap" (None with fewer than two files with a min/max).
+
+    Args:
+        dt: Table to inspect
+    """
+    rows = pa.table(dt.get_add_actions(flatten=True)).to_pylist()
+    metadata = dt.metadata()
+    configuration = metadata.configuration
+    partition_columns = set(metadata.partition_columns)
+    schema = pa.schema(dt.schema().to_arrow())
+
+    record_counts = [row["num_records"] for row in rows if row["num_records"] is not None]
+    stats_columns = configuration.get("delta.dataSkippingStatsColumns")
+    return {
+        "table": dt.table_uri,
+        "version": dt.version(),
+        "files": len(rows),
+        "rows": sum(record_counts),
+        "bytes": sum(row["size_bytes"] for row in rows),
+        "file_bytes": _spread([row["size_bytes"] for row in rows]),
+        "file_rows": _spread(record_counts),
+        "files_without_row_count": len(rows) - len(record_counts),
+        "num_indexed_cols": int(configuration.get("delta.dataSkippingNumIndexedCols", DEFAULT_NUM_INDEXED_COLS)),
+        "stats_columns": stats_columns.split(",") if stats_columns else None,
+        "columns": {
+            column: _column_stats(rows, column, column in partition_columns)
+            for column in _leaf_columns(schema)
+        },
+    }
+
+
+def format_file_stats_report(report: dict) -> list[str]:
+    """Lines summarizing a file_stats_report, one per column after the table totals."""
+    sizes = report["file_bytes"]
+    lines = [
+        f"{report['files']} files, {report['rows']} rows, {report['bytes']} bytes at version {report['version']}",
+        f"file bytes min/median/max {sizes['min']}/{sizes['median']:.0f}/{sizes['max']}" if report["files"] else
+        "no data files",
+        f"statistics on the first {report['num_indexed_cols']} columns" if report["stats_columns"] is None else
+        f"statistics on {', '.join(report['stats_columns'])}",
+    ]
+    for column, stats in report["columns"].items():
+        if stats["partition"]:
+            lines.append(f"{column}: partition column")
+        elif not stats["indexed"]:
+            lines.append(f"{column}: no statistics")
+        else:
+            overlap = "n/a" if stats["mean_overlap"] is None else f"{100 * stats['mean_overlap']:.0f}%"
+            lines.append(f"{column}: min/max in {100 * stats['coverage']:.0f}% of files, overlap {overlap}, "
+                         f"nulls {stats['null_count']}, truncated in {stats['truncated_files']} files")
+    return lines
+
+
+def _may_match(low, high, null_count, num_records, op: str, value) -> bool:
+    """Whether a file with this [low, high] range can hold a row matching `column op value`."""
+    if low is None or high is None:
+        # Only a column that is null in every row can be ruled out; otherwise there are no stats
+        return not (num_records is not None and null_count == num_records)
+    if op == "=":
+        return low <= value <= high
+    if op == "!=":
+        return not (low == high == value)
+    if op == "<":
+        return low < value
+    if op == "<=":
+        return low <= value
+    if op == ">":
+        return high > value
+    if op == ">=":
+        return high >= value
+    return any(low <= v <= high for v in value)
+
+
+def estimate_files_scanned(dt: DeltaTable, filters: list[tuple]) -> dict:
+    """Estimate the data files a scan with a conjunction of filters reads after data skipping.
+
+    Files are skipped by their partition values and column min/max and null
+    counts; a file without statistics on a filtered column is always read.
+
+    Args:
+        dt: Table to scan
+        filters: (column, op, value) tuples combined with AND; op is one of
+            FILTER_OPS, the value of "in" is a list
+
+    Returns:
+        Dict with files, files_scanned, bytes_scanned and rows_scanned
+    """
+    for column, op, _ in filters:
+        if op not in FILTER_OPS:
+            raise ValueError(f"Unsupported filter operator {op!r} on {column}")
+    partition_columns = set(dt.metadata().partition_columns)
+    rows = pa.table(dt.get_add_actions(flatten=True)).to_pylist()
+
+    scanned = []
+    for row in rows:
+        keep = True
+        for column, op, value in filters:
+            if column in partition_columns:
+                partition_value = row.get(f"partition.{column}")
+                # A null partition value matches no comparison
+                keep = partition_value is not None and _may_match(partition_value, partition_value, 0, 1, op, value)
+            elif f"null_count.{column}" in row:
+                keep = _may_match(row.get(f"min.{column}"), row.get(f"max.{column}"),
+                                  row[f"null_count.{column}"], row["num_records"], op, value)
+            if not keep:
+                break
+        if keep:
+            scanned.append(row)
+    return {
+        "files": len(rows),
+        "files_scanned": len(scanned),
+        "bytes_scanned": sum(row["size_bytes"] for row in scanned),
+        "rows_scanned": sum(row["num_records"] or 0 for row in scanned),
+    }
@@ -0,0 +1,158 @@
+# -------------------------------
+# Prepared table (fixture) cache
+# -------------------------------
+# Building a large table with a long history can take longer than the
+# benchmark that uses it. Fixtures are built once by a generator function and
+# kept on the backing filesystem next to the test tables, content-addressed
+# by the generator (its name and the source of its whole module, so helpers
+# and constants it uses are covered), its parameters and the deltalake
+# version. Tests get a private clone, so they can modify it freely.
+#
+# A clone copies _delta_log and hard-links the data files where the
+# filesystem supports it (local); elsewhere the data files are copied, which
+# still avoids regenerating the history. Data files cannot be referenced by
+# absolute path instead: the pyarrow read path of deltalake resolves add
+# paths relative to the table root.
+#
+# Fixtures are named fixture_<key>, outside the delta_ prefix used for stale
+# table cleanup. The least recently used ones beyond DELTARS_FIXTURE_CACHE_MAX
+# are evicted after each new build.
+
+import hashlib
+import inspect
+import json
+import os
+import time
+
+import deltalake
+from pyarrow.fs import FileSelector, FileType, LocalFileSystem
+
+import tests.config as config
+from tests.bench_utils import resolve_filesystem
+
+# Set DELTARS_FIXTURE_CACHE=0 to build every fixture directly into the test table
+FIXTURE_CACHE_ENABLED = os.environ.get("DELTARS_FIXTURE_CACHE", "1") != "0"
+
+# Number of fixtures kept before the least recently used ones are evicted
+FIXTURE_CACHE_MAX = int(os.environ.get("DELTARS_FIXTURE_CACHE_MAX", "20"))
+
+FIXTURE_PREFIX = "fixture_"
+
+# Written last into a fixture directory; a fixture without it is incomplete
+MARKER_FILE = "_fixture.json"
+
+
+def fixture_key(generator, params: dict) -> str:
+    """Content address of a fixture: generator name, its module's source, parameters, deltalake version."""
+    description = json.dumps({
+        "generator": f"{generator.__module__}.{generator.__qualname__}",
+        # The whole module, so edits to helpers and constants the generator uses build a new fixture
+        "source": inspect.getsource(inspect.getmodule(generator)),
+        "params": params,
+        "deltalake": deltalake.__version__,
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(description.encode()).hexdigest()[:16]
+
+
+def _read_marker(fs, path: str) -> dict | None:
+    try:
+        with fs.open_input_stream(f"{path}/{MARKER_FILE}") as f:
+            return json.loads(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def _write_marker(fs, path: str, marker: dict):
+    with fs.open_output_stream(f"{path}/{MARKER_FILE}") as f:
+        f.write(json.dumps(marker).encode())
+
+
+def get_fixture(generator, **params) -> str:
+    """Path of the cached fixture built by generator(table_path, **params); built if missing.
+
+    The returned table is shared: clone it with clone_fixture before modifying it.
+
+    Args:
+        generator: Function writing the fixture table to the path it is given
+        **params: JSON-serializable keyword arguments of the generator
+    """
+    key = fixture_key(generator, params)
+    table_path = config.get_table_path(f"{FIXTURE_PREFIX}{key}", track=False)
+    fs, path = resolve_filesystem(table_path)
+
+    marker = _read_marker(fs, path)
+    if marker is None:
+        # Remove leftovers of an interrupted build
+        if fs.get_file_info(path).type != FileType.NotFound:
+            fs.delete_dir(path)
+        started = time.perf_counter()
+        generator(table_path, **params)
+        marker = {"generator": generator.__qualname__, "params": params,
+                  "deltalake": deltalake.__version__, "build_s": time.perf_counter() - started}
+        print(f"[SETUP] Built fixture {generator.__qualname__} {params} in {marker['build_s']:.1f}s")
+        marker["last_used"] = time.time()
+        _write_marker(fs, path, marker)
+        evict_fixtures()
+    else:
+        print(f"[SETUP] Reusing fixture {generator.__qualname__} {params} "
+              f"(saves {marker['build_s']:.1f}s build)")
+        marker["last_used"] = time.time()
+        _write_marker(fs, path, marker)
+    return table_path
+
+
+def clone_fixture(generator, table_name: str, **params) -> str:
+    """Give a test its own copy of a fixture and return the copy's path (tracked for cleanup).
+
+    Args:
+        generator: Function writing the fixture table to the path it is given
+        table_name: Name of the test table to create (replaced if it exists)
+        **params: JSON-serializable keyword arguments of the generator
+    """
+    table_path = config.get_table_path(table_name)
+    fs, path = resolve_filesystem(table_path)
+    if fs.get_file_info(path).type != FileType.NotFound:
+        fs.delete_dir(path)
+
+    if not FIXTURE_CACHE_ENABLED:
+        generator(table_path, **params)
+        return table_path
+
+    _, source = resolve_filesystem(get_fixture(generator, **params))
+    hard_links = isinstance(fs, LocalFileSystem)
+    for info in fs.get_file_info(FileSelector(source, recursive=True)):
+        relative = info.path[len(source):].lstrip("/")
+        if info.type != FileType.File or relative == MARKER_FILE:
+            continue
+        target = f"{path}/{relative}"
+        fs.create_dir(target.rsplit("/", 1)[0])
+        # Data files are never modified in place, so sharing them is safe
+        if hard_links and not relative.startswith("_delta_log/"):
+            os.link(info.path, target)
+        else:
+            fs.copy_file(info.path, target)
+    return table_path
+
+
+def evict_fixtures(max_fixtures: int = FIXTURE_CACHE_MAX) -> list[str]:
+    """Remove the least recently used fixtures beyond max_fixtures; returns the removed names.
+
+    Args:
+        max_fixtures: Number of fixtures to keep
+    """
+    names = config.find_stale_tables(FIXTURE_PREFIX)
+    if len(names) <= max_fixtures:
+        return []
+
+    last_used = {}
+    for name in names:
+        fs, path = resolve_filesystem(config.get_table_path(name, track=False))
+        marker = _read_marker(fs, path)
+        last_used[name] = marker["last_used"] if marker else 0.0
+
+    evicted = sorted(names, key=last_used.get)[:len(names) - max_fixtures]
+    for name in evicted:
+        fs, path = resolve_filesystem(config.get_table_path(name, track=False))
+        fs.delete_dir(path)
+        print(f"[CLEANUP] Evicted fixture {name}")
+    return evicted
@@ -0,0 +1,115 @@
+# -------------------------------
+# Persisted commit history index
+# -------------------------------
+# Local, incrementally updated index of the commitInfo of every version of a
+# Delta table, so repeated audit queries do not re-read the whole _delta_log.
+#
+# One JSON Lines file per table under HISTORY_INDEX_DIR, one line per version
+# (the commitInfo plus "version", the same shape as dt.history() entries).
+# An update only reads the commit files after the last indexed version,
+# probing <version>.json until the next one does not exist. If the table was
+# recreated at the same path (the last indexed commit changed or vanished),
+# the index is rebuilt from the oldest commit file still in the log.
+
+import hashlib
+import json
+import os
+
+from pyarrow.fs import FileSelector, FileType
+
+from tests.bench_utils import resolve_filesystem
+
+# Where index files are kept (can be overridden via environment)
+HISTORY_INDEX_DIR = os.environ.get("DELTARS_HISTORY_INDEX_DIR",
+                                   os.path.join(os.path.expanduser("~"), ".cache", "deltars-history"))
+
+
+def index_path(table_uri: str) -> str:
+    """Path of the index file of a table (named by a hash of its URI)."""
+    digest = hashlib.sha1(table_uri.rstrip("/").encode()).hexdigest()[:16]
+    return os.path.join(HISTORY_INDEX_DIR, f"{digest}.jsonl")
+
+
+def _read_commit_info(fs, log_dir: str, version: int) -> dict | None:
+    """Return the commitInfo of one version, or None if its commit file does not exist."""
+    try:
+        with fs.open_input_stream(f"{log_dir}/{version:020d}.json") as f:
+            lines = f.read().decode().splitlines()
+    except FileNotFoundError:
+        return None
+    for line in lines:
+        if line.startswith('{"commitInfo"'):
+            return {**json.loads(line)["commitInfo"], "version": version}
+    # Writers are not required to write commitInfo
+    return {"version": version}
+
+
+def _oldest_commit_version(fs, log_dir: str) -> int | None:
+    """Version of the oldest commit file still in the log (older ones may be cleaned up)."""
+    infos = fs.get_file_info(FileSelector(log_dir, allow_not_found=True))
+    versions = [
+        int(info.base_name[:-5]) for info in infos
+        if info.type == FileType.File and info.base_name.endswith(".json") and info.base_name[:-5].isdigit()
+    ]
+    return min(versions) if versions else None
+
+
+def _load_index(path: str) -> list[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def update_history_index(table_uri: str) -> list[dict]:
+    """Bring the index of a table up to date and return all its entries (oldest first).
+
+    Args:
+        table_uri: hdfs://, hopsfs:// or local path of the table
+    """
+    fs, table_dir = resolve_filesystem(table_uri)
+    log_dir = f"{table_dir}/_delta_log"
+    path = index_path(table_uri)
+    entries = _load_index(path)
+
+    # The table was recreated if the last indexed commit no longer matches
+    if entries and _read_commit_info(fs, log_dir, entries[-1]["version"]) != entries[-1]:
+        entries = []
+        os.remove(path)
+
+    if entries:
+        next_version = entries[-1]["version"] + 1
+    else:
+        next_version = _oldest_commit_version(fs, log_dir)
+        if next_version is None:
+            return []
+
+    new_entries = []
+    while (entry := _read_commit_info(fs, log_dir, next_version)) is not None:
+        new_entries.append(entry)
+        next_version += 1
+
+    if new_entries:
+        os.makedirs(HISTORY_INDEX_DIR, exist_ok=True)
+        with open(path, "a") as f:
+            for entry in new_entries:
+                f.write(json.dumps(entry) + "\n")
+    return entries + new_entries
+
+
+def query_history(table_uri: str, limit: int | None = None) -> list[dict]:
+    """Commit history from the index, newest first, like dt.history(limit).
+
+    Args:
+        table_uri: hdfs://, hopsfs:// or local path of the table
+        limit: Maximum number of entries (default: all)
+    """
+    entries = update_history_index(table_uri)[::-1]
+    return entries[:limit] if limit else entries
+
+
+def drop_history_index(table_uri: str):
+    """Remove the index file of a table, if any."""
+    path = index_path(table_uri)
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,191 @@
+# -------------------------------
+# Incremental, time-bounded compaction
+# -------------------------------
+# Maintenance windows are limited, so instead of one compact over the whole
+# table this driver compacts partition by partition within a time budget:
+#   1. a pass ranks the partitions by their number of small files (from the
+#      add actions of the current snapshot) and keeps those worth compacting
+#   2. partitions are compacted worst first with partition_filters, one
+#      commit each; a partition not expected to finish in the rest of the
+#      budget is skipped for a smaller one, and runs end when the budget is
+#      used up
+#   3. the partitions still pending are persisted, and the next run resumes
+#      the pass with them before ranking the table again
+#
+# A compact cannot be interrupted, so the budget is kept by not starting a
+# partition whose estimated duration (the bytes of its small files, which are
+# all compact rewrites, over the compaction throughput measured so far,
+# persisted across runs) does not fit. The first partition of a run is always
+# started, so a partition larger than the whole budget cannot stall every
+# later run.
+#
+# State is kept in one JSON file per table under MAINTENANCE_STATE_DIR, not in
+# the table directory, so vacuum cannot remove it.
+
+import datetime
+import hashlib
+import json
+import os
+import time
+
+import pyarrow as pa
+from deltalake import DeltaTable
+
+# Where resume state is kept (can be overridden via environment)
+MAINTENANCE_STATE_DIR = os.environ.get("DELTARS_MAINTENANCE_STATE_DIR",
+                                       os.path.join(os.path.expanduser("~"), ".cache", "deltars-maintenance"))
+
+# Files smaller than this count as small
+SMALL_FILE_BYTES = 32 * 1024 * 1024
+
+# Partitions with fewer small files are not worth a compaction commit
+MIN_SMALL_FILES = 2
+
+
+def state_path(table_uri: str) -> str:
+    """Path of the resume state file of a table (named by a hash of its URI)."""
+    digest = hashlib.sha1(table_uri.rstrip("/").encode()).hexdigest()[:16]
+    return os.path.join(MAINTENANCE_STATE_DIR, f"{digest}.json")
+
+
+def _load_state(path: str) -> dict:
+    if not os.path.exists(path):
+        return {"pending": [], "bytes_per_s": None, "runs": 0}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_state(path: str, state: dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def drop_maintenance_state(table_uri: str):
+    """Forget the resume state of a table (the next run starts a new pass)."""
+    path = state_path(table_uri)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def _partition_filter_value(value) -> str:
+    """Delta serialization of a partition value, as partition_filters compares it ("" for null)."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return str(value)
+
+
+def partition_file_stats(dt: DeltaTable, small_file_bytes: int = SMALL_FILE_BYTES) -> list[dict]:
+    """Files, small files and their bytes per partition of the current snapshot, most small files first.
+
+    Each entry has "partition" ({column: value in the Delta serialization
+    that partition_filters matches, "" for null}), "files", "small_files",
+    "bytes" and "small_bytes" (of the small files).
+
+    Args:
+        dt: Partitioned table
+        small_file_bytes: Files smaller than this count as small
+    """
+    columns = dt.metadata().partition_columns
+    if not columns:
+        raise ValueError(f"{dt.table_uri} is not partitioned")
+    actions = pa.table(dt.get_add_actions(flatten=True))
+
+    stats = {}
+    for row in actions.select(["size_bytes"] + [f"partition.{c}" for c in columns]).to_pylist():
+        values = tuple(_partition_filter_value(row[f"partition.{c}"]) for c in columns)
+        entry = stats.setdefault(values, {"partition": dict(zip(columns, values)),
+                                          "files": 0, "small_files": 0, "bytes": 0, "small_bytes": 0})
+        entry["files"] += 1
+        entry["bytes"] += row["size_bytes"]
+        if row["size_bytes"] < small_file_bytes:
+            entry["small_files"] += 1
+            entry["small_bytes"] += row["size_bytes"]
+    return sorted(stats.values(), key=lambda e: e["small_files"], reverse=True)
+
+
+def compact_incrementally(table_uri: str, time_budget_s: float, small_file_bytes: int = SMALL_FILE_BYTES,
+                          min_small_files: int = MIN_SMALL_FILES, target_size: int | None = None) -> dict:
+    """Compact the partitions with the most small files first until the time budget is used up.
+
+    Resumes the pass of an earlier run if it left partitions pending. The
+    first pending partition is always compacted; later ones whose estimated
+    duration does not fit the rest of the budget are skipped (and stay
+    pending) in favour of smaller ones.
+
+    Args:
+        table_uri: hdfs://, hopsfs:// or local path of a partitioned table
+        time_budget_s: Seconds this run may take
+        small_file_bytes: Files smaller than this count as small
+        min_small_files: Partitions with fewer small files are skipped
+        target_size: Target file size passed to compact (default: the table's)
+
+    Returns:
+        Dict with the partitions compacted (with their metrics), files
+        removed and added, partitions still pending, elapsed seconds and
+        whether the budget stopped the run
+    """
+    started = time.perf_counter()
+    path = state_path(table_uri)
+    state = _load_state(path)
+    dt = DeltaTable(table_uri)
+
+    resumed = bool(state["pending"])
+    if not resumed:
+        state["pending"] = [
+            {"partition": e["partition"], "small_bytes": e["small_bytes"]}
+            for e in partition_file_stats(dt, small_file_bytes) if e["small_files"] >= min_small_files
+        ]
+    state["runs"] += 1
+
+    compacted = []
+    skipped = []
+    stopped = False
+    while state["pending"]:
+        entry = state["pending"][0]
+        remaining_s = time_budget_s - (time.perf_counter() - started)
+        if compacted and remaining_s <= 0:
+            stopped = True
+            break
+        estimate_s = entry["small_bytes"] / state["bytes_per_s"] if state["bytes_per_s"] else 0.0
+        if compacted and estimate_s > remaining_s:
+            skipped.append(state["pending"].pop(0))
+            stopped = True
+            continue
+
+        partition_started = time.perf_counter()
+        metrics = dt.optimize.compact(
+            partition_filters=[(column, "=", value) for column, value in entry["partition"].items()],
+            target_size=target_size,
+        )
+        duration_s = time.perf_counter() - partition_started
+        if duration_s > 0 and entry["small_bytes"]:
+            # Smoothed, so one slow partition does not stall the next runs
+            observed = entry["small_bytes"] / duration_s
+            previous = state["bytes_per_s"]
+            state["bytes_per_s"] = observed if previous is None else 0.5 * previous + 0.5 * observed
+
+        compacted.append({**entry, "duration_s": duration_s, "metrics": metrics})
+        state["pending"].pop(0)
+        _save_state(path, {**state, "pending": skipped + state["pending"]})
+
+    # Skipped partitions keep their place at the head of the queue
+    state["pending"] = skipped + state["pending"]
+    _save_state(path, state)
+    return {
+        "resumed": resumed,
+        "compacted": compacted,
+        "files_removed": sum(c["metrics"].get("numFilesRemoved", 0) for c in compacted),
+        "files_added": sum(c["metrics"].get("numFilesAdded", 0) for c in compacted),
+        "pending": len(state["pending"]),
+        "elapsed_s": time.perf_counter() - started,
+        "stopped_by_budget": stopped,
+    }
@@ -0,0 +1,87 @@
+# -------------------------------
+# Table directory layout
+# -------------------------------
+# Where tables live below the project's Training_Datasets directory, shared by
+# the remote, cluster and local configs.
+#
+#   flat    every table directly in the datasets directory (as on Hopsworks)
+#   nested  tables sharded into hash-named subdirectories, e.g. 3f/a2/<table>,
+#           so no single directory holds thousands of entries
+#
+# The namenode keeps one entry per directory and file, and large directories
+# make listings and lock contention expensive, so the layout matters when a
+# run creates thousands of tables (see tests/bench_many_tables.py).
+
+import hashlib
+import os
+
+TABLE_LAYOUTS = ("flat", "nested")
+
+# Layout used by get_table_path (CLI: --table-layout, env: DELTARS_TABLE_LAYOUT)
+TABLE_LAYOUT = os.environ.get("DELTARS_TABLE_LAYOUT", "flat")
+
+# Subdirectory levels of the nested layout, and hex characters per level
+# (2 characters = 256 subdirectories per level)
+SHARD_LEVELS = int(os.environ.get("DELTARS_TABLE_SHARD_LEVELS", "2"))
+SHARD_WIDTH = 2
+
+
+def table_subpath(table_name: str) -> str:
+    """Path of a table relative to the datasets directory under the current layout."""
+    if TABLE_LAYOUT == "flat":
+        return table_name
+    digest = hashlib.sha1(table_name.encode()).hexdigest()
+    shards = [digest[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] for i in range(SHARD_LEVELS)]
+    return "/".join(shards + [table_name])
+
+
+def list_table_names(datasets_dir: str, list_subdirs) -> list[str]:
+    """List the names of all tables under the datasets directory, descending into shards.
+
+    Args:
+        datasets_dir: The project's Training_Datasets directory
+        list_subdirs: Function returning the names of the subdirectories of a directory
+    """
+    dirs = [datasets_dir]
+    if TABLE_LAYOUT == "nested":
+        for _ in range(SHARD_LEVELS):
+            dirs = [f"{d}/{child}" for d in dirs for child in list_subdirs(d)]
+    return [name for d in dirs for name in list_subdirs(d)]
+
+
+def shard_dirs(table_names) -> list[str]:
+    """Shard directories (relative to the datasets directory) holding the given tables, deepest first."""
+    if TABLE_LAYOUT == "flat":
+        return []
+    dirs = set()
+    for name in table_names:
+        shards = table_subpath(name).split("/")[:-1]
+        dirs.update("/".join(shards[:level]) for level in range(1, len(shards) + 1))
+    return sorted(dirs, key=lambda d: d.count("/"), reverse=True)
+
+
+def remove_empty_shards(datasets_dir: str, table_names, is_empty, remove_dir) -> int:
+    """Remove the shard directories of removed tables once they are empty.
+
+    Deepest levels go first, so a parent emptied by removing its last child
+    is removed as well. Shards still holding other tables are kept.
+
+    Args:
+        datasets_dir: The project's Training_Datasets directory
+        table_names: Tables that were removed
+        is_empty: Function telling whether a directory has no entries
+        remove_dir: Function removing a directory
+
+    Returns:
+        Number of shard directories removed
+    """
+    removed = 0
+    for shard in shard_dirs(table_names):
+        path = f"{datasets_dir}/{shard}"
+        try:
+            if is_empty(path):
+                remove_dir(path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
@@ -0,0 +1,297 @@
+# -------------------------------
+# Local Hopsworks stand-in
+# -------------------------------
+# Minimal stand-in for the parts of the Hopsworks feature store API used by
+# the feature store tests and benchmarks, backed by local Delta tables so
+# they run on the local backend (CI, laptops) without a cluster.
+#
+# Supported:
+#   project.get_feature_store()
+#   fs.get_or_create_feature_group / get_feature_group
+#   fs.create_feature_view / get_feature_view
+#   fg.insert (upsert on the primary key), fg.read, fg.select_all, fg.select, fg.delete
+#   query.join (point-in-time join on the event time if both sides have one), query.read
+#   fv.train_validation_test_split, fv.create_train_test_split,
+#   fv.get_train_test_split, fv.delete (with labels)
+#   fv.init_serving, fv.get_feature_vector
+#   job.get_state, job.get_final_state, job.get_executions
+#
+# Offline data lives in <LOCAL_TABLES_DIR>/apps/hive/warehouse/<project>_featurestore.db
+# and training datasets in the project's Training_Datasets directory, like on
+# Hopsworks. The online store is not simulated: online reads return the
+# offline table. Jobs run synchronously, so they never queue. Training data
+# keeps primary key and event time columns.
+
+import os
+import shutil
+import time
+
+import pandas as pd
+from deltalake import DeltaTable, write_deltalake
+
+import tests.config_local as config_local
+
+_project = None
+
+
+class LocalExecution:
+    """Finished execution of a job."""
+
+    def __init__(self, execution_id: int, submission_time: float, duration_s: float,
+                 final_status: str = "SUCCEEDED"):
+        self.id = execution_id
+        self.submission_time = submission_time
+        self.duration = int(duration_s * 1000)
+        self.state = "FINISHED" if final_status == "SUCCEEDED" else "FAILED"
+        self.final_status = final_status
+
+
+class LocalJob:
+    """Job that already finished when it is returned."""
+
+    def __init__(self, name: str, final_state: str = "SUCCEEDED", submission_time: float | None = None,
+                 duration_s: float = 0.0):
+        self.name = name
+        self._final_state = final_state
+        self._execution = LocalExecution(1, submission_time or time.time(), duration_s, final_state)
+
+    def get_state(self) -> str:
+        return self._execution.state
+
+    def get_final_state(self) -> str:
+        return self._final_state
+
+    def get_executions(self) -> list[LocalExecution]:
+        return [self._execution]
+
+
+class LocalQuery:
+    """Query over one feature group, optionally joined with other queries."""
+
+    def __init__(self, feature_group: "LocalFeatureGroup", features: list[str] | None = None):
+        self.feature_group = feature_group
+        self.features = features
+        self._joins: list[tuple] = []  # (query, on, prefix)
+
+    def join(self, sub_query: "LocalQuery", on: list[str] | None = None, prefix: str | None = None) -> "LocalQuery":
+        """Left join another query on `on` (default: this feature group's primary key)."""
+        self._joins.append((sub_query, on or self.feature_group.primary_key, prefix))
+        return self
+
+    def _read_own(self, keys: list[str], entry: dict | None = None) -> pd.DataFrame:
+        """Read this query's feature group with its selected features plus keys and event time."""
+        df = self.feature_group._read(entry)
+        if self.features is None:
+            return df
+        event_time = [self.feature_group.event_time] if self.feature_group.event_time else []
+        columns = list(dict.fromkeys(keys + event_time + self.features))
+        return df[columns]
+
+    def read(self, online: bool = False) -> pd.DataFrame:
+        return self._read()
+
+    def _read(self, entry: dict | None = None) -> pd.DataFrame:
+        """Read the joined result, optionally only the rows matching the key values in entry."""
+        result = self._read_own(self.feature_group.primary_key, entry)
+        left_time = self.feature_group.event_time
+
+        for sub_query, on, prefix in self._joins:
+            right = sub_query._read_own(on, entry)
+            right_time = sub_query.feature_group.event_time
+            if prefix:
+                right = right.rename(columns={c: prefix + c for c in right.columns if c not in on})
+                right_time = prefix + right_time if right_time else None
+
+            if left_time and right_time:
+                # Point-in-time join: latest right row at or before each left event time
+                right = right.rename(columns={right_time: left_time}).sort_values(left_time)
+                result = pd.merge_asof(result.sort_values(left_time), right, on=left_time, by=on,
+                                       direction="backward")
+            else:
+                result = result.merge(right.drop(columns=[right_time] if right_time else []), on=on, how="left")
+        return result.reset_index(drop=True)
+
+
+class LocalFeatureGroup:
+    """Feature group stored as one Delta table."""
+
+    def __init__(self, feature_store: "LocalFeatureStore", name: str, version: int,
+                 primary_key: list[str], online_enabled: bool = False, event_time: str | None = None):
+        self.feature_store = feature_store
+        self.name = name
+        self.version = version
+        self.primary_key = primary_key
+        self.online_enabled = online_enabled
+        self.event_time = event_time
+        self.location = os.path.join(feature_store.location, f"{name}_{version}")
+
+    def insert(self, features: pd.DataFrame, wait: bool = False, write_options: dict | None = None):
+        """Upsert rows on the primary key; returns (job, validation report) like Hopsworks."""
+        if not DeltaTable.is_deltatable(self.location):
+            write_deltalake(self.location, features, mode="overwrite")
+        else:
+            predicate = " AND ".join(f"target.{key} = source.{key}" for key in self.primary_key)
+            (
+                DeltaTable(self.location)
+                .merge(features, predicate=predicate, source_alias="source", target_alias="target")
+                .when_matched_update_all()
+                .when_not_matched_insert_all()
+                .execute()
+            )
+        job = LocalJob(f"{self.name}_{self.version}_offline_fg_materialization") if self.online_enabled else None
+        return job, None
+
+    def read(self, online: bool = False) -> pd.DataFrame:
+        return self._read()
+
+    def _read(self, entry: dict | None = None) -> pd.DataFrame:
+        """Read the table, optionally only the rows matching the key values in entry."""
+        filters = [(key, "=", value) for key, value in (entry or {}).items()] or None
+        return DeltaTable(self.location).to_pandas(filters=filters)
+
+    def select_all(self) -> LocalQuery:
+        return LocalQuery(self)
+
+    def select(self, features: list[str]) -> LocalQuery:
+        return LocalQuery(self, features)
+
+    def delete(self):
+        self.feature_store._feature_groups.pop((self.name, self.version), None)
+        shutil.rmtree(self.location, ignore_errors=True)
+
+
+class LocalFeatureView:
+    """Feature view over a query, with training datasets written as Delta tables."""
+
+    def __init__(self, feature_store: "LocalFeatureStore", name: str, version: int, query: LocalQuery,
+                 labels: list[str] | None = None):
+        self.feature_store = feature_store
+        self.name = name
+        self.version = version
+        self.query = query
+        self.labels = labels or []
+        self._training_datasets = 0
+
+    def _training_dataset_path(self, td_version: int, split: str) -> str:
+        return os.path.join(self.feature_store.training_datasets_location,
+                            f"{self.name}_{self.version}_{td_version}", split)
+
+    @staticmethod
+    def _split(df: pd.DataFrame, sizes: list[float], seed: int | None) -> list[pd.DataFrame]:
+        """Randomly split df into consecutive fractions; the first split gets the remainder."""
+        shuffled = df.sample(frac=1, random_state=seed).reset_index(drop=True)
+        bounds = [round(len(shuffled) * size) for size in sizes]
+        splits, start = [], len(shuffled) - sum(bounds)
+        splits.append(shuffled.iloc[:start])
+        for bound in bounds:
+            splits.append(shuffled.iloc[start:start + bound])
+            start += bound
+        return [split.reset_index(drop=True) for split in splits]
+
+    def _features_and_labels(self, df: pd.DataFrame) -> tuple:
+        """Separate label columns (y) from features (X); y is None without labels."""
+        if not self.labels:
+            return df, None
+        return df.drop(columns=self.labels), df[self.labels]
+
+    def train_validation_test_split(self, validation_size: float, test_size: float, seed: int | None = None):
+        """In-memory split; returns X_train, X_val, X_test, y_train, y_val, y_test."""
+        splits = [self._features_and_labels(df)
+                  for df in self._split(self.query.read(), [validation_size, test_size], seed)]
+        return tuple(x for x, _ in splits) + tuple(y for _, y in splits)
+
+    def create_train_test_split(self, test_size: float, seed: int | None = None, **kwargs):
+        """Materialize a train/test split; returns (training dataset version, job)."""
+        submitted = time.time()
+        self._training_datasets += 1
+        td_version = self._training_datasets
+        train, test = self._split(self.query.read(), [test_size], seed)
+        for split, df in (("train", train), ("test", test)):
+            write_deltalake(self._training_dataset_path(td_version, split), df, mode="overwrite")
+        return td_version, LocalJob(f"{self.name}_{self.version}_create_fv_td", submission_time=submitted,
+                                    duration_s=time.time() - submitted)
+
+    def get_train_test_split(self, training_dataset_version: int):
+        """Read a materialized split; returns X_train, X_test, y_train, y_test."""
+        (x_train, y_train), (x_test, y_test) = (
+            self._features_and_labels(DeltaTable(self._training_dataset_path(training_dataset_version, split)).to_pandas())
+            for split in ("train", "test")
+        )
+        return x_train, x_test, y_train, y_test
+
+    def init_serving(self, **kwargs):
+        pass
+
+    def get_feature_vector(self, entry: dict, allow_missing: bool = False, **kwargs) -> list:
+        """Look up the features (without labels) of one entity, keyed by primary key values."""
+        rows = self.query._read(entry)
+        features = [c for c in rows.columns if c not in self.labels]
+        if rows.empty:
+            if not allow_missing:
+                raise ValueError(f"No feature vector found for entry {entry}")
+            return [None] * len(features)
+        return rows[features].iloc[-1].tolist()
+
+    def delete(self):
+        self.feature_store._feature_views.pop((self.name, self.version), None)
+        for td_version in range(1, self._training_datasets + 1):
+            shutil.rmtree(os.path.dirname(self._training_dataset_path(td_version, "train")), ignore_errors=True)
+
+
+class LocalFeatureStore:
+    """Feature store of one local project."""
+
+    def __init__(self, project_name: str):
+        self.name = f"{project_name}_featurestore"
+        self.location = os.path.join(config_local.LOCAL_TABLES_DIR, "apps", "hive", "warehouse",
+                                     f"{self.name}.db")
+        self.training_datasets_location = os.path.join(config_local.LOCAL_TABLES_DIR,
+                                                       config_local.get_datasets_dir().lstrip("/"))
+        self._feature_groups: dict[tuple, LocalFeatureGroup] = {}
+        self._feature_views: dict[tuple, LocalFeatureView] = {}
+
+    def get_or_create_feature_group(self, name: str, version: int, primary_key: list[str] | None = None,
+                                    online_enabled: bool = False, event_time: str | None = None,
+                                    **kwargs) -> LocalFeatureGroup:
+        key = (name, version)
+        if key not in self._feature_groups:
+            self._feature_groups[key] = LocalFeatureGroup(self, name, version, primary_key or [], online_enabled,
+                                                          event_time)
+        return self._feature_groups[key]
+
+    def get_feature_group(self, name: str, version: int) -> LocalFeatureGroup:
+        if (name, version) not in self._feature_groups:
+            raise FileNotFoundError(f"Feature group {name} v{version} does not exist")
+        return self._feature_groups[(name, version)]
+
+    def create_feature_view(self, name: str, version: int, query: LocalQuery, labels: list[str] | None = None,
+                            **kwargs) -> LocalFeatureView:
+        view = LocalFeatureView(self, name, version, query, labels)
+        self._feature_views[(name, version)] = view
+        return view
+
+    def get_feature_view(self, name: str, version: int) -> LocalFeatureView:
+        if (name, version) not in self._feature_views:
+            raise FileNotFoundError(f"Feature view {name} v{version} does not exist")
+        return self._feature_views[(name, version)]
+
+
+class LocalProject:
+    """Project with a single local feature store."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._feature_store = LocalFeatureStore(name)
+
+    def get_feature_store(self) -> LocalFeatureStore:
+        return self._feature_store
+
+
+def login() -> LocalProject:
+    """Return the local stand-in project (created on first call)."""
+    global _project
+
+    if _project is None:
+        _project = LocalProject(config_local.HOPSWORKS_PROJECT_NAME)
+        print(f"Using local Hopsworks stand-in project: {_project.name}")
+    return _project
@@ -0,0 +1,155 @@
+# -------------------------------
+# Process memory (RSS) sampling
+# -------------------------------
+# Samples the resident set size of this process at high frequency while an
+# operation runs, to find its peak memory (used by the runner's --memory
+# option and tests/bench_memory.py). MERGE, z-order and compact allocate in
+# the delta-rs Rust runtime, which Python-level tracers such as tracemalloc
+# cannot see, so RSS is sampled instead.
+#
+# RSS comes from /proc/self/statm (Linux, as in the pods). Elsewhere only the
+# process-wide peak from getrusage is available and no time series.
+#
+# run_in_process runs a measurement in a freshly spawned process, so memory
+# kept by earlier work does not hide its peak, and reports a process that was
+# killed (OOM killer, allocation failure abort) instead of waiting for it.
+
+import multiprocessing as mp
+import os
+import queue
+import resource
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds between RSS samples
+MEMORY_SAMPLE_INTERVAL_S = 0.002
+
+# Samples kept in the returned time series (evenly thinned beyond this)
+MAX_SERIES_POINTS = 1000
+
+# Seconds between checks whether a process started by run_in_process is still alive
+PROCESS_POLL_INTERVAL_S = 1.0
+
+MiB = 1024 * 1024
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_bytes() -> int | None:
+    """Current resident set size of this process, or None if /proc is not available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process since it started (getrusage)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _thin(series: list, max_points: int) -> list:
+    if len(series) <= max_points:
+        return series
+    step = len(series) / max_points
+    return [series[int(i * step)] for i in range(max_points)]
+
+
+@contextmanager
+def sample_rss(interval_s: float = MEMORY_SAMPLE_INTERVAL_S):
+    """Sample RSS in a background thread while the block runs.
+
+    Yields a dict that is filled in when the block exits:
+    baseline_bytes (RSS before), peak_bytes, peak_delta_bytes (peak minus
+    baseline), duration_s and series, a list of (seconds since start, RSS
+    bytes) pairs. Without /proc the peak is the process-wide getrusage peak
+    and the series is empty.
+
+    Args:
+        interval_s: Seconds between samples
+    """
+    result = {}
+    series = []
+    stop = threading.Event()
+    baseline = current_rss_bytes()
+    started = time.perf_counter()
+
+    def sample():
+        while True:
+            rss = current_rss_bytes()
+            series.append((time.perf_counter() - started, rss))
+            if stop.wait(interval_s):
+                return
+
+    sampler = threading.Thread(target=sample, name="rss-sampler", daemon=True)
+    if baseline is not None:
+        sampler.start()
+    try:
+        yield result
+    finally:
+        duration_s = time.perf_counter() - started
+        if baseline is not None:
+            stop.set()
+            sampler.join()
+            series.append((duration_s, current_rss_bytes()))
+            peak = max(rss for _, rss in series)
+        else:
+            baseline, peak = 0, peak_rss_bytes()
+        result.update({
+            "baseline_bytes": baseline,
+            "peak_bytes": peak,
+            "peak_delta_bytes": peak - baseline,
+            "duration_s": duration_s,
+            "series": _thin(series, MAX_SERIES_POINTS),
+        })
+
+
+def format_memory(result: dict) -> str:
+    """One-line summary of a sample_rss result."""
+    return (f"peak={result['peak_bytes'] / MiB:.1f}MiB (+{result['peak_delta_bytes'] / MiB:.1f}MiB over "
+            f"{result['baseline_bytes'] / MiB:.1f}MiB baseline), {len(result['series'])} samples")
+
+
+def _process_worker(fn, args, results):
+    try:
+        results.put({"result": fn(*args), "error": None})
+    except Exception as e:
+        results.put({"result": None, "error": f"{type(e).__name__}: {e}"})
+
+
+def run_in_process(fn, *args) -> dict:
+    """Call fn(*args) in a freshly spawned process and wait for it.
+
+    fn must be a module-level function and its result picklable. Returns a
+    dict with "result" (fn's return value), "error" (the exception fn raised,
+    as a string) and "killed" (how the process died without reporting, e.g.
+    "signal SIGKILL"), the latter two None if they did not happen.
+
+    Args:
+        fn: Function to run
+        *args: Its arguments
+    """
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    process = ctx.Process(target=_process_worker, args=(fn, args, results))
+    process.start()
+    # Drain the queue before joining so a large result cannot block the child's exit
+    outcome = None
+    while outcome is None:
+        try:
+            outcome = results.get(timeout=PROCESS_POLL_INTERVAL_S)
+        except queue.Empty:
+            if not process.is_alive():
+                break
+    process.join()
+    if outcome is None:
+        code = process.exitcode
+        cause = f"signal {signal.Signals(-code).name}" if code < 0 else f"exit code {code}"
+        return {"result": None, "error": None, "killed": cause}
+    return {**outcome, "killed": None}
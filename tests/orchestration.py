@@ -0,0 +1,94 @@
+# -------------------------------
+# Asyncio orchestration of blocking steps
+# -------------------------------
+# deltalake and hopsworks calls block on remote I/O (HopsFS commits, REST
+# calls, jobs). Independent steps, e.g. creating the tables a category needs,
+# can overlap: run_parallel runs blocking callables in worker threads from an
+# asyncio event loop, at most `concurrency` at a time, next to coroutines such
+# as wait_for_job_async that poll a feature store job without holding a
+# worker for the whole time the job runs.
+
+import asyncio
+import os
+import time
+
+# Default number of blocking steps running at the same time (env: DELTARS_MAX_CONCURRENCY)
+MAX_CONCURRENCY = int(os.environ.get("DELTARS_MAX_CONCURRENCY", "8"))
+
+# Execution states of a job that has not started running yet
+QUEUED_STATES = {"INITIALIZING", "NEW", "NEW_SAVING", "SUBMITTED", "ACCEPTED", "PENDING"}
+
+# Execution states of a job that has stopped
+FINAL_STATES = {"FINISHED", "FAILED", "KILLED", "FRAMEWORK_FAILURE", "APP_MASTER_START_FAILED",
+                "INITIALIZATION_FAILED"}
+
+
+async def _run_steps(steps, concurrency: int) -> list:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def run(step):
+        if asyncio.iscoroutine(step):
+            return await step
+        async with limit:
+            return await asyncio.to_thread(step)
+
+    return await asyncio.gather(*(run(step) for step in steps))
+
+
+def run_parallel(steps, concurrency: int = MAX_CONCURRENCY) -> list:
+    """Run independent steps concurrently and return their results in order.
+
+    The first exception is raised once it occurs; steps already running in
+    worker threads still run to completion.
+
+    Args:
+        steps: Zero-argument callables (run in worker threads, e.g.
+            functools.partial objects) or coroutines (run on the event loop)
+        concurrency: Maximum number of callables running at the same time
+    """
+    return asyncio.run(_run_steps(steps, concurrency))
+
+
+async def wait_for_job_async(job, poll_interval_s: float = 1.0, timeout_s: float = 3600.0) -> dict:
+    """Poll the latest execution of a feature store job until it stops, without blocking other steps.
+
+    Args:
+        job: Job returned by e.g. create_train_test_split(write_options={"wait_for_job": False})
+        poll_interval_s: Seconds between polls
+        timeout_s: Give up after this many seconds
+
+    Returns:
+        Dict with final_status (e.g. SUCCEEDED), queue_s (from the call until
+        the execution was seen running) and run_s (until it stopped). An
+        execution that started and stopped between two polls is timed by its
+        own reported duration, and queue_s is the rest of the wait.
+    """
+    started = time.perf_counter()
+    running_at = None
+    deadline = started + timeout_s
+
+    while True:
+        executions = await asyncio.to_thread(job.get_executions)
+        execution = max(executions, key=lambda e: e.id) if executions else None
+        now = time.perf_counter()
+        state = execution.state if execution else "NEW"
+
+        if state in FINAL_STATES:
+            break
+        if running_at is None and state not in QUEUED_STATES:
+            running_at = now
+        if now > deadline:
+            raise Exception(f"Job {job.name} still {state} after {timeout_s}s")
+        await asyncio.sleep(poll_interval_s)
+
+    if running_at is None:
+        run_s = (execution.duration or 0) / 1000
+        queue_s = max(0.0, now - started - run_s)
+    else:
+        queue_s, run_s = running_at - started, now - running_at
+    return {"final_status": execution.final_status, "queue_s": queue_s, "run_s": run_s}
+
+
+def wait_for_job(job, poll_interval_s: float = 1.0, timeout_s: float = 3600.0) -> dict:
+    """Blocking wait_for_job_async, for callers outside an event loop (same arguments and result)."""
+    return asyncio.run(wait_for_job_async(job, poll_interval_s, timeout_s))
@@ -0,0 +1,200 @@
+# -------------------------------
+# Per-test profiling
+# -------------------------------
+# Profiles a test run to see whether its time goes to pandas, Arrow, the
+# delta-rs Rust side or the Hopsworks client. Used by the runner's --profile
+# option; combine with -k to profile a single registry entry, e.g.
+#   python run_all.py dml -k "Merge: Upsert" --profile sampling
+#
+# Modes (output files are named after the test, e.g. merge_upsert.*):
+#   cprofile  deterministic Python profile: <name>.prof (pstats, e.g. for
+#             snakeviz) and the top functions by cumulative time in <name>.txt.
+#             Only the test thread is profiled, so work the test hands to
+#             other threads (run_parallel, asyncio.to_thread, thread pools)
+#             shows up as time waiting for it.
+#   sampling  samples the Python stacks of the test thread and of the threads
+#             started while the test runs every few milliseconds, each under
+#             a "thread <name>" root frame: <name>.collapsed (flamegraph.pl /
+#             speedscope) and <name>.speedscope.json. Time inside Rust or C
+#             code is attributed to the Python function that called into it.
+#   py-spy    runs py-spy against this process with --native, so Rust and C
+#             frames are included: <name>.speedscope.json. Falls back to
+#             sampling if py-spy is not installed or cannot attach.
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+PROFILE_MODES = ("cprofile", "sampling", "py-spy")
+
+# Seconds between stack samples of the sampling profiler
+SAMPLE_INTERVAL_S = 0.005
+
+# Functions listed in the cprofile text report
+TOP_FUNCTIONS = 30
+
+
+def profile_name(test_name: str) -> str:
+    """File name stem for a test, e.g. "Merge: Upsert" -> "merge_upsert"."""
+    return re.sub(r"[^a-z0-9]+", "_", test_name.lower()).strip("_")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _sample_stacks(thread_id: int, stop: threading.Event, interval_s: float) -> dict:
+    """Count the stacks (root first) of a thread and of the threads started after this call until stop is set.
+
+    Threads running before the call (other than thread_id), e.g. those of
+    other categories under --workers, and the sampler itself are skipped.
+    """
+    skipped = {thread.ident for thread in threading.enumerate()} - {thread_id}
+    skipped.add(threading.get_ident())
+    counts = {}
+    while not stop.wait(interval_s):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident in skipped:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                stack.append(f"thread {names.get(ident, ident)}")
+                key = tuple(reversed(stack))
+                counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def write_collapsed(counts: dict, path: str):
+    """Write stack counts in the collapsed format ("root;child;leaf count" per line)."""
+    with open(path, "w") as f:
+        for stack, count in sorted(counts.items()):
+            f.write(";".join(label.replace(";", ",") for label in stack) + f" {count}\n")
+
+
+def write_speedscope(counts: dict, path: str, name: str, interval_s: float):
+    """Write stack counts as a speedscope sampled profile (weights in seconds)."""
+    frames = {}
+    samples = []
+    weights = []
+    for stack, count in counts.items():
+        samples.append([frames.setdefault(label, len(frames)) for label in stack])
+        weights.append(count * interval_s)
+    document = {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": [{"name": label} for label in frames]},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "seconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": samples,
+            "weights": weights,
+        }],
+        "name": name,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f)
+
+
+@contextmanager
+def _cprofile(stem: str):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(f"{stem}.prof")
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        with open(f"{stem}.txt", "w") as f:
+            f.write(report.getvalue())
+        print(f"[INFO] cProfile written to {stem}.prof and {stem}.txt")
+
+
+@contextmanager
+def _sampling(stem: str, name: str, interval_s: float = SAMPLE_INTERVAL_S):
+    stop = threading.Event()
+    result = {}
+    thread_id = threading.get_ident()
+    sampler = threading.Thread(
+        target=lambda: result.update(_sample_stacks(thread_id, stop, interval_s)),
+        name="profile-sampler",
+        daemon=True,
+    )
+    sampler.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        sampler.join()
+        write_collapsed(result, f"{stem}.collapsed")
+        write_speedscope(result, f"{stem}.speedscope.json", name, interval_s)
+        print(f"[INFO] {sum(result.values())} samples written to {stem}.collapsed and {stem}.speedscope.json")
+
+
+@contextmanager
+def _py_spy(stem: str, name: str):
+    executable = shutil.which("py-spy")
+    if executable is None:
+        print("[INFO] py-spy not found, falling back to the sampling profiler (Python frames only)")
+        with _sampling(stem, name):
+            yield
+        return
+
+    output = f"{stem}.speedscope.json"
+    process = subprocess.Popen(
+        [executable, "record", "--pid", str(os.getpid()), "--native", "--rate", str(int(1 / SAMPLE_INTERVAL_S)),
+         "--format", "speedscope", "--output", output],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    # Give py-spy time to attach; if it exits right away it could not (e.g. no ptrace permission)
+    time.sleep(0.5)
+    if process.poll() is not None:
+        error = process.stderr.read().decode().strip().splitlines()
+        print(f"[INFO] py-spy could not attach ({error[-1] if error else process.returncode}), "
+              f"falling back to the sampling profiler (Python frames only)")
+        with _sampling(stem, name):
+            yield
+        return
+
+    try:
+        yield
+    finally:
+        # py-spy writes its output when interrupted
+        process.send_signal(signal.SIGINT)
+        process.wait()
+        print(f"[INFO] py-spy profile (with native frames) written to {output}")
+
+
+def profile_test(test_name: str, mode: str, output_dir: str):
+    """Context manager profiling the code run inside it.
+
+    Args:
+        test_name: Registry display name, used for the output file names
+        mode: One of PROFILE_MODES
+        output_dir: Directory for the output files (created if missing)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.join(output_dir, profile_name(test_name))
+    if mode == "cprofile":
+        return _cprofile(stem)
+    if mode == "sampling":
+        return _sampling(stem, test_name)
+    return _py_spy(stem, test_name)
@@ -0,0 +1,222 @@
+# -------------------------------
+# Test registry
+# -------------------------------
+# All test categories and their tests, referenced by module and function name
+# so that a runner only imports the modules of the categories it selected.
+#
+# Category fields:
+#   title - Display name used in output and summaries
+#   tags  - Tags shared by all tests of the category
+#   tests - (display name, module, function name[, extra tags]) in execution order
+#
+# Tags:
+#   needs-hopsworks - Tests call the Hopsworks API and receive the project
+#                     (the local backend passes the stand-in in tests/local_hopsworks.py)
+#   slow            - Long-running; only run when selected explicitly
+#   benchmark       - Produces measurements; only run when selected explicitly
+
+import fnmatch
+import importlib
+import sys
+import time
+
+# Tests with these tags only run when selected by category, name or tag
+OPT_IN_TAGS = {"slow", "benchmark"}
+
+CATEGORIES = {
+    "write_read": {
+        "title": "Write & Read",
+        "tests": [
+            ("Write: Overwrite", "tests.test_write_operations", "test_write_overwrite"),
+            ("Write: Append", "tests.test_write_operations", "test_write_append"),
+            ("Write: Partitioned", "tests.test_write_operations", "test_write_partitioned"),
+            ("Write: Schema Evolution", "tests.test_write_operations", "test_write_schema_evolution"),
+            ("Write: Nested Types", "tests.test_write_operations", "test_write_nested_types"),
+            ("Write: HopsFS Schema", "tests.test_write_operations", "test_hopsfs_schema"),
+            ("Read: Setup Versioned Table", "tests.test_read_operations", "setup_test_table_with_versions"),
+            ("Read: Load Table", "tests.test_read_operations", "test_load_table"),
+            ("Read: As Arrow", "tests.test_read_operations", "test_read_as_arrow"),
+            ("Read: As Pandas", "tests.test_read_operations", "test_read_as_pandas"),
+            ("Read: Specific Columns", "tests.test_read_operations", "test_read_with_columns"),
+            ("Read: With Filter", "tests.test_read_operations", "test_read_with_filter"),
+            ("Read: Time Travel", "tests.test_read_operations", "test_time_travel_by_version"),
+            ("Read: Table History", "tests.test_read_operations", "test_read_table_history"),
+            ("Read: File URIs", "tests.test_read_operations", "test_read_file_uris"),
+            ("Read: File Stats", "tests.test_read_operations", "test_read_file_stats"),
+        ],
+        "tags": [],
+    },
+    "dml": {
+        "title": "DML",
+        "tests": [
+            ("Delete: Rows with predicate", "tests.test_dml_operations", "test_delete_rows"),
+            ("Delete: All rows", "tests.test_dml_operations", "test_delete_all_rows"),
+            ("Update: Rows with predicate", "tests.test_dml_operations", "test_update_rows"),
+            ("Update: All rows", "tests.test_dml_operations", "test_update_all_rows"),
+            ("Merge: Upsert", "tests.test_dml_operations", "test_merge_upsert"),
+            ("Merge: Delete", "tests.test_dml_operations", "test_merge_delete"),
+            ("Merge: Conditional update", "tests.test_dml_operations", "test_merge_conditional_update"),
+            ("Deletion Vectors: Delete", "tests.test_dml_operations", "test_delete_with_deletion_vectors"),
+            ("Deletion Vectors: Update", "tests.test_dml_operations", "test_update_with_deletion_vectors"),
+            ("Deletion Vectors: Merge", "tests.test_dml_operations", "test_merge_with_deletion_vectors"),
+        ],
+        "tags": [],
+    },
+    "maintenance": {
+        "title": "Maintenance",
+        "tests": [
+            ("Maintenance: Setup tables", "tests.test_maintenance", "setup_maintenance_tables"),
+            ("Vacuum: Dry run", "tests.test_maintenance", "test_vacuum_dry_run"),
+            ("Vacuum: Execute", "tests.test_maintenance", "test_vacuum"),
+            ("Optimize: Compact", "tests.test_maintenance", "test_optimize_compact"),
+            ("Optimize: Z-Order", "tests.test_maintenance", "test_optimize_zorder"),
+            ("Optimize: With filter", "tests.test_maintenance", "test_optimize_with_filter"),
+            ("Optimize: Incremental with resume", "tests.test_maintenance", "test_optimize_incremental"),
+        ],
+        "tags": [],
+    },
+    "advanced": {
+        "title": "Advanced",
+        "tests": [
+            ("Version: Get version", "tests.test_advanced", "test_get_version"),
+            ("Metadata: Get metadata", "tests.test_advanced", "test_get_metadata"),
+            ("Schema: Get schema", "tests.test_advanced", "test_get_schema"),
+            ("Protocol: Get protocol", "tests.test_advanced", "test_get_protocol"),
+            ("Checkpoint: Create", "tests.test_advanced", "test_create_checkpoint"),
+            ("Restore: To version", "tests.test_advanced", "test_restore_to_version"),
+            ("Restore: To datetime", "tests.test_advanced", "test_restore_to_datetime"),
+            ("Constraint: Add", "tests.test_advanced", "test_add_constraint"),
+            ("Constraint: Drop", "tests.test_advanced", "test_drop_constraint"),
+            ("Properties: Set", "tests.test_advanced", "test_table_properties"),
+            ("History: Detailed", "tests.test_advanced", "test_history_details"),
+        ],
+        "tags": [],
+    },
+    "feature_store": {
+        "title": "Feature Store",
+        "tests": [
+            ("Feature Store: Delta Lake CRUD", "tests.test_feature_store", "test_feature_store_deltalake"),
+        ],
+        "tags": ["needs-hopsworks"],
+    },
+    "concurrency": {
+        "title": "Concurrency",
+        "tests": [
+            ("Concurrency: Readers and writers", "tests.test_concurrency", "test_concurrent_read_write"),
+        ],
+        "tags": ["slow"],
+    },
+    "benchmarks": {
+        "title": "Benchmarks",
+        "tests": [
+            ("Schema Evolution: Wide merge", "tests.bench_schema_evolution", "bench_wide_schema_merge"),
+            ("Schema Evolution: Nested merge", "tests.bench_schema_evolution", "bench_nested_schema_merge"),
+            ("Schema Evolution: Overwrite", "tests.bench_schema_evolution", "bench_overwrite_schema_change"),
+            ("Feature Group: Ingest and read", "tests.bench_feature_store", "bench_feature_group_ingest",
+             ["needs-hopsworks"]),
+            ("Feature Group: Read latency", "tests.bench_feature_store", "bench_read_latency",
+             ["needs-hopsworks"]),
+            ("Feature Group: Freshness lag", "tests.bench_feature_store", "bench_freshness_lag",
+             ["needs-hopsworks"]),
+            ("Restore: Long history", "tests.bench_restore", "bench_restore_cost"),
+            ("History: Query latency", "tests.bench_history", "bench_history_latency"),
+            ("Write Tuning: File and row-group sizing", "tests.bench_write_tuning", "bench_write_tuning"),
+            ("Maintenance Cycle: Append, compact, checkpoint, vacuum", "tests.bench_maintenance_cycle",
+             "bench_maintenance_cycle"),
+            ("Many Tables: Create, load, append", "tests.bench_many_tables", "bench_many_tables"),
+            ("Incremental Maintenance: Bounded compaction runs", "tests.bench_incremental_maintenance",
+             "bench_incremental_maintenance"),
+            ("Partition Skew: Write, merge, read", "tests.bench_partition_skew", "bench_partition_skew"),
+            ("Memory: Peak vs input size", "tests.bench_memory", "bench_memory_vs_input_size"),
+            ("Memory: Spill and concurrency options", "tests.bench_memory", "bench_memory_options"),
+            ("Merge Spill: Memory-limited merge", "tests.bench_merge_spill", "bench_merge_memory_limit"),
+            ("Constraints: Write overhead", "tests.bench_constraints", "bench_constraint_write_overhead"),
+            ("Constraints: Validation on add", "tests.bench_constraints", "bench_constraint_validation"),
+            ("Training Dataset: Feature group growth", "tests.bench_training_dataset",
+             "bench_training_dataset_growth", ["needs-hopsworks"]),
+            ("Training Dataset: Point-in-time join", "tests.bench_training_dataset",
+             "bench_point_in_time_join", ["needs-hopsworks"]),
+        ],
+        "tags": ["benchmark", "slow"],
+    },
+}
+
+
+def get_tags(key: str, entry: tuple) -> set[str]:
+    """Tags of one registry entry: its category tags plus its own extra tags."""
+    tags = set(CATEGORIES[key]["tags"])
+    if len(entry) > 3:
+        tags.update(entry[3])
+    return tags
+
+
+def select_tests(categories: list[str] | None = None, names: list[str] | None = None,
+                 tags: list[str] | None = None, exclude_tags: list[str] | None = None) -> list[tuple]:
+    """Select registry entries by category, name glob and tag.
+
+    Filters combine with AND; within one filter any value may match. Tests
+    tagged "slow" or "benchmark" are only included when a filter selects
+    them explicitly (their category, their name or one of their tags).
+
+    Args:
+        categories: Category keys (default: all)
+        names: Glob patterns matched case-insensitively against the display
+            name or the function name, e.g. "Merge:*" or "test_vacuum*"
+        tags: Tags of which a test must carry at least one
+        exclude_tags: Tags a test must not carry
+
+    Returns:
+        List of (category key, display name, module, function name, tags)
+    """
+    unknown = [key for key in categories or [] if key not in CATEGORIES]
+    if unknown:
+        raise ValueError(f"Unknown categories: {unknown}. Available: {list(CATEGORIES)}")
+
+    selected = []
+    for key, category in CATEGORIES.items():
+        if categories and key not in categories:
+            continue
+        for entry in category["tests"]:
+            name, module_name, function_name = entry[:3]
+            entry_tags = get_tags(key, entry)
+            if names and not any(
+                fnmatch.fnmatch(name.lower(), pattern.lower())
+                or fnmatch.fnmatch(function_name, pattern)
+                for pattern in names
+            ):
+                continue
+            if tags and not entry_tags & set(tags):
+                continue
+            if exclude_tags and entry_tags & set(exclude_tags):
+                continue
+            explicit = categories or names or tags
+            if entry_tags & OPT_IN_TAGS and not explicit:
+                continue
+            selected.append((key, name, module_name, function_name, entry_tags))
+    return selected
+
+
+def load_tests(selected: list[tuple]) -> list[tuple]:
+    """Import the modules of the selected tests and resolve their functions.
+
+    Modules are imported on first use only; the time each import takes is
+    printed so slow imports show up in quick iterative runs.
+
+    Returns:
+        List of (category key, display name, function, tags)
+    """
+    return [
+        (key, name, getattr(_import_module(module_name), function_name), tags)
+        for key, name, module_name, function_name, tags in selected
+    ]
+
+
+def _import_module(module_name: str):
+    """Import a test module, printing how long the first import took."""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    print(f"[INFO] Imported {module_name} in {time.perf_counter() - start:.2f}s")
+    return module
@@ -0,0 +1,389 @@
+# -------------------------------
+# Shared test runner
+# -------------------------------
+# Single command line entry point behind run_all.py, run_cluster.py and the
+# per-category run_*.py scripts. It handles in one place:
+#   - test selection by category, name glob and tag (see tests/registry.py)
+#   - warmup and repeated runs for stable timings, data scale factor
+#   - table directory layout (flat or nested, see tests/layout.py)
+#   - backend choice: remote (Hopsworks login), cluster (in-pod), local (CI,
+#     with the Hopsworks stand-in from tests/local_hopsworks.py)
+#   - number of categories run in parallel
+#   - profiling of the selected tests (see tests/profiling.py)
+#   - peak memory (RSS) of the selected tests (see tests/memory.py)
+#   - trace of every delta operation, grouped by test (see tests/tracing.py)
+#   - output format of the results (text, json, csv)
+#
+# Test modules are imported lazily for the selected tests only, and
+# Hopsworks is logged in to at most once:
+#   - cluster and local backends never log in; local tests that need the
+#     Hopsworks API get the local stand-in project instead
+#   - remote logs in up front only if a selected test needs the Hopsworks API
+#     or the HopsFS client certificates are not materialized yet; otherwise
+#     the login is deferred until cleanup needs the dataset API
+#
+# For a detailed breakdown of import time use:
+#   python -X importtime run_all.py dml 2> importtime.log
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+
+import tests.config as config
+import tests.layout as layout
+from tests.bench_utils import summarize_latencies
+from tests.profiling import PROFILE_MODES, profile_test
+from tests.memory import sample_rss, MiB
+from tests.tracing import TRACE_FILE, install_tracing, span, write_trace
+from tests.registry import CATEGORIES, select_tests, load_tests
+from tests.session import login, is_logged_in
+
+BACKENDS = ["remote", "cluster", "local"]
+OUTPUT_FORMATS = ["text", "json", "csv"]
+
+# Config attributes replaced when switching away from the remote backend
+_BACKEND_ATTRIBUTES = [
+    "HOPSFS_NAMENODE",
+    "HOPSFS_NAMENODE_PORT",
+    "HOPSWORKS_PROJECT_NAME",
+    "get_table_path",
+    "get_hopsfs_path",
+    "cleanup_test_tables",
+    "get_created_tables",
+    "find_stale_tables",
+    "cleanup_stale_tables",
+]
+
+
+def use_backend(backend: str):
+    """Replace the remote config with the cluster or local config.
+
+    Must run before any test module is imported, because test modules bind
+    get_table_path and friends at import time.
+    """
+    if backend == "remote":
+        return
+    if backend == "cluster":
+        import tests.config_cluster as backend_config
+    else:
+        import tests.config_local as backend_config
+
+    for name in _BACKEND_ATTRIBUTES:
+        if hasattr(backend_config, name):
+            setattr(config, name, getattr(backend_config, name))
+
+    # Provide no-op for set_project since we don't use Hopsworks client
+    config.set_project = lambda x: None
+
+
+def run_test(test_fn, project=None, warmup: int = 0, repeat: int = 1, profiler=None,
+             memory: bool = False) -> dict:
+    """Run one test warmup + repeat times; only the repeat runs are timed.
+
+    If a profiler context manager is given, the first timed run is profiled
+    (its duration includes the profiling overhead). With memory set, the RSS
+    of the first timed run is sampled.
+
+    Returns:
+        Dict with the timed durations (seconds), the first error (or None),
+        the return value of the last run if it was a dict of metrics and the
+        RSS samples (or None)
+    """
+    durations = []
+    metrics = None
+    rss = None
+    args = (project,) if project is not None else ()
+
+    for run in range(warmup + repeat):
+        profiled = profiler if profiler is not None and run == warmup else nullcontext()
+        sampled = sample_rss() if memory and run == warmup else nullcontext()
+        start = time.perf_counter()
+        try:
+            with profiled, sampled as samples:
+                returned = test_fn(*args)
+        except Exception as e:
+            return {"durations": durations, "error": str(e), "metrics": metrics, "memory": samples or rss}
+        if run >= warmup:
+            durations.append(time.perf_counter() - start)
+            if isinstance(returned, dict):
+                metrics = returned
+            rss = samples or rss
+
+    return {"durations": durations, "error": None, "metrics": metrics, "memory": rss}
+
+
+def _run_category(key: str, tests: list[tuple], project, warmup: int, repeat: int,
+                  profiler=None, memory: bool = False) -> list[dict]:
+    """Run the tests of one category in order; profiler(name) returns a profiling context or None."""
+    print("\n" + "=" * 60)
+    print(f"{CATEGORIES[key]['title'].upper()} TESTS")
+    print("=" * 60)
+
+    results = []
+    for _, name, test_fn, tags in tests:
+        test_project = project if "needs-hopsworks" in tags else None
+        with span(name, category="test", category_key=key):
+            outcome = run_test(test_fn, test_project, warmup, repeat, profiler(name) if profiler else None, memory)
+        status = "PASS" if outcome["error"] is None else "FAIL"
+        if status == "FAIL":
+            print(f"[FAIL] {name}: {outcome['error']}")
+        results.append({
+            "category": key,
+            "name": name,
+            "status": status,
+            "error": outcome["error"],
+            "durations": outcome["durations"],
+            "timing": summarize_latencies(outcome["durations"]),
+            "metrics": outcome["metrics"],
+            "memory": outcome["memory"],
+        })
+    return results
+
+
+def run_tests(loaded: list[tuple], project=None, warmup: int = 0, repeat: int = 1,
+              workers: int = 1, profiler=None, memory: bool = False) -> list[dict]:
+    """Run the loaded tests; categories run in parallel when workers > 1.
+
+    Tests within a category always run in order, since later tests may read
+    tables created by earlier ones.
+
+    Returns:
+        One result dict per test, in registry order
+    """
+    by_category = {}
+    for entry in loaded:
+        by_category.setdefault(entry[0], []).append(entry)
+
+    if workers <= 1:
+        results = [
+            _run_category(key, tests, project, warmup, repeat, profiler, memory)
+            for key, tests in by_category.items()
+        ]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_run_category, key, tests, project, warmup, repeat, profiler, memory)
+                for key, tests in by_category.items()
+            ]
+            results = [future.result() for future in futures]
+
+    return [result for category_results in results for result in category_results]
+
+
+def print_summary(results: list[dict]):
+    """Print timings, per-category and total pass/fail counts and the failed tests."""
+    print("\n" + "=" * 60)
+    print("TIMINGS (seconds)")
+    print("=" * 60)
+    for r in results:
+        timing = r["timing"]
+        if timing["count"]:
+            print(f"  {r['name']:<45} n={timing['count']} mean={timing['mean']:.3f} "
+                  f"p50={timing['p50']:.3f} max={timing['max']:.3f}")
+
+    if any(r["memory"] for r in results):
+        print("\n" + "=" * 60)
+        print("MEMORY (MiB RSS, first timed run)")
+        print("=" * 60)
+        for r in results:
+            if r["memory"]:
+                m = r["memory"]
+                print(f"  {r['name']:<45} peak={m['peak_bytes'] / MiB:.1f} "
+                      f"delta=+{m['peak_delta_bytes'] / MiB:.1f} baseline={m['baseline_bytes'] / MiB:.1f}")
+
+    print("\n" + "=" * 60)
+    print("FINAL SUMMARY")
+    print("=" * 60)
+
+    for key in dict.fromkeys(r["category"] for r in results):
+        category_results = [r for r in results if r["category"] == key]
+        passed = sum(1 for r in category_results if r["status"] == "PASS")
+        failed = len(category_results) - passed
+        status = "+" if failed == 0 else "-"
+        print(f"{status} {CATEGORIES[key]['title']}: {passed}/{len(category_results)} passed")
+
+    total_passed = sum(1 for r in results if r["status"] == "PASS")
+    total_failed = len(results) - total_passed
+    print("\n" + "-" * 60)
+    print(f"TOTAL: {total_passed} passed, {total_failed} failed out of {len(results)} tests")
+    print("=" * 60)
+
+    # Show failed tests if any
+    if total_failed > 0:
+        print("\nFailed tests:")
+        for r in results:
+            if r["status"] == "FAIL":
+                print(f"  - [{CATEGORIES[r['category']]['title']}] {r['name']}: {r['error']}")
+
+
+def format_results(results: list[dict], output_format: str) -> str:
+    """Render results as JSON (full detail) or CSV (one row per test)."""
+    if output_format == "json":
+        return json.dumps(results, indent=2, default=str)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["category", "name", "status", "runs", "mean_s", "p50_s", "p95_s", "max_s", "peak_rss_bytes", "error"])
+    for r in results:
+        timing = r["timing"]
+        writer.writerow([
+            r["category"], r["name"], r["status"], timing["count"],
+            f"{timing['mean']:.6f}", f"{timing['p50']:.6f}", f"{timing['p95']:.6f}", f"{timing['max']:.6f}",
+            r["memory"]["peak_bytes"] if r["memory"] else "", r["error"] or "",
+        ])
+    return buffer.getvalue()
+
+
+def cleanup(backend: str):
+    """Remove tables and feature store resources created by this run."""
+    created = config.get_created_tables()
+    print(f"\n[INFO] Tables created: {len(created)}")
+
+    # Remote cleanup goes through the Hopsworks dataset API
+    if created and backend == "remote" and not is_logged_in():
+        login()
+    config.cleanup_test_tables()
+
+    # Feature store resources only exist if the feature store tests were loaded
+    if "tests.test_feature_store" in sys.modules:
+        sys.modules["tests.test_feature_store"].cleanup_feature_store_resources()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options shared by all run_*.py scripts."""
+    parser = argparse.ArgumentParser(description="Run delta-rs filesystem operation tests")
+    parser.add_argument("categories", nargs="*",
+                        help=f"categories to run (default: all). Available: {', '.join(CATEGORIES)}")
+    parser.add_argument("-k", "--name", action="append", dest="names", metavar="GLOB",
+                        help="only tests whose name or function matches the glob, e.g. 'Merge:*' (repeatable)")
+    parser.add_argument("-t", "--tag", action="append", dest="tags", metavar="TAG",
+                        help="only tests with this tag, e.g. slow, benchmark, needs-hopsworks (repeatable)")
+    parser.add_argument("--exclude-tag", action="append", dest="exclude_tags", metavar="TAG",
+                        help="skip tests with this tag (repeatable)")
+    parser.add_argument("--list", action="store_true", help="list the selected tests and exit")
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per test (default: 1)")
+    parser.add_argument("--warmup", type=int, default=0, help="untimed runs per test before timing (default: 0)")
+    parser.add_argument("--scale", type=float, default=None,
+                        help=f"data size multiplier (default: DELTARS_SCALE or {config.SCALE_FACTOR:g})")
+    parser.add_argument("--table-layout", choices=layout.TABLE_LAYOUTS, default=None,
+                        help=f"table directory layout (default: DELTARS_TABLE_LAYOUT or {layout.TABLE_LAYOUT})")
+    parser.add_argument("--backend", choices=BACKENDS, default=None,
+                        help="remote (Hopsworks login), cluster (inside the pod) or local (local filesystem)")
+    parser.add_argument("--workers", type=int, default=1, help="categories run in parallel (default: 1)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="text", dest="output_format",
+                        help="result format (default: text summary only)")
+    parser.add_argument("--output", metavar="PATH", help="write json/csv results to a file instead of stdout")
+    parser.add_argument("--profile", choices=PROFILE_MODES, default=None,
+                        help="profile the first timed run of each selected test (use -k to pick tests); "
+                             "sampling and py-spy include threads the test starts, cprofile only sees the test thread")
+    parser.add_argument("--profile-dir", default="profiles", metavar="DIR",
+                        help="directory for profile output files (default: profiles)")
+    parser.add_argument("--memory", action="store_true",
+                        help="sample the RSS of the first timed run of each test and report its peak "
+                             "(process-wide, so not with --workers > 1)")
+    parser.add_argument("--trace", default=TRACE_FILE, metavar="PATH",
+                        help="write a span per delta operation and test to a Chrome trace JSON file "
+                             "(default: DELTARS_TRACE)")
+    parser.add_argument("--keep-tables", action="store_true", help="do not remove the tables created by this run")
+    return parser
+
+
+def main(argv: list[str] | None = None, default_categories: list[str] | None = None,
+         backend: str = "remote", title: str = "ALL TESTS") -> int:
+    """Parse arguments, run the selected tests and clean up.
+
+    Args:
+        argv: Command line arguments (default sys.argv[1:])
+        default_categories: Categories to run when none are given on the command line
+        backend: Backend used unless --backend is given
+        title: Banner title
+
+    Returns:
+        Process exit code (0 if all tests passed)
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    backend = args.backend or backend
+    if args.memory and args.workers > 1:
+        # RSS is process-wide, so tests of categories running in other threads would count towards each peak
+        parser.error("--memory cannot be combined with --workers > 1")
+
+    if args.scale is not None:
+        config.SCALE_FACTOR = args.scale
+        # Inherited by worker processes started by the tests
+        os.environ["DELTARS_SCALE"] = str(args.scale)
+    if args.table_layout is not None:
+        layout.TABLE_LAYOUT = args.table_layout
+        os.environ["DELTARS_TABLE_LAYOUT"] = args.table_layout
+
+    selected = select_tests(args.categories or default_categories, args.names, args.tags, args.exclude_tags)
+
+    if args.list:
+        for key, name, module_name, function_name, tags in selected:
+            print(f"{key:<15} {name:<45} {module_name}.{function_name} [{', '.join(sorted(tags))}]")
+        return 0
+
+    use_backend(backend)
+
+    print("=" * 60)
+    print(f"DELTA-RS FILESYSTEM OPERATIONS - {title}")
+    print("=" * 60)
+    print(f"Backend: {backend}, scale: {config.SCALE_FACTOR:g}, layout: {layout.TABLE_LAYOUT}, "
+          f"warmup: {args.warmup}, repeat: {args.repeat}, workers: {args.workers}")
+    if backend == "cluster":
+        print(f"Namenode: {config.HOPSFS_NAMENODE}:{config.HOPSFS_NAMENODE_PORT}")
+        print(f"Project: {config.HOPSWORKS_PROJECT_NAME}")
+    print("=" * 60)
+
+    if backend == "cluster":
+        skipped = [entry for entry in selected if "needs-hopsworks" in entry[4]]
+        for entry in skipped:
+            print(f"[INFO] Skipping {entry[1]}: needs a Hopsworks login ({backend} backend)")
+        selected = [entry for entry in selected if entry not in skipped]
+
+    # Tracing patches deltalake, so it must be installed before the Hopsworks
+    # stand-in and the test modules bind its names
+    if args.trace:
+        install_tracing()
+
+    # Connect to Hopsworks once for all tests, and only if required
+    project = None
+    needs_project = any("needs-hopsworks" in entry[4] for entry in selected)
+    if backend == "remote" and (needs_project or not config.certificates_available()):
+        project = login()
+    elif backend == "local" and needs_project:
+        from tests.local_hopsworks import login as local_login
+
+        project = local_login()
+
+    loaded = load_tests(selected)
+    profiler = partial(profile_test, mode=args.profile, output_dir=args.profile_dir) if args.profile else None
+    results = run_tests(loaded, project, args.warmup, args.repeat, args.workers, profiler, args.memory)
+    print_summary(results)
+
+    if args.output_format != "text":
+        rendered = format_results(results, args.output_format)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(rendered)
+            print(f"\n[INFO] Results written to {args.output}")
+        else:
+            print(rendered)
+
+    if args.trace:
+        spans = write_trace(args.trace)
+        print(f"\n[INFO] {spans} spans written to {args.trace} (open in ui.perfetto.dev or chrome://tracing)")
+
+    if args.keep_tables:
+        print(f"\n[INFO] Keeping {len(config.get_created_tables())} tables (--keep-tables)")
+    else:
+        cleanup(backend)
+
+    return 0 if all(r["status"] == "PASS" for r in results) else 1
@@ -0,0 +1,36 @@
+# -------------------------------
+# Shared Hopsworks session
+# -------------------------------
+# One login per process, shared by every runner and test module.
+# `hopsworks` is only imported when a login is actually needed, so runs that
+# only exercise delta-rs do not pay for importing the Hopsworks client.
+
+import tests.config as config
+
+_project = None
+
+
+def login():
+    """Log in to Hopsworks once and register the project for cleanup.
+
+    Later calls return the same project without logging in again.
+    """
+    global _project
+
+    if _project is None:
+        import hopsworks
+
+        _project = hopsworks.login(
+            host=config.HOPSWORKS_API_HOST,
+            port=config.HOPSWORKS_API_PORT,
+            api_key_value=config.HOPSWORKS_API_KEY
+        )
+        print(f"Connected to Hopsworks project: {_project.name}")
+        config.set_project(_project)
+
+    return _project
+
+
+def is_logged_in() -> bool:
+    """Whether login() has already been called in this process."""
+    return _project is not None
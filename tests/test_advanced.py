@@ -2,22 +2,34 @@
 # Phase 4: Advanced Operations Tests
 # -------------------------------
 # Tests: versioning, checkpoints, restore, constraints, metadata
+#
+# Row counts are multiplied by the scale factor (--scale), so the same tests
+# run as load tests (e.g. checkpoints and restores of large tables);
+# assertions hold at any scale.
 
 from tests.config import (
-    HOPSWORKS_API_HOST,
-    HOPSWORKS_API_PORT,
-    HOPSWORKS_API_KEY,
     get_table_path,
-    set_project,
     cleanup_test_tables,
+    scaled,
 )
+from tests.session import login
 
 import pyarrow as pa
 import pandas as pd
-import hopsworks
 from deltalake import write_deltalake, DeltaTable
 
 
+def _letters(ids) -> list[str]:
+    """A letter per id: 1 -> a, 2 -> b, ... (repeating after z)."""
+    return [chr(ord("a") + (i - 1) % 26) for i in ids]
+
+
+def _id_value_table(start: int, rows: int) -> pa.Table:
+    """Ids start..start+rows-1 with a letter value each."""
+    ids = range(start, start + rows)
+    return pa.Table.from_pandas(pd.DataFrame({"id": ids, "value": _letters(ids)}), preserve_index=False)
+
+
 def test_get_version():
     """Test getting table version."""
     print("\n=== Test: Get Version ===")
@@ -25,8 +37,8 @@ def test_get_version():
     table_path = get_table_path("delta_version_test")
 
     # Create table
-    df = pd.DataFrame({"id": [1, 2, 3], "value": ["a", "b", "c"]})
-    write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode="overwrite")
+    rows = scaled(3)
+    write_deltalake(table_path, _id_value_table(1, rows), mode="overwrite")
 
     dt = DeltaTable(table_path)
     version = dt.version()
@@ -34,8 +46,7 @@ def test_get_version():
     assert version == 0, f"Expected version 0, got {version}"
 
     # Append to create new version
-    df2 = pd.DataFrame({"id": [4, 5], "value": ["d", "e"]})
-    write_deltalake(table_path, pa.Table.from_pandas(df2, preserve_index=False), mode="append")
+    write_deltalake(table_path, _id_value_table(rows + 1, scaled(2)), mode="append")
 
     dt = DeltaTable(table_path)
     version = dt.version()
@@ -50,10 +61,9 @@ def test_get_metadata():
     table_path = get_table_path("delta_metadata_test")
 
     # Create table with description
-    df = pd.DataFrame({"id": [1, 2, 3], "value": ["a", "b", "c"]})
     write_deltalake(
         table_path,
-        pa.Table.from_pandas(df, preserve_index=False),
+        _id_value_table(1, scaled(3)),
         mode="overwrite",
         name="test_table",
         description="A test table for metadata"
@@ -67,6 +77,8 @@ def test_get_metadata():
     print(f"[PASS] Description: {metadata.description}")
     print(f"[PASS] Partition columns: {metadata.partition_columns}")
     print(f"[PASS] Created time: {metadata.created_time}")
+    assert metadata.name == "test_table", f"Expected name 'test_table', got {metadata.name}"
+    assert metadata.description == "A test table for metadata", f"Unexpected description {metadata.description}"
 
 
 def test_get_schema():
@@ -76,11 +88,12 @@ def test_get_schema():
     table_path = get_table_path("delta_schema_test")
 
     # Create table with various types
+    ids = range(1, scaled(3) + 1)
     df = pd.DataFrame({
-        "int_col": [1, 2, 3],
-        "str_col": ["a", "b", "c"],
-        "float_col": [1.1, 2.2, 3.3],
-        "bool_col": [True, False, True]
+        "int_col": ids,
+        "str_col": _letters(ids),
+        "float_col": [i * 1.1 for i in ids],
+        "bool_col": [i % 2 == 1 for i in ids]
     })
     write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode="overwrite")
 
@@ -91,6 +104,7 @@ def test_get_schema():
     print(f"[PASS] Number of fields: {len(schema.fields)}")
     for field in schema.fields:
         print(f"       - {field.name}: {field.type}")
+    assert [f.name for f in schema.fields] == list(df.columns), "Schema fields do not match the written columns"
 
 
 def test_get_protocol():
@@ -99,7 +113,7 @@ def test_get_protocol():
 
     table_path = get_table_path("delta_protocol_test")
 
-    df = pd.DataFrame({"id": [1, 2, 3]})
+    df = pd.DataFrame({"id": range(1, scaled(3) + 1)})
     write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode="overwrite")
 
     dt = DeltaTable(table_path)
@@ -116,8 +130,10 @@ def test_create_checkpoint():
     table_path = get_table_path("delta_checkpoint_test")
 
     # Create table with multiple versions
-    for i in range(5):
-        df = pd.DataFrame({"id": range(i * 10, (i + 1) * 10), "batch": [i] * 10})
+    batches = 5
+    rows = scaled(10)
+    for i in range(batches):
+        df = pd.DataFrame({"id": range(i * rows, (i + 1) * rows), "batch": [i] * rows})
         mode = "overwrite" if i == 0 else "append"
         write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode=mode)
 
@@ -133,6 +149,8 @@ def test_create_checkpoint():
     dt = DeltaTable(table_path)
     result = dt.to_pandas()
     print(f"[PASS] Table readable after checkpoint, rows: {len(result)}")
+    assert dt.version() == version_before, "Checkpoint must not create a new version"
+    assert len(result) == batches * rows, f"Expected {batches * rows} rows, got {len(result)}"
 
 
 def test_restore_to_version():
@@ -141,16 +159,19 @@ def test_restore_to_version():
 
     table_path = get_table_path("delta_restore_test")
 
+    rows = scaled(3)
+    added = scaled(2)
+
     # Version 0: Initial data
-    df0 = pd.DataFrame({"id": [1, 2, 3], "value": ["original"] * 3})
+    df0 = pd.DataFrame({"id": range(1, rows + 1), "value": ["original"] * rows})
     write_deltalake(table_path, pa.Table.from_pandas(df0, preserve_index=False), mode="overwrite")
 
     # Version 1: Modify data
-    df1 = pd.DataFrame({"id": [1, 2, 3], "value": ["modified"] * 3})
+    df1 = pd.DataFrame({"id": range(1, rows + 1), "value": ["modified"] * rows})
     write_deltalake(table_path, pa.Table.from_pandas(df1, preserve_index=False), mode="overwrite")
 
     # Version 2: Add more data
-    df2 = pd.DataFrame({"id": [4, 5], "value": ["added"] * 2})
+    df2 = pd.DataFrame({"id": range(rows + 1, rows + added + 1), "value": ["added"] * added})
     write_deltalake(table_path, pa.Table.from_pandas(df2, preserve_index=False), mode="append")
 
     dt = DeltaTable(table_path)
@@ -168,8 +189,8 @@ def test_restore_to_version():
     print(f"[PASS] Row count after restore: {len(result)}")
     print(f"[PASS] Values after restore: {list(result['value'].unique())}")
 
-    assert len(result) == 3, f"Expected 3 rows, got {len(result)}"
-    assert result['value'].iloc[0] == "original", "Expected 'original' values"
+    assert len(result) == rows, f"Expected {rows} rows, got {len(result)}"
+    assert (result['value'] == "original").all(), "Expected only 'original' values"
 
 
 def test_restore_to_datetime():
@@ -181,8 +202,10 @@ def test_restore_to_datetime():
 
     table_path = get_table_path("delta_restore_dt_test")
 
+    rows = scaled(1)
+
     # Version 0
-    df0 = pd.DataFrame({"id": [1], "value": ["v0"]})
+    df0 = pd.DataFrame({"id": range(rows), "value": ["v0"] * rows})
     write_deltalake(table_path, pa.Table.from_pandas(df0, preserve_index=False), mode="overwrite")
 
     # Record timestamp after first write
@@ -191,7 +214,7 @@ def test_restore_to_datetime():
     time.sleep(1)
 
     # Version 1
-    df1 = pd.DataFrame({"id": [2], "value": ["v1"]})
+    df1 = pd.DataFrame({"id": range(rows, 2 * rows), "value": ["v1"] * rows})
     write_deltalake(table_path, pa.Table.from_pandas(df1, preserve_index=False), mode="append")
 
     dt = DeltaTable(table_path)
@@ -204,7 +227,8 @@ def test_restore_to_datetime():
     dt = DeltaTable(table_path)
     result = dt.to_pandas()
     print(f"[PASS] Row count after restore: {len(result)}")
-    assert len(result) == 1, f"Expected 1 row, got {len(result)}"
+    assert len(result) == rows, f"Expected {rows} rows, got {len(result)}"
+    assert (result['value'] == "v0").all(), "Expected only rows of version 0"
 
 
 def test_add_constraint():
@@ -213,7 +237,8 @@ def test_add_constraint():
 
     table_path = get_table_path("delta_constraint_test")
 
-    df = pd.DataFrame({"id": [1, 2, 3], "score": [50, 75, 100]})
+    ids = range(1, scaled(3) + 1)
+    df = pd.DataFrame({"id": ids, "score": [50 + 25 * ((i - 1) % 3) for i in ids]})
     write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode="overwrite")
 
     dt = DeltaTable(table_path)
@@ -226,6 +251,7 @@ def test_add_constraint():
     dt = DeltaTable(table_path)
     metadata = dt.metadata()
     print(f"[PASS] Table configuration: {metadata.configuration}")
+    assert "delta.constraints.score_range" in metadata.configuration, "Constraint missing from configuration"
 
 
 def test_drop_constraint():
@@ -234,7 +260,8 @@ def test_drop_constraint():
 
     table_path = get_table_path("delta_drop_constraint_test")
 
-    df = pd.DataFrame({"id": [1, 2, 3], "value": [10, 20, 30]})
+    ids = range(1, scaled(3) + 1)
+    df = pd.DataFrame({"id": ids, "value": [10 * i for i in ids]})
     write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode="overwrite")
 
     dt = DeltaTable(table_path)
@@ -251,6 +278,7 @@ def test_drop_constraint():
     dt = DeltaTable(table_path)
     metadata = dt.metadata()
     print(f"[PASS] Configuration after drop: {metadata.configuration}")
+    assert "delta.constraints.positive_value" not in metadata.configuration, "Constraint still in configuration"
 
 
 def test_table_properties():
@@ -260,7 +288,7 @@ def test_table_properties():
     table_path = get_table_path("delta_properties_test")
 
     # Create table with custom properties
-    df = pd.DataFrame({"id": [1, 2, 3]})
+    df = pd.DataFrame({"id": range(1, scaled(3) + 1)})
     write_deltalake(
         table_path,
         pa.Table.from_pandas(df, preserve_index=False),
@@ -275,6 +303,8 @@ def test_table_properties():
     metadata = dt.metadata()
     print(f"[PASS] Table properties set")
     print(f"[PASS] Configuration: {metadata.configuration}")
+    assert metadata.configuration.get("delta.logRetentionDuration") == "interval 30 days", \
+        "delta.logRetentionDuration not set"
 
 
 def test_history_details():
@@ -284,12 +314,11 @@ def test_history_details():
     table_path = get_table_path("delta_history_detail_test")
 
     # Create table with various operations
-    df = pd.DataFrame({"id": [1, 2, 3], "value": ["a", "b", "c"]})
-    write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode="overwrite")
+    rows = scaled(3)
+    write_deltalake(table_path, _id_value_table(1, rows), mode="overwrite")
 
     # Append
-    df2 = pd.DataFrame({"id": [4, 5], "value": ["d", "e"]})
-    write_deltalake(table_path, pa.Table.from_pandas(df2, preserve_index=False), mode="append")
+    write_deltalake(table_path, _id_value_table(rows + 1, scaled(2)), mode="append")
 
     # Update
     dt = DeltaTable(table_path)
@@ -304,6 +333,7 @@ def test_history_details():
         print(f"       Version {entry.get('version')}: {entry.get('operation')}")
         if 'operationParameters' in entry:
             print(f"         Parameters: {entry.get('operationParameters')}")
+    assert len(history) == 3, f"Expected 3 history entries (write, append, update), got {len(history)}"
 
 
 def run_all_advanced_tests():
@@ -312,14 +342,8 @@ def run_all_advanced_tests():
     print("ADVANCED OPERATIONS TESTS")
     print("=" * 50)
 
-    # Connect to Hopsworks once
-    project = hopsworks.login(
-        host=HOPSWORKS_API_HOST,
-        port=HOPSWORKS_API_PORT,
-        api_key_value=HOPSWORKS_API_KEY
-    )
-    print(f"Connected to Hopsworks project: {project.name}")
-    set_project(project)
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
 
     tests = [
         test_get_version,
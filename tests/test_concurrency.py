@@ -0,0 +1,379 @@
+# -------------------------------
+# Phase 5: Concurrency Tests
+# -------------------------------
+# Tests: concurrent readers and writers (append, merge, optimize) on one table
+#
+# Readers and writers run in separate processes (spawn, so every process gets
+# its own delta-rs runtime) and are released together through a barrier.
+# Each test runs three phases on the same table:
+#   1. readers only  -> baseline reader throughput
+#   2. writers only  -> baseline writer latency
+#   3. readers + writers -> degradation, snapshot consistency
+#
+# Snapshot consistency: every batch holds exactly `batch_size` rows and every
+# merge rewrites the `value` of a whole batch in one commit, so a reader that
+# sees a batch with a wrong row count or mixed values has observed a torn read.
+#
+# Writer latency is only meaningful if every kind of write commits. A merge
+# predicate on its batch keeps merges from conflicting with every append, and
+# optimize (which rewrites the files merges read) is paced so merges commit
+# between compactions. Every writer kind must commit in both writer phases.
+
+from tests.config import (
+    get_table_path,
+    cleanup_test_tables,
+    scaled,
+)
+from tests.session import login
+from tests.bench_utils import summarize_latencies, format_latency_summary
+
+import multiprocessing as mp
+import queue
+import random
+import signal
+import time
+
+import pyarrow as pa
+from deltalake import write_deltalake, DeltaTable
+from deltalake.exceptions import CommitFailedError
+
+# Writer roles are assigned round-robin to the writer processes
+WRITER_ROLES = ["append", "merge", "optimize"]
+
+# Number of batches written before any phase starts (merge targets)
+INITIAL_BATCHES = 10
+
+# Minimum seconds from the start of a committed write to the next write of its kind
+# (unlisted kinds write back to back)
+WRITER_INTERVALS_S = {"optimize": 2.0}
+
+# Seconds between checks whether the processes of a phase are still alive
+PROCESS_POLL_INTERVAL_S = 1.0
+
+# Seconds a process waits at the start barrier before giving up (e.g. a peer died while starting)
+BARRIER_TIMEOUT_S = 120.0
+
+
+def _make_batch(batch_id: int, batch_size: int, value: int) -> pa.Table:
+    """Build one batch: ids batch_id * batch_size .. + batch_size, one shared value."""
+    start = batch_id * batch_size
+    return pa.table({
+        "id": pa.array(range(start, start + batch_size), pa.int64()),
+        "batch": pa.array([batch_id] * batch_size, pa.int64()),
+        "value": pa.array([value] * batch_size, pa.int64()),
+    })
+
+
+def setup_concurrency_table(table_name: str, batch_size: int) -> str:
+    """Create the shared table with INITIAL_BATCHES complete batches."""
+    table_path = get_table_path(table_name)
+
+    for batch_id in range(INITIAL_BATCHES):
+        mode = "overwrite" if batch_id == 0 else "append"
+        write_deltalake(table_path, _make_batch(batch_id, batch_size, 0), mode=mode)
+
+    print(f"[SETUP] Created concurrency table with {INITIAL_BATCHES} batches at {table_path}")
+    return table_path
+
+
+def _count_torn_batches(table: pa.Table, batch_size: int) -> int:
+    """Count batches whose row count or values show a partially applied commit."""
+    grouped = table.group_by("batch").aggregate([
+        ("id", "count"),
+        ("value", "min"),
+        ("value", "max"),
+    ])
+    torn = 0
+    for count, low, high in zip(
+        grouped["id_count"].to_pylist(),
+        grouped["value_min"].to_pylist(),
+        grouped["value_max"].to_pylist(),
+    ):
+        if count != batch_size or low != high:
+            torn += 1
+    return torn
+
+
+def _reader_worker(table_path, batch_size, duration_s, barrier, results):
+    """Scan full snapshots in a loop and check each one for torn batches."""
+    latencies = []
+    rows = 0
+    torn = 0
+    version_regressions = 0
+    errors = []
+    last_version = -1
+
+    barrier.wait()
+    deadline = time.time() + duration_s
+    while time.time() < deadline:
+        start = time.perf_counter()
+        try:
+            dt = DeltaTable(table_path)
+            version = dt.version()
+            table = dt.to_pyarrow_table()
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        latencies.append(time.perf_counter() - start)
+
+        rows += table.num_rows
+        torn += _count_torn_batches(table, batch_size)
+        if version < last_version:
+            version_regressions += 1
+        last_version = version
+
+    results.put({
+        "role": "reader",
+        "latencies": latencies,
+        "rows": rows,
+        "torn": torn,
+        "version_regressions": version_regressions,
+        "errors": errors,
+    })
+
+
+def _writer_worker(table_path, phase, writer_index, kind, batch_size, duration_s, barrier, results):
+    """Run one kind of write (append, merge or optimize) in a loop."""
+    rng = random.Random(writer_index)
+    latencies = []
+    conflicts = 0
+    errors = []
+    # Appended batch ids must stay unique across writers and phases
+    next_batch = INITIAL_BATCHES + phase * 10_000_000 + (writer_index + 1) * 1_000_000
+
+    interval_s = WRITER_INTERVALS_S.get(kind, 0.0)
+    barrier.wait()
+    deadline = time.time() + duration_s
+    while time.time() < deadline:
+        start = time.perf_counter()
+        try:
+            if kind == "append":
+                write_deltalake(table_path, _make_batch(next_batch, batch_size, 0), mode="append")
+                next_batch += 1
+            elif kind == "merge":
+                # Rewrite a whole batch with one new value in a single commit; the
+                # predicate on the batch keeps concurrent appends out of what it read
+                batch_id = rng.randrange(INITIAL_BATCHES)
+                source = _make_batch(batch_id, batch_size, time.time_ns())
+                (
+                    DeltaTable(table_path).merge(
+                        source=source,
+                        predicate=f"target.id = source.id AND target.batch = {batch_id}",
+                        source_alias="source",
+                        target_alias="target"
+                    )
+                    .when_matched_update(updates={"value": "source.value"})
+                    .execute()
+                )
+            else:
+                DeltaTable(table_path).optimize.compact()
+        except CommitFailedError:
+            conflicts += 1
+        except Exception as e:
+            errors.append(str(e))
+        else:
+            latencies.append(time.perf_counter() - start)
+            # Paced after commits only; a conflicting write is retried right away
+            time.sleep(max(0.0, min(interval_s - (time.perf_counter() - start), deadline - time.time())))
+
+    results.put({
+        "role": "writer",
+        "kind": kind,
+        "latencies": latencies,
+        "conflicts": conflicts,
+        "errors": errors,
+    })
+
+
+def _run_phase(table_path, phase, num_readers, num_writers, batch_size, duration_s) -> list[dict]:
+    """Start readers and writers in separate processes and collect their results."""
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(num_readers + num_writers, timeout=BARRIER_TIMEOUT_S)
+    results = ctx.Queue()
+
+    processes = [
+        ctx.Process(target=_reader_worker, args=(table_path, batch_size, duration_s, barrier, results))
+        for _ in range(num_readers)
+    ]
+    processes += [
+        ctx.Process(
+            target=_writer_worker,
+            args=(table_path, phase, i, WRITER_ROLES[i % len(WRITER_ROLES)], batch_size, duration_s, barrier, results),
+        )
+        for i in range(num_writers)
+    ]
+
+    for p in processes:
+        p.start()
+    # Drain the queue before joining so large result payloads cannot block exit;
+    # poll, so a process killed without reporting (e.g. by the OOM killer) cannot hang the test
+    collected = []
+    while len(collected) < len(processes):
+        try:
+            collected.append(results.get(timeout=PROCESS_POLL_INTERVAL_S))
+        except queue.Empty:
+            if not any(p.is_alive() for p in processes):
+                break
+    while len(collected) < len(processes):
+        try:
+            collected.append(results.get(timeout=PROCESS_POLL_INTERVAL_S))
+        except queue.Empty:
+            break
+    for p in processes:
+        p.join()
+
+    died = [
+        f"signal {signal.Signals(-p.exitcode).name}" if p.exitcode < 0 else f"exit code {p.exitcode}"
+        for p in processes if p.exitcode != 0
+    ]
+    if died or len(collected) < len(processes):
+        raise Exception(f"{len(processes) - len(collected)} of {len(processes)} processes in phase {phase} "
+                        f"did not report ({', '.join(died) or 'no exit code'})")
+    return collected
+
+
+def _reader_stats(results: list[dict], duration_s: float) -> dict:
+    """Aggregate reader results into throughput and latency figures."""
+    readers = [r for r in results if r["role"] == "reader"]
+    latencies = [x for r in readers for x in r["latencies"]]
+    return {
+        "scans_per_s": len(latencies) / duration_s,
+        "rows_per_s": sum(r["rows"] for r in readers) / duration_s,
+        "latency": summarize_latencies(latencies),
+        "torn": sum(r["torn"] for r in readers),
+        "version_regressions": sum(r["version_regressions"] for r in readers),
+        "errors": [e for r in readers for e in r["errors"]],
+    }
+
+
+def _writer_stats(results: list[dict]) -> dict:
+    """Aggregate writer results per write kind."""
+    stats = {}
+    for kind in WRITER_ROLES:
+        writers = [r for r in results if r["role"] == "writer" and r["kind"] == kind]
+        if not writers:
+            continue
+        stats[kind] = {
+            "latency": summarize_latencies([x for r in writers for x in r["latencies"]]),
+            "conflicts": sum(r["conflicts"] for r in writers),
+            "errors": [e for r in writers for e in r["errors"]],
+        }
+    return stats
+
+
+def test_concurrent_read_write(num_readers: int = 4, num_writers: int = 3,
+                               duration_s: float = 10.0, batch_size: int | None = None):
+    """Test reader isolation and throughput while writers append, merge and optimize.
+
+    Args:
+        num_readers: Number of reader processes
+        num_writers: Number of writer processes (roles: append, merge, optimize)
+        duration_s: Duration of each phase in seconds
+        batch_size: Rows per batch, the unit of atomicity checked by readers
+            (default 1000 times the scale factor)
+    """
+    print("\n=== Test: Concurrent Readers and Writers ===")
+
+    if batch_size is None:
+        batch_size = scaled(1000)
+    print(f"[INFO] Readers: {num_readers}, Writers: {num_writers}, Phase duration: {duration_s}s")
+
+    table_path = setup_concurrency_table("delta_concurrency_test", batch_size)
+
+    # Phase 1: readers only
+    baseline = _reader_stats(_run_phase(table_path, 1, num_readers, 0, batch_size, duration_s), duration_s)
+    print(f"[INFO] Baseline reads: {baseline['scans_per_s']:.2f} scans/s, {baseline['rows_per_s']:.0f} rows/s")
+    print(f"[INFO] Baseline read latency: {format_latency_summary(baseline['latency'])}")
+
+    # Phase 2: writers only
+    writers_alone = _writer_stats(_run_phase(table_path, 2, 0, num_writers, batch_size, duration_s))
+    for kind, stats in writers_alone.items():
+        print(f"[INFO] Baseline {kind} latency: {format_latency_summary(stats['latency'])}")
+        print(f"[INFO] Baseline {kind} commit conflicts: {stats['conflicts']}")
+
+    # Phase 3: readers and writers together
+    mixed_results = _run_phase(table_path, 3, num_readers, num_writers, batch_size, duration_s)
+    mixed = _reader_stats(mixed_results, duration_s)
+    writers_mixed = _writer_stats(mixed_results)
+
+    degradation = 0.0
+    if baseline["scans_per_s"] > 0:
+        degradation = 100 * (1 - mixed["scans_per_s"] / baseline["scans_per_s"])
+    print(f"[PASS] Reads under write load: {mixed['scans_per_s']:.2f} scans/s, {mixed['rows_per_s']:.0f} rows/s")
+    print(f"[PASS] Read latency under write load: {format_latency_summary(mixed['latency'])}")
+    print(f"[PASS] Reader throughput degradation: {degradation:.1f}%")
+    for kind, stats in writers_mixed.items():
+        print(f"[PASS] {kind} latency under read load: {format_latency_summary(stats['latency'])}")
+        print(f"[INFO] {kind} commit conflicts: {stats['conflicts']}")
+        for error in stats["errors"][:3]:
+            print(f"       - {kind} error: {error}")
+
+    for error in (baseline["errors"] + mixed["errors"])[:3]:
+        print(f"       - reader error: {error}")
+
+    # Torn-read and regression counts only mean something if the readers and writers actually ran
+    for phase, reads in (("baseline", baseline), ("mixed", mixed)):
+        assert reads["latency"]["count"] > 0, f"No scan completed in the {phase} phase"
+    reader_errors = baseline["errors"] + mixed["errors"]
+    assert not reader_errors, f"{len(reader_errors)} reader errors, first: {reader_errors[0]}"
+    # Commit conflicts (CommitFailedError) are expected and counted separately
+    writer_errors = [
+        f"{kind}: {error}" for stats in (writers_alone, writers_mixed)
+        for kind, kind_stats in stats.items() for error in kind_stats["errors"]
+    ]
+    assert not writer_errors, f"{len(writer_errors)} writer errors, first: {writer_errors[0]}"
+    for phase, writers in (("writers-only", writers_alone), ("mixed", writers_mixed)):
+        for kind, kind_stats in writers.items():
+            assert kind_stats["latency"]["count"] > 0, \
+                f"No {kind} committed in the {phase} phase ({kind_stats['conflicts']} conflicts)"
+
+    # Readers must only ever observe complete snapshots
+    assert baseline["torn"] == 0 and mixed["torn"] == 0, \
+        f"Torn reads detected: {baseline['torn'] + mixed['torn']} batches"
+    assert mixed["version_regressions"] == 0, \
+        f"Readers observed {mixed['version_regressions']} version regressions"
+    print("[PASS] No torn reads or version regressions observed")
+
+    return {
+        "baseline_reads": baseline,
+        "mixed_reads": mixed,
+        "reader_degradation_pct": degradation,
+        "writers_alone": writers_alone,
+        "writers_under_read_load": writers_mixed,
+    }
+
+
+def run_all_concurrency_tests():
+    """Run all concurrency tests."""
+    print("\n" + "=" * 50)
+    print("CONCURRENCY TESTS")
+    print("=" * 50)
+
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
+
+    tests = [
+        test_concurrent_read_write,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"[FAIL] {test.__name__}: {e}")
+            failed += 1
+
+    print("\n" + "=" * 50)
+    print(f"CONCURRENCY TESTS COMPLETE: {passed} passed, {failed} failed")
+    print("=" * 50)
+
+    # Cleanup test tables
+    cleanup_test_tables()
+
+
+if __name__ == "__main__":
+    run_all_concurrency_tests()
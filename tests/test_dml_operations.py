@@ -2,31 +2,54 @@
 # Phase 2: DML Operations Tests
 # -------------------------------
 # Tests: merge (upsert), update, delete
+#
+# Row counts are multiplied by the scale factor (--scale), so the same tests
+# run as load tests. The tables repeat a small pattern of rows (at scale 1
+# exactly the original rows), and expected results are derived from the
+# input, so assertions hold at any scale.
 
 from tests.config import (
-    HOPSWORKS_API_HOST,
-    HOPSWORKS_API_PORT,
-    HOPSWORKS_API_KEY,
     get_table_path,
-    set_project,
     cleanup_test_tables,
+    scaled,
 )
+from tests.session import login
+from tests.validation import assert_same_rows
 
 import pyarrow as pa
 import pandas as pd
-import hopsworks
 from deltalake import write_deltalake, DeltaTable, QueryBuilder
 
+# Row pattern repeated by the generated tables
+NAMES = ["Alice", "Bob", "Charlie", "David", "Eve"]
+SCORES = [85, 90, 78, 92, 88]
+
+
+def _name(i: int) -> str:
+    """Name of id i: the NAMES pattern, suffixed from its second repetition on."""
+    name = NAMES[(i - 1) % len(NAMES)]
+    return name if i <= len(NAMES) else f"{name}_{(i - 1) // len(NAMES)}"
+
+
+def _letter(i: int) -> str:
+    return chr(ord("a") + (i - 1) % 26)
+
+
+def _people(rows: int) -> pd.DataFrame:
+    """Ids 1..rows with names and scores following NAMES and SCORES."""
+    ids = range(1, rows + 1)
+    return pd.DataFrame({
+        "id": ids,
+        "name": [_name(i) for i in ids],
+        "score": [SCORES[(i - 1) % len(SCORES)] for i in ids]
+    })
+
 
 def setup_dml_test_table():
     """Create a test table for DML operations."""
     table_path = get_table_path("delta_dml_test")
 
-    df = pd.DataFrame({
-        "id": [1, 2, 3, 4, 5],
-        "name": ["Alice", "Bob", "Charlie", "David", "Eve"],
-        "score": [85, 90, 78, 92, 88]
-    })
+    df = _people(scaled(5))
     table = pa.Table.from_pandas(df, preserve_index=False)
     write_deltalake(table_path, table, mode="overwrite")
 
@@ -41,11 +64,7 @@ def test_delete_rows():
     table_path = get_table_path("delta_delete_test")
 
     # Create initial data
-    df = pd.DataFrame({
-        "id": [1, 2, 3, 4, 5],
-        "name": ["Alice", "Bob", "Charlie", "David", "Eve"],
-        "score": [85, 90, 78, 92, 88]
-    })
+    df = _people(scaled(5))
     write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode="overwrite")
     print(f"[INFO] Initial row count: {len(df)}")
 
@@ -56,11 +75,11 @@ def test_delete_rows():
 
     # Verify
     result = dt.to_pandas()
-    print(f"[PASS] Row count after delete: {len(result)}")
-    print(f"[PASS] Remaining names: {list(result['name'])}")
+    print(f"[PASS] Row count after delete: {len(result)} (expected: {(df['score'] >= 85).sum()})")
 
     # All remaining scores should be >= 85
     assert all(result['score'] >= 85), "Delete predicate not applied correctly"
+    assert_same_rows(df[df['score'] >= 85], result, key_columns=["id"])
     print("[PASS] Delete predicate verified")
 
 
@@ -71,9 +90,10 @@ def test_delete_all_rows():
     table_path = get_table_path("delta_delete_all_test")
 
     # Create initial data
+    ids = range(1, scaled(3) + 1)
     df = pd.DataFrame({
-        "id": [1, 2, 3],
-        "value": ["a", "b", "c"]
+        "id": ids,
+        "value": [_letter(i) for i in ids]
     })
     write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode="overwrite")
     print(f"[INFO] Initial row count: {len(df)}")
@@ -97,13 +117,9 @@ def test_update_rows():
     table_path = get_table_path("delta_update_test")
 
     # Create initial data
-    df = pd.DataFrame({
-        "id": [1, 2, 3, 4, 5],
-        "name": ["Alice", "Bob", "Charlie", "David", "Eve"],
-        "score": [85, 90, 78, 92, 88]
-    })
+    df = _people(scaled(5))
     write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode="overwrite")
-    print(f"[INFO] Initial scores: {list(df['score'])}")
+    print(f"[INFO] Initial rows: {len(df)}, scores below 85: {(df['score'] < 85).sum()}")
 
     # Update: add 10 points to everyone with score < 85
     dt = DeltaTable(table_path)
@@ -113,12 +129,12 @@ def test_update_rows():
     )
     print("[PASS] Updated rows where score < 85 (added 10 points)")
 
-    # Verify
+    # Verify (e.g. Charlie: 78 -> 88)
     result = dt.to_pandas()
-    charlie_score = result[result['name'] == 'Charlie']['score'].values[0]
-    print(f"[PASS] Charlie's score after update: {charlie_score} (was 78, expected 88)")
-    assert charlie_score == 88, f"Expected 88, got {charlie_score}"
-    print("[PASS] Update verified")
+    expected_df = df.copy()
+    expected_df.loc[expected_df['score'] < 85, 'score'] += 10
+    assert_same_rows(expected_df, result, key_columns=["id"])
+    print(f"[PASS] Update verified on {len(result)} rows")
 
 
 def test_update_all_rows():
@@ -128,12 +144,13 @@ def test_update_all_rows():
     table_path = get_table_path("delta_update_all_test")
 
     # Create initial data
+    rows = scaled(3)
     df = pd.DataFrame({
-        "id": [1, 2, 3],
-        "status": ["pending", "pending", "pending"]
+        "id": range(1, rows + 1),
+        "status": ["pending"] * rows
     })
     write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode="overwrite")
-    print(f"[INFO] Initial statuses: {list(df['status'])}")
+    print(f"[INFO] Initial rows: {rows}, all pending")
 
     # Update all rows
     dt = DeltaTable(table_path)
@@ -142,7 +159,8 @@ def test_update_all_rows():
 
     # Verify
     result = dt.to_pandas()
-    print(f"[PASS] Statuses after update: {list(result['status'])}")
+    print(f"[PASS] Statuses after update: {result['status'].value_counts().to_dict()}")
+    assert len(result) == rows, f"Expected {rows} rows, got {len(result)}"
     assert all(result['status'] == 'completed'), "Not all rows updated"
     print("[PASS] All rows updated")
 
@@ -154,22 +172,18 @@ def test_merge_upsert():
     table_path = get_table_path("delta_merge_test")
 
     # Create initial data (target)
-    target_df = pd.DataFrame({
-        "id": [1, 2, 3],
-        "name": ["Alice", "Bob", "Charlie"],
-        "score": [85, 90, 78]
-    })
+    target_df = _people(scaled(3))
     write_deltalake(table_path, pa.Table.from_pandas(target_df, preserve_index=False), mode="overwrite")
     print(f"[INFO] Target table: {len(target_df)} rows")
 
-    # Source data for merge (update id=2, insert id=4)
-    source_df = pd.DataFrame({
-        "id": [2, 4],
-        "name": ["Bob Updated", "David"],
-        "score": [95, 92]
-    })
+    # Source data for merge: update the even ids (e.g. Bob: 90 -> 95), insert
+    # as many new ids past the end (e.g. David)
+    updates = target_df[target_df['id'] % 2 == 0].assign(
+        name=lambda d: d['name'] + " Updated", score=lambda d: d['score'] + 5)
+    inserts = _people(len(target_df) + len(updates))[len(target_df):]
+    source_df = pd.concat([updates, inserts], ignore_index=True)
     source_table = pa.Table.from_pandas(source_df, preserve_index=False)
-    print(f"[INFO] Source data: {len(source_df)} rows (1 update, 1 insert)")
+    print(f"[INFO] Source data: {len(source_df)} rows ({len(updates)} updates, {len(inserts)} inserts)")
 
     # Perform merge
     dt = DeltaTable(table_path)
@@ -187,19 +201,19 @@ def test_merge_upsert():
     print("[PASS] Merge executed")
 
     # Verify
-    result = dt.to_pandas().sort_values("id")
-    print(f"[PASS] Row count after merge: {len(result)} (expected: 4)")
-    print(f"[PASS] Result:\n{result}")
+    result = dt.to_pandas()
+    expected_df = pd.concat([target_df[target_df['id'] % 2 == 1], source_df], ignore_index=True)
+    print(f"[PASS] Row count after merge: {len(result)} (expected: {len(expected_df)})")
+
+    updated = result[result['id'].isin(updates['id'])]
+    assert (updated['name'].str.endswith(" Updated")).all(), "Matched rows should have been updated"
+    print(f"[PASS] {len(updated)} matched rows updated")
 
-    # Check Bob was updated
-    bob_score = result[result['id'] == 2]['score'].values[0]
-    assert bob_score == 95, f"Expected Bob's score to be 95, got {bob_score}"
-    print("[PASS] Bob's score updated to 95")
+    assert result['id'].isin(inserts['id']).sum() == len(inserts), "New rows should have been inserted"
+    print(f"[PASS] {len(inserts)} new rows inserted")
 
-    # Check David was inserted
-    david_exists = len(result[result['id'] == 4]) == 1
-    assert david_exists, "David should have been inserted"
-    print("[PASS] David inserted")
+    assert_same_rows(expected_df, result, key_columns=["id"])
+    print("[PASS] Full table contents verified")
 
 
 def test_merge_delete():
@@ -209,20 +223,14 @@ def test_merge_delete():
     table_path = get_table_path("delta_merge_delete_test")
 
     # Create initial data (target)
-    target_df = pd.DataFrame({
-        "id": [1, 2, 3, 4, 5],
-        "name": ["Alice", "Bob", "Charlie", "David", "Eve"],
-        "active": [True, True, True, True, True]
-    })
+    target_df = _people(scaled(5)).drop(columns="score").assign(active=True)
     write_deltalake(table_path, pa.Table.from_pandas(target_df, preserve_index=False), mode="overwrite")
     print(f"[INFO] Target table: {len(target_df)} rows")
 
-    # Source: ids to deactivate (delete)
-    source_df = pd.DataFrame({
-        "id": [2, 4]
-    })
+    # Source: ids to deactivate (delete), the even ones
+    source_df = target_df[target_df['id'] % 2 == 0][["id"]]
     source_table = pa.Table.from_pandas(source_df, preserve_index=False)
-    print(f"[INFO] Source data: ids to delete: {list(source_df['id'])}")
+    print(f"[INFO] Source data: {len(source_df)} even ids to delete")
 
     # Perform merge with delete
     dt = DeltaTable(table_path)
@@ -240,10 +248,10 @@ def test_merge_delete():
 
     # Verify
     result = dt.to_pandas()
-    print(f"[PASS] Row count after merge: {len(result)} (expected: 3)")
-    remaining_ids = sorted(result['id'].tolist())
-    print(f"[PASS] Remaining ids: {remaining_ids}")
-    assert remaining_ids == [1, 3, 5], f"Expected [1, 3, 5], got {remaining_ids}"
+    expected_df = target_df[target_df['id'] % 2 == 1]
+    print(f"[PASS] Row count after merge: {len(result)} (expected: {len(expected_df)})")
+    assert (result['id'] % 2 == 1).all(), "Only odd ids should remain"
+    assert_same_rows(expected_df, result, key_columns=["id"])
     print("[PASS] Correct rows deleted")
 
 
@@ -253,23 +261,26 @@ def test_merge_conditional_update():
 
     table_path = get_table_path("delta_merge_cond_test")
 
-    # Create initial data
+    # Create initial data: value = 100 * id
+    rows = scaled(3)
     target_df = pd.DataFrame({
-        "id": [1, 2, 3],
-        "value": [100, 200, 300],
-        "updated_at": ["2024-01-01", "2024-01-01", "2024-01-01"]
+        "id": range(1, rows + 1),
+        "value": [100 * i for i in range(1, rows + 1)],
+        "updated_at": ["2024-01-01"] * rows
     })
     write_deltalake(table_path, pa.Table.from_pandas(target_df, preserve_index=False), mode="overwrite")
-    print(f"[INFO] Target: {target_df.to_dict('records')}")
+    print(f"[INFO] Target: {rows} rows, value = 100 * id")
 
-    # Source with updates
+    # Source with updates for all but the last id: odd ids increase
+    # (e.g. id=1: 150), even ids decrease (e.g. id=2: 180)
+    source_ids = range(1, max(rows, 2))
     source_df = pd.DataFrame({
-        "id": [1, 2],
-        "value": [150, 180],  # id=1 increases, id=2 decreases
-        "updated_at": ["2024-02-01", "2024-02-01"]
+        "id": source_ids,
+        "value": [100 * i + 50 if i % 2 else 100 * i - 20 for i in source_ids],
+        "updated_at": ["2024-02-01"] * len(source_ids)
     })
     source_table = pa.Table.from_pandas(source_df, preserve_index=False)
-    print(f"[INFO] Source: {source_df.to_dict('records')}")
+    print(f"[INFO] Source: {len(source_df)} rows, odd ids increase, even ids decrease")
 
     # Merge: only update if new value is greater
     dt = DeltaTable(table_path)
@@ -292,18 +303,22 @@ def test_merge_conditional_update():
     print("[PASS] Conditional merge executed")
 
     # Verify
-    result = dt.to_pandas().sort_values("id")
-    print(f"[PASS] Result:\n{result}")
+    result = dt.to_pandas()
+    increased = source_df[source_df['id'] % 2 == 1]
 
-    # id=1 should be updated (150 > 100)
-    id1_value = result[result['id'] == 1]['value'].values[0]
-    assert id1_value == 150, f"id=1 should be 150, got {id1_value}"
-    print("[PASS] id=1 updated to 150 (150 > 100)")
+    # Odd ids should be updated (e.g. 150 > 100)
+    updated = result[result['id'].isin(increased['id'])]
+    assert (updated['updated_at'] == "2024-02-01").all(), "Rows with a greater source value should be updated"
+    print(f"[PASS] {len(updated)} odd ids updated (source value greater)")
 
-    # id=2 should NOT be updated (180 < 200)
-    id2_value = result[result['id'] == 2]['value'].values[0]
-    assert id2_value == 200, f"id=2 should remain 200, got {id2_value}"
-    print("[PASS] id=2 remains 200 (180 < 200, condition not met)")
+    # Even ids should NOT be updated (e.g. 180 < 200)
+    unchanged = result[~result['id'].isin(increased['id'])]
+    assert (unchanged['value'] == 100 * unchanged['id']).all(), "Rows with a smaller source value should remain"
+    print(f"[PASS] {len(unchanged)} other ids unchanged (condition not met)")
+
+    expected_df = pd.concat([increased, target_df[~target_df['id'].isin(increased['id'])]], ignore_index=True)
+    assert_same_rows(expected_df, result, key_columns=["id"])
+    print("[PASS] Full table contents verified")
 
 
 def test_delete_with_deletion_vectors():
@@ -313,11 +328,7 @@ def test_delete_with_deletion_vectors():
     table_path = get_table_path("delta_dv_delete_test")
 
     # Create table with deletion vectors enabled
-    df = pd.DataFrame({
-        "id": [1, 2, 3, 4, 5],
-        "name": ["Alice", "Bob", "Charlie", "David", "Eve"],
-        "score": [85, 90, 78, 92, 88]
-    })
+    df = _people(scaled(5))
     write_deltalake(
         table_path,
         pa.Table.from_pandas(df, preserve_index=False),
@@ -338,8 +349,9 @@ def test_delete_with_deletion_vectors():
     dt = DeltaTable(table_path)
     result = QueryBuilder().register("tbl", dt).execute("SELECT * FROM tbl").read_all()
     result_df = pa.table(result).to_pandas()  # Convert arro3 Table to PyArrow then pandas
-    print(f"[PASS] Row count after delete: {len(result_df)} (expected: 4)")
-    assert len(result_df) == 4, f"Expected 4 rows, got {len(result_df)}"
+    expected = (df['score'] >= 85).sum()
+    print(f"[PASS] Row count after delete: {len(result_df)} (expected: {expected})")
+    assert len(result_df) == expected, f"Expected {expected} rows, got {len(result_df)}"
 
     # Check that all remaining scores are >= 85
     assert all(result_df['score'] >= 85), "Deletion vectors didn't filter correctly"
@@ -357,9 +369,10 @@ def test_update_with_deletion_vectors():
     table_path = get_table_path("delta_dv_update_test")
 
     # Create table with deletion vectors enabled
+    rows = scaled(5)
     df = pd.DataFrame({
-        "id": [1, 2, 3, 4, 5],
-        "status": ["pending", "pending", "pending", "pending", "pending"]
+        "id": range(1, rows + 1),
+        "status": ["pending"] * rows
     })
     write_deltalake(
         table_path,
@@ -371,12 +384,13 @@ def test_update_with_deletion_vectors():
 
     dt = DeltaTable(table_path)
 
-    # Update some rows
+    # Update the first two fifths of the rows
+    limit = 2 * rows // 5
     dt.update(
-        predicate="id <= 2",
+        predicate=f"id <= {limit}",
         updates={"status": "'completed'"}
     )
-    print("[PASS] Updated rows where id <= 2")
+    print(f"[PASS] Updated rows where id <= {limit}")
 
     # Verify update worked using QueryBuilder (required for DV tables)
     dt = DeltaTable(table_path)
@@ -386,8 +400,8 @@ def test_update_with_deletion_vectors():
     pending_count = len(result_df[result_df['status'] == 'pending'])
 
     print(f"[PASS] Completed: {completed_count}, Pending: {pending_count}")
-    assert completed_count == 2, f"Expected 2 completed, got {completed_count}"
-    assert pending_count == 3, f"Expected 3 pending, got {pending_count}"
+    assert completed_count == limit, f"Expected {limit} completed, got {completed_count}"
+    assert pending_count == rows - limit, f"Expected {rows - limit} pending, got {pending_count}"
     print("[PASS] Update with deletion vectors working correctly")
 
 
@@ -398,9 +412,10 @@ def test_merge_with_deletion_vectors():
     table_path = get_table_path("delta_dv_merge_test")
 
     # Create target table with deletion vectors enabled
+    rows = scaled(3)
     target_df = pd.DataFrame({
-        "id": [1, 2, 3],
-        "value": ["a", "b", "c"]
+        "id": range(1, rows + 1),
+        "value": [_letter(i) for i in range(1, rows + 1)]
     })
     write_deltalake(
         table_path,
@@ -410,11 +425,16 @@ def test_merge_with_deletion_vectors():
     )
     print("[PASS] Created target table with deletion vectors enabled")
 
-    # Source data: update id=2, delete id=3, insert id=4
+    # Source data: update ids with id % 3 == 2 (e.g. id=2), delete those with
+    # id % 3 == 0 (e.g. id=3), insert one new id per three rows (e.g. id=4)
+    actions = {2: "update", 0: "delete"}
+    changed = [i for i in range(1, rows + 1) if i % 3 in actions]
+    inserted = list(range(rows + 1, rows + 1 + max(1, rows // 3)))
     source_df = pd.DataFrame({
-        "id": [2, 3, 4],
-        "value": ["b_updated", "to_delete", "d_new"],
-        "action": ["update", "delete", "insert"]
+        "id": changed + inserted,
+        "value": [f"{_letter(i)}_updated" if i % 3 == 2 else "to_delete" for i in changed]
+                 + [f"{_letter(i)}_new" for i in inserted],
+        "action": [actions[i % 3] for i in changed] + ["insert"] * len(inserted)
     })
     source_table = pa.Table.from_pandas(source_df, preserve_index=False)
 
@@ -445,11 +465,16 @@ def test_merge_with_deletion_vectors():
     dt = DeltaTable(table_path)
     result = QueryBuilder().register("tbl", dt).execute("SELECT * FROM tbl ORDER BY id").read_all()
     result_df = pa.table(result).to_pandas()  # Convert arro3 Table to PyArrow then pandas
-    print(f"[PASS] Result:\n{result_df}")
 
-    assert len(result_df) == 3, f"Expected 3 rows, got {len(result_df)}"
-    assert list(result_df['id']) == [1, 2, 4], f"Expected ids [1, 2, 4], got {list(result_df['id'])}"
-    assert result_df[result_df['id'] == 2]['value'].values[0] == 'b_updated', "id=2 should be updated"
+    expected_df = pd.concat([
+        target_df[target_df['id'] % 3 == 1],
+        source_df[source_df['action'].isin(["update", "insert"])][["id", "value"]],
+    ], ignore_index=True)
+    print(f"[PASS] Row count after merge: {len(result_df)} (expected: {len(expected_df)})")
+    assert len(result_df) == len(expected_df), f"Expected {len(expected_df)} rows, got {len(result_df)}"
+    assert not result_df['id'].isin(source_df[source_df['action'] == "delete"]['id']).any(), \
+        "Rows matched by the delete clause should be gone"
+    assert_same_rows(expected_df, result_df, key_columns=["id"])
     print("[PASS] Merge with deletion vectors working correctly")
 
 
@@ -459,14 +484,8 @@ def run_all_dml_tests():
     print("DML OPERATIONS TESTS")
     print("=" * 50)
 
-    # Connect to Hopsworks once
-    project = hopsworks.login(
-        host=HOPSWORKS_API_HOST,
-        port=HOPSWORKS_API_PORT,
-        api_key_value=HOPSWORKS_API_KEY
-    )
-    print(f"Connected to Hopsworks project: {project.name}")
-    set_project(project)
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
 
     tests = [
         test_delete_rows,
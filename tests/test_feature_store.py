@@ -3,20 +3,22 @@
 # -------------------------------
 # Tests: Feature group CRUD, feature view, train/test splits with Delta format
 # Based on: https://github.com/logicalclocks/loadtest/blob/main/tests/workflows/feature_store/test_code/deltalake.py
+#
+# Row counts are multiplied by the scale factor (--scale); at scale 1 the
+# data is exactly the original three rows and assertions hold at any scale.
 
 import logging
+from functools import partial
 
 logging.getLogger().setLevel(logging.DEBUG)
 
-from tests.config import (
-    HOPSWORKS_API_HOST,
-    HOPSWORKS_API_PORT,
-    HOPSWORKS_API_KEY,
-    set_project,
-)
+from tests.config import scaled
+from tests.cleanup import remove_in_parallel
+from tests.session import login
+from tests.validation import assert_same_rows
+from tests.orchestration import run_parallel, wait_for_job_async
 
 import pandas as pd
-import hopsworks
 
 # Track feature store resources for cleanup
 _created_feature_groups: list[tuple] = []  # (fs, name, version)
@@ -24,10 +26,13 @@ _created_feature_views: list[tuple] = []   # (fs, name, version)
 
 
 def _validate_data(expected_df, actual_df):
-    """Validate that two DataFrames contain the same data."""
-    df1_sorted = expected_df.sort_values(by=expected_df.columns.tolist()).reset_index(drop=True)
-    df2_sorted = actual_df.sort_values(by=actual_df.columns.tolist()).reset_index(drop=True)
-    assert df1_sorted.equals(df2_sorted), f"Data mismatch:\nExpected:\n{df1_sorted}\nActual:\n{df2_sorted}"
+    """Validate that two DataFrames contain the same rows (in any order)."""
+    assert_same_rows(expected_df, actual_df, key_columns=["id"])
+
+
+def _letters(ids) -> list[str]:
+    """A letter per id: 1 -> a, 2 -> b, ... (repeating after z)."""
+    return [chr(ord("a") + (i - 1) % 26) for i in ids]
 
 
 def _ensure_pandas(df_like):
@@ -47,27 +52,37 @@ def _track_feature_view(fs, name, version):
     _created_feature_views.append((fs, name, version))
 
 
+def _delete_feature_view(resource):
+    """Delete one tracked feature view."""
+    fs, name, version = resource
+    fs.get_feature_view(name=name, version=version).delete()
+
+
+def _delete_feature_group(resource):
+    """Delete one tracked feature group."""
+    fs, name, version = resource
+    fs.get_feature_group(name=name, version=version).delete()
+
+
+def _describe_resource(resource):
+    """Printable label for a tracked (fs, name, version) resource."""
+    _, name, version = resource
+    return f"{name} v{version}"
+
+
 def cleanup_feature_store_resources():
     """Clean up all feature store resources created during tests."""
     global _created_feature_views, _created_feature_groups
 
     # Delete feature views first (they depend on feature groups)
-    for fs, name, version in _created_feature_views:
-        try:
-            fv = fs.get_feature_view(name=name, version=version)
-            fv.delete()
-            print(f"[CLEANUP] Deleted feature view: {name} v{version}")
-        except Exception as e:
-            print(f"[CLEANUP] Failed to delete feature view {name} v{version}: {e}")
+    if _created_feature_views:
+        print(f"[CLEANUP] Deleting {len(_created_feature_views)} feature views...")
+        remove_in_parallel(_created_feature_views, _delete_feature_view, describe=_describe_resource)
 
     # Then delete feature groups
-    for fs, name, version in _created_feature_groups:
-        try:
-            fg = fs.get_feature_group(name=name, version=version)
-            fg.delete()
-            print(f"[CLEANUP] Deleted feature group: {name} v{version}")
-        except Exception as e:
-            print(f"[CLEANUP] Failed to delete feature group {name} v{version}: {e}")
+    if _created_feature_groups:
+        print(f"[CLEANUP] Deleting {len(_created_feature_groups)} feature groups...")
+        remove_in_parallel(_created_feature_groups, _delete_feature_group, describe=_describe_resource)
 
     _created_feature_views.clear()
     _created_feature_groups.clear()
@@ -93,8 +108,10 @@ def test_feature_store_deltalake(project, online_enable=False, spark=None):
     fs = project.get_feature_store()
 
     # Define the source data once in pandas
+    rows = scaled(3)
+    ids = list(range(1, rows + 1))
     df_pd = pd.DataFrame(
-        data={"id": [1, 2, 3], "text": ["a", "b", "c"]},
+        data={"id": ids, "text": _letters(ids)},
         columns=["id", "text"],
     )
     # Convert to Spark DataFrame if Spark session is provided (used for insert)
@@ -136,28 +153,33 @@ def test_feature_store_deltalake(project, online_enable=False, spark=None):
     _track_feature_view(fs, "fv_feature_pipeline", 1)
     print("[PASS] Created feature view")
 
-    fv.train_validation_test_split(
-        validation_size=0.2,
-        test_size=0.1,
+    # Submit the training dataset job, then build the in-memory split while it runs
+    version, _job = fv.create_train_test_split(
+        test_size=0.5, write_options={"wait_for_job": False}
     )
-    print("[PASS] Created train/validation/test split")
+    print(f"[INFO] Submitted train/test split version {version}")
 
-    version, _job = fv.create_train_test_split(test_size=0.5)
-    print(f"[INFO] Created train/test split version {version}")
+    steps = [partial(fv.train_validation_test_split, validation_size=0.2, test_size=0.1)]
+    if not spark:
+        steps.append(wait_for_job_async(_job))
+    _, *job_timing = run_parallel(steps)
+    print("[PASS] Created train/validation/test split")
 
     if not spark:
-        if _job.get_final_state() != "SUCCEEDED":
-            raise Exception(
-                f"Training data creation job failed: {_job.get_final_state()}"
-            )
+        if job_timing[0]["final_status"] != "SUCCEEDED":
+            raise Exception(f"Training data creation job failed: {job_timing[0]['final_status']}")
         print("[PASS] Training data creation job succeeded")
 
     fv.get_train_test_split(version)
     print("[PASS] Retrieved train/test split")
 
-    # Define the updated data once in pandas
+    # Define the updated data once in pandas: update two of every three ids
+    # (e.g. 1 and 2), insert one new id per three rows (e.g. 4)
+    updated_ids = [i for i in ids if i % 3 != 0]
+    new_ids = list(range(rows + 1, rows + 1 + max(1, rows // 3)))
     updated_df_pd = pd.DataFrame(
-        data={"id": [1, 2, 4], "text": ["updated_a", "updated_b", "d"]},
+        data={"id": updated_ids + new_ids,
+              "text": [f"updated_{t}" for t in _letters(updated_ids)] + _letters(new_ids)},
         columns=["id", "text"],
     )
     # Convert to Spark DataFrame if Spark session is provided (used for insert)
@@ -173,9 +195,8 @@ def test_feature_store_deltalake(project, online_enable=False, spark=None):
     )
     print("[PASS] Inserted updated data")
 
-    expected_df = pd.DataFrame(
-        data={"id": [1, 2, 3, 4], "text": ["updated_a", "updated_b", "c", "d"]},
-        columns=["id", "text"],
+    expected_df = pd.concat(
+        [df_pd[~df_pd["id"].isin(updated_ids)], updated_df_pd], ignore_index=True
     )
 
     if online_enable:
@@ -201,13 +222,7 @@ def run_all_feature_store_tests(project=None):
 
     # Connect to Hopsworks if not provided
     if project is None:
-        project = hopsworks.login(
-            host=HOPSWORKS_API_HOST,
-            port=HOPSWORKS_API_PORT,
-            api_key_value=HOPSWORKS_API_KEY
-        )
-        print(f"Connected to Hopsworks project: {project.name}")
-        set_project(project)
+        project = login()
 
     tests = [
         ("Feature Store: Delta Lake CRUD", test_feature_store_deltalake),
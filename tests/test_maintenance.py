@@ -1,52 +1,194 @@
 # -------------------------------
 # Phase 3: Table Maintenance Tests
 # -------------------------------
-# Tests: vacuum, optimize/compact, z-order
+# Tests: vacuum, optimize/compact, z-order, incremental compaction with resume
+#
+# Row counts are multiplied by the scale factor (--scale), so the same tests
+# run as load tests; file and version counts stay fixed, and assertions hold
+# at any scale.
 
 from tests.config import (
-    HOPSWORKS_API_HOST,
-    HOPSWORKS_API_PORT,
-    HOPSWORKS_API_KEY,
     get_table_path,
-    set_project,
     cleanup_test_tables,
+    scaled,
 )
+from tests.session import login
+from tests.validation import assert_same_rows
+from tests.orchestration import run_parallel, MAX_CONCURRENCY
+from tests.fixture_cache import clone_fixture
+from tests.incremental_maintenance import (
+    compact_incrementally,
+    drop_maintenance_state,
+    partition_file_stats,
+    MIN_SMALL_FILES,
+)
+
+from functools import partial
 
 import pyarrow as pa
 import pandas as pd
-import hopsworks
 from deltalake import write_deltalake, DeltaTable
 
 
-def create_table_with_multiple_versions(table_name: str, num_versions: int = 5):
-    """Create a table with multiple versions to test maintenance operations."""
-    table_path = get_table_path(table_name)
+# Overwrites made by _build_overwritten_table
+OVERWRITES = 3
+
+# Appends made by _build_small_files_table
+SMALL_FILES = 10
+
+PARTITIONS = ["part_a", "part_b", "part_c"]
+
+# Partitions and appends of _build_skewed_partitions_table
+SKEWED_PARTITIONS = 6
+SKEWED_APPENDS = 12
 
+
+def _write_multiple_versions(table_path: str, num_versions: int, rows: int):
+    """Write num_versions versions of `rows` rows each."""
     for i in range(num_versions):
         df = pd.DataFrame({
-            "id": range(i * 100, (i + 1) * 100),
-            "version": [f"v{i}"] * 100,
-            "value": [f"data_{j}" for j in range(100)]
+            "id": range(i * rows, (i + 1) * rows),
+            "version": [f"v{i}"] * rows,
+            "value": [f"data_{j}" for j in range(rows)]
+        })
+        mode = "overwrite" if i == 0 else "append"
+        write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode=mode)
+
+
+def create_table_with_multiple_versions(table_name: str, num_versions: int = 5):
+    """Create a table with multiple versions to test maintenance operations (cloned from the fixture cache)."""
+    return clone_fixture(_write_multiple_versions, table_name, num_versions=num_versions, rows=scaled(100))
+
+
+def _build_overwritten_table(table_path: str):
+    """Create a table and make multiple overwrites to generate old files."""
+    rows = scaled(100)
+    for i in range(OVERWRITES):
+        df = pd.DataFrame({
+            "id": range(rows),
+            "iteration": [i] * rows
+        })
+        write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode="overwrite")
+
+
+def _build_small_files_table(table_path: str):
+    """Create a table with many small appends to generate many small files."""
+    rows = scaled(1)
+    for i in range(SMALL_FILES):
+        df = pd.DataFrame({
+            "id": range(i * rows, (i + 1) * rows),
+            "value": [f"small_batch_{i}"] * rows
         })
         mode = "overwrite" if i == 0 else "append"
         write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode=mode)
 
+
+def _build_zorder_table(table_path: str):
+    """Create a table with data suitable for z-ordering, written in multiple files."""
+    batch_rows = scaled(250)
+    df = pd.DataFrame({
+        "id": range(4 * batch_rows),
+        "category": ["A", "B", "C", "D"] * batch_rows,
+        "region": ["North", "South", "East", "West"] * batch_rows,
+        "value": range(4 * batch_rows)
+    })
+
+    # Write in multiple batches to create multiple files
+    for i in range(4):
+        batch = df.iloc[i*batch_rows:(i+1)*batch_rows]
+        mode = "overwrite" if i == 0 else "append"
+        write_deltalake(table_path, pa.Table.from_pandas(batch, preserve_index=False), mode=mode)
+
+
+def _build_partitioned_table(table_path: str):
+    """Create a partitioned table with multiple files per partition."""
+    rows = scaled(100)
+    df = pd.DataFrame({
+        "id": range(len(PARTITIONS) * rows),
+        "partition_col": [p for p in PARTITIONS for _ in range(rows)],
+        "value": range(len(PARTITIONS) * rows)
+    })
+
+    # Write in batches to create multiple files per partition
+    for i in range(len(PARTITIONS)):
+        batch = df.iloc[i*rows:(i+1)*rows]
+        mode = "overwrite" if i == 0 else "append"
+        write_deltalake(
+            table_path,
+            pa.Table.from_pandas(batch, preserve_index=False),
+            mode=mode,
+            partition_by=["partition_col"]
+        )
+
+
+def _build_skewed_partitions_table(table_path: str):
+    """Create a partitioned table whose partitions have different numbers of small files.
+
+    Write k goes to the partitions with index <= k % SKEWED_PARTITIONS,
+    so part_0 gets the most files and the last partition the fewest. The
+    first write overwrites, so a rebuild starts from an empty table.
+    """
+    rows = scaled(10)
+    for k in range(SKEWED_APPENDS):
+        partitions = range(k % SKEWED_PARTITIONS + 1)
+        df = pd.DataFrame({
+            "id": [k * SKEWED_PARTITIONS * rows + p * rows + i for p in partitions for i in range(rows)],
+            "partition_col": [f"part_{p}" for p in partitions for _ in range(rows)],
+            "append": [k] * (len(partitions) * rows),
+        })
+        write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False),
+                        mode="overwrite" if k == 0 else "append", partition_by=["partition_col"])
+
+
+# Table used by each test and the function that builds it
+_TABLE_BUILDERS = {
+    "delta_vacuum_dry_test": _build_overwritten_table,
+    "delta_vacuum_test": _build_overwritten_table,
+    "delta_optimize_test": _build_small_files_table,
+    "delta_zorder_test": _build_zorder_table,
+    "delta_optimize_filter_test": _build_partitioned_table,
+    "delta_optimize_incremental_test": _build_skewed_partitions_table,
+}
+
+# Tables built by setup_maintenance_tables and not used by a test yet
+_prepared_tables: set[str] = set()
+
+
+def _build_table(table_name: str) -> str:
+    """Build one test table from scratch and return its path."""
+    table_path = get_table_path(table_name)
+    _TABLE_BUILDERS[table_name](table_path)
     return table_path
 
 
+def _table(table_name: str) -> str:
+    """Path of a test's table; built now unless setup_maintenance_tables already built it.
+
+    Prepared tables are handed out once, so repeated runs of a test start
+    from a freshly built table again.
+    """
+    if table_name in _prepared_tables:
+        _prepared_tables.remove(table_name)
+        return get_table_path(table_name)
+    return _build_table(table_name)
+
+
+def setup_maintenance_tables(concurrency: int = MAX_CONCURRENCY):
+    """Build the tables of all maintenance tests concurrently.
+
+    Args:
+        concurrency: Tables built at the same time
+    """
+    run_parallel([partial(_build_table, name) for name in _TABLE_BUILDERS], concurrency)
+    _prepared_tables.update(_TABLE_BUILDERS)
+    print(f"[SETUP] Built {len(_TABLE_BUILDERS)} maintenance test tables concurrently")
+
+
 def test_vacuum_dry_run():
     """Test vacuum dry run (list files to be deleted without deleting)."""
     print("\n=== Test: Vacuum Dry Run ===")
 
-    table_path = get_table_path("delta_vacuum_dry_test")
-
-    # Create table and make multiple overwrites to generate old files
-    for i in range(3):
-        df = pd.DataFrame({
-            "id": range(100),
-            "iteration": [i] * 100
-        })
-        write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode="overwrite")
+    table_path = _table("delta_vacuum_dry_test")
 
     dt = DeltaTable(table_path)
     print(f"[INFO] Table version: {dt.version()}")
@@ -63,20 +205,18 @@ def test_vacuum_dry_run():
     for f in files_to_delete[:5]:
         print(f"       - {f}")
 
+    # The earlier overwrites left files behind, none of them still live
+    live = {uri.rsplit("/", 1)[-1] for uri in dt.file_uris()}
+    assert files_to_delete, "Expected files from earlier overwrites to be vacuumable"
+    assert not live & {f.rsplit("/", 1)[-1] for f in files_to_delete}, "Dry run lists live files"
+    assert len(DeltaTable(table_path).file_uris()) == len(live), "Dry run changed the table"
+
 
 def test_vacuum():
     """Test vacuum operation (delete old files)."""
     print("\n=== Test: Vacuum ===")
 
-    table_path = get_table_path("delta_vacuum_test")
-
-    # Create table and make multiple overwrites to generate old files
-    for i in range(3):
-        df = pd.DataFrame({
-            "id": range(100),
-            "iteration": [i] * 100
-        })
-        write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode="overwrite")
+    table_path = _table("delta_vacuum_test")
 
     dt = DeltaTable(table_path)
     initial_version = dt.version()
@@ -85,6 +225,7 @@ def test_vacuum():
     # Get all parquet files in directory (before vacuum)
     all_files_before = dt.file_uris()
     print(f"[INFO] Files before vacuum: {len(all_files_before)}")
+    data_before = dt.to_pyarrow_dataset()
 
     # Perform vacuum with 0 retention
     deleted_files = dt.vacuum(
@@ -94,31 +235,28 @@ def test_vacuum():
     )
     print(f"[PASS] Vacuum complete")
     print(f"[PASS] Deleted {len(deleted_files)} old files")
+    assert deleted_files, "Expected vacuum to delete the files of earlier overwrites"
 
     # Verify table still works
     result = dt.to_pandas()
     print(f"[PASS] Table still readable, rows: {len(result)}")
+    assert len(result) == scaled(100), f"Expected {scaled(100)} rows, got {len(result)}"
+    assert (result["iteration"] == OVERWRITES - 1).all(), "Expected only rows of the last overwrite"
+    assert_same_rows(data_before, DeltaTable(table_path).to_pyarrow_dataset())
+    print("[PASS] Table contents unchanged by vacuum")
 
 
 def test_optimize_compact():
     """Test optimize/compact operation (consolidate small files)."""
     print("\n=== Test: Optimize Compact ===")
 
-    table_path = get_table_path("delta_optimize_test")
-
-    # Create table with many small appends to generate many small files
-    for i in range(10):
-        df = pd.DataFrame({
-            "id": [i],
-            "value": [f"small_batch_{i}"]
-        })
-        mode = "overwrite" if i == 0 else "append"
-        write_deltalake(table_path, pa.Table.from_pandas(df, preserve_index=False), mode=mode)
+    table_path = _table("delta_optimize_test")
 
     dt = DeltaTable(table_path)
     files_before = len(dt.file_uris())
     print(f"[INFO] Files before optimize: {files_before}")
     print(f"[INFO] Table version before: {dt.version()}")
+    data_before = dt.to_pyarrow_dataset()
 
     # Perform optimize (compact)
     optimize_result = dt.optimize.compact()
@@ -134,33 +272,24 @@ def test_optimize_compact():
     # Verify data integrity
     result = dt.to_pandas()
     print(f"[PASS] Row count after optimize: {len(result)}")
-    assert len(result) == 10, f"Expected 10 rows, got {len(result)}"
+    expected = SMALL_FILES * scaled(1)
+    assert len(result) == expected, f"Expected {expected} rows, got {len(result)}"
+    assert files_after < files_before, f"Expected fewer files after compact, got {files_after} of {files_before}"
+    assert_same_rows(data_before, dt.to_pyarrow_dataset())
+    print("[PASS] Table contents unchanged by optimize")
 
 
 def test_optimize_zorder():
     """Test Z-Order optimization."""
     print("\n=== Test: Optimize Z-Order ===")
 
-    table_path = get_table_path("delta_zorder_test")
-
-    # Create table with data suitable for z-ordering
-    df = pd.DataFrame({
-        "id": range(1000),
-        "category": ["A", "B", "C", "D"] * 250,
-        "region": ["North", "South", "East", "West"] * 250,
-        "value": range(1000)
-    })
-
-    # Write in multiple batches to create multiple files
-    for i in range(4):
-        batch = df.iloc[i*250:(i+1)*250]
-        mode = "overwrite" if i == 0 else "append"
-        write_deltalake(table_path, pa.Table.from_pandas(batch, preserve_index=False), mode=mode)
+    table_path = _table("delta_zorder_test")
 
     dt = DeltaTable(table_path)
     files_before = len(dt.file_uris())
     print(f"[INFO] Files before z-order: {files_before}")
     print(f"[INFO] Table version before: {dt.version()}")
+    data_before = dt.to_pyarrow_dataset()
 
     # Perform z-order optimization on category and region columns
     zorder_result = dt.optimize.z_order(columns=["category", "region"])
@@ -176,36 +305,22 @@ def test_optimize_zorder():
     # Verify data integrity
     result = dt.to_pandas()
     print(f"[PASS] Row count after z-order: {len(result)}")
-    assert len(result) == 1000, f"Expected 1000 rows, got {len(result)}"
+    expected = 4 * scaled(250)
+    assert len(result) == expected, f"Expected {expected} rows, got {len(result)}"
+    assert_same_rows(data_before, dt.to_pyarrow_dataset())
+    print("[PASS] Table contents unchanged by z-order")
 
 
 def test_optimize_with_filter():
     """Test optimize with partition filter."""
     print("\n=== Test: Optimize with Filter ===")
 
-    table_path = get_table_path("delta_optimize_filter_test")
-
-    # Create partitioned table
-    df = pd.DataFrame({
-        "id": range(300),
-        "partition_col": ["part_a"] * 100 + ["part_b"] * 100 + ["part_c"] * 100,
-        "value": range(300)
-    })
-
-    # Write in batches to create multiple files per partition
-    for i in range(3):
-        batch = df.iloc[i*100:(i+1)*100]
-        mode = "overwrite" if i == 0 else "append"
-        write_deltalake(
-            table_path,
-            pa.Table.from_pandas(batch, preserve_index=False),
-            mode=mode,
-            partition_by=["partition_col"]
-        )
+    table_path = _table("delta_optimize_filter_test")
 
     dt = DeltaTable(table_path)
     files_before = len(dt.file_uris())
     print(f"[INFO] Files before optimize: {files_before}")
+    data_before = dt.to_pyarrow_dataset()
 
     # Optimize only partition_col='part_a'
     optimize_result = dt.optimize.compact(
@@ -219,6 +334,50 @@ def test_optimize_with_filter():
     dt = DeltaTable(table_path)
     result = dt.to_pandas()
     print(f"[PASS] Row count after optimize: {len(result)}")
+    expected = len(PARTITIONS) * scaled(100)
+    assert len(result) == expected, f"Expected {expected} rows, got {len(result)}"
+    assert_same_rows(data_before, dt.to_pyarrow_dataset())
+    print("[PASS] Table contents unchanged by optimize")
+
+
+def test_optimize_incremental():
+    """Test incremental compaction: worst partitions first, bounded runs, resume until done."""
+    print("\n=== Test: Optimize Incremental ===")
+
+    table_path = _table("delta_optimize_incremental_test")
+    drop_maintenance_state(table_path)
+
+    dt = DeltaTable(table_path)
+    stats = partition_file_stats(dt)
+    files_before = len(dt.file_uris())
+    data_before = dt.to_pyarrow_dataset()
+    print(f"[INFO] Files before: {files_before} in {len(stats)} partitions, "
+          f"worst: {stats[0]['partition']} with {stats[0]['small_files']} small files")
+
+    # A zero budget still compacts the first partition (no throughput estimate yet)
+    first = compact_incrementally(table_path, time_budget_s=0)
+    assert len(first["compacted"]) == 1, f"Expected 1 partition compacted, got {len(first['compacted'])}"
+    assert first["compacted"][0]["partition"] == stats[0]["partition"], "Expected the worst partition first"
+    assert first["stopped_by_budget"] and first["pending"] > 0, "Expected the budget to leave partitions pending"
+    print(f"[PASS] First run compacted {first['compacted'][0]['partition']}, {first['pending']} pending")
+
+    # Later runs resume the pass until no partition is pending
+    runs = [first]
+    while runs[-1]["pending"] and len(runs) < len(stats) + 1:
+        runs.append(compact_incrementally(table_path, time_budget_s=60))
+    assert runs[1]["resumed"], "Expected the second run to resume the pending partitions"
+    assert runs[-1]["pending"] == 0, f"{runs[-1]['pending']} partitions still pending after {len(runs)} runs"
+    removed = sum(r["files_removed"] for r in runs)
+    added = sum(r["files_added"] for r in runs)
+    print(f"[PASS] {len(runs)} runs: removed {removed} files, added {added}")
+
+    dt = DeltaTable(table_path)
+    worst = max(e["small_files"] for e in partition_file_stats(dt))
+    assert worst < MIN_SMALL_FILES, f"A partition still has {worst} small files"
+    assert len(dt.file_uris()) == files_before - removed + added, "File count does not match the metrics"
+    assert_same_rows(data_before, dt.to_pyarrow_dataset())
+    print("[PASS] Table contents unchanged by incremental compaction")
+    drop_maintenance_state(table_path)
 
 
 def run_all_maintenance_tests():
@@ -227,21 +386,17 @@ def run_all_maintenance_tests():
     print("TABLE MAINTENANCE TESTS")
     print("=" * 50)
 
-    # Connect to Hopsworks once
-    project = hopsworks.login(
-        host=HOPSWORKS_API_HOST,
-        port=HOPSWORKS_API_PORT,
-        api_key_value=HOPSWORKS_API_KEY
-    )
-    print(f"Connected to Hopsworks project: {project.name}")
-    set_project(project)
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
 
     tests = [
+        setup_maintenance_tables,
         test_vacuum_dry_run,
         test_vacuum,
         test_optimize_compact,
         test_optimize_zorder,
         test_optimize_with_filter,
+        test_optimize_incremental,
     ]
 
     passed = 0
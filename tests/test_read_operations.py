@@ -1,49 +1,60 @@
 # -------------------------------
 # Phase 1: Read Operations Tests
 # -------------------------------
-# Tests: load table, read as Arrow, read as Pandas, time travel
+# Tests: load table, read as Arrow, read as Pandas, time travel, file stats
+#
+# Row counts are multiplied by the scale factor (--scale), so the same tests
+# run as load tests; assertions hold at any scale.
 
 from tests.config import (
-    HOPSWORKS_API_HOST,
-    HOPSWORKS_API_PORT,
-    HOPSWORKS_API_KEY,
     get_table_path,
-    set_project,
     cleanup_test_tables,
+    scaled,
 )
+from tests.session import login
+from tests.fixture_cache import clone_fixture
+from tests.file_stats import file_stats_report, format_file_stats_report, estimate_files_scanned
 
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 import pandas as pd
-import hopsworks
 from deltalake import write_deltalake, DeltaTable
 
 
-def setup_test_table_with_versions():
-    """Create a test table with multiple versions for time travel tests."""
-    table_path = get_table_path("delta_read_test")
+# Versions written by the setup, each appending ROWS_PER_VERSION (scaled) rows
+VERSIONS = 3
+ROWS_PER_VERSION = 100
 
+
+def _write_versioned_table(table_path: str, rows: int):
+    """Write three versions of `rows` rows each."""
     # Version 0: Initial data
     df0 = pd.DataFrame({
-        "id": range(100),
-        "value": ["version_0"] * 100
+        "id": range(rows),
+        "value": ["version_0"] * rows
     })
     write_deltalake(table_path, pa.Table.from_pandas(df0, preserve_index=False), mode="overwrite")
 
     # Version 1: Append more data
     df1 = pd.DataFrame({
-        "id": range(100, 200),
-        "value": ["version_1"] * 100
+        "id": range(rows, 2 * rows),
+        "value": ["version_1"] * rows
     })
     write_deltalake(table_path, pa.Table.from_pandas(df1, preserve_index=False), mode="append")
 
     # Version 2: Append more data
     df2 = pd.DataFrame({
-        "id": range(200, 300),
-        "value": ["version_2"] * 100
+        "id": range(2 * rows, 3 * rows),
+        "value": ["version_2"] * rows
     })
     write_deltalake(table_path, pa.Table.from_pandas(df2, preserve_index=False), mode="append")
 
-    print(f"[SETUP] Created test table with 3 versions at {table_path}")
+
+def setup_test_table_with_versions():
+    """Create a test table with multiple versions for time travel tests (cloned from the fixture cache)."""
+    table_path = clone_fixture(_write_versioned_table, "delta_read_test", rows=scaled(ROWS_PER_VERSION))
+    print(f"[SETUP] Created test table with {VERSIONS} versions at {table_path}")
     return table_path
 
 
@@ -57,6 +68,7 @@ def test_load_table():
     print(f"[PASS] Loaded table from {table_path}")
     print(f"[PASS] Current version: {dt.version()}")
     print(f"[PASS] Number of files: {len(dt.file_uris())}")
+    assert dt.version() == VERSIONS - 1, f"Expected version {VERSIONS - 1}, got {dt.version()}"
 
 
 def test_read_as_arrow():
@@ -71,6 +83,8 @@ def test_read_as_arrow():
     print(f"[PASS] Schema: {arrow_table.schema}")
     print(f"[PASS] Num rows: {arrow_table.num_rows}")
     print(f"[PASS] Num columns: {arrow_table.num_columns}")
+    expected = VERSIONS * scaled(ROWS_PER_VERSION)
+    assert arrow_table.num_rows == expected, f"Expected {expected} rows, got {arrow_table.num_rows}"
 
 
 def test_read_as_pandas():
@@ -85,6 +99,7 @@ def test_read_as_pandas():
     print(f"[PASS] Shape: {pdf.shape}")
     print(f"[PASS] Columns: {list(pdf.columns)}")
     print(f"[PASS] Sample data:\n{pdf.head()}")
+    assert pdf.shape == (VERSIONS * scaled(ROWS_PER_VERSION), 2), f"Unexpected shape {pdf.shape}"
 
 
 def test_read_with_columns():
@@ -99,6 +114,8 @@ def test_read_with_columns():
     print(f"[PASS] Read only 'id' column")
     print(f"[PASS] Columns in result: {arrow_table.column_names}")
     print(f"[PASS] Num rows: {arrow_table.num_rows}")
+    assert arrow_table.column_names == ["id"], f"Expected only 'id', got {arrow_table.column_names}"
+    assert arrow_table.num_rows == VERSIONS * scaled(ROWS_PER_VERSION), "Column projection changed the row count"
 
 
 def test_read_with_filter():
@@ -108,10 +125,13 @@ def test_read_with_filter():
     table_path = get_table_path("delta_read_test")
     dt = DeltaTable(table_path)
 
-    # Read with filter
-    arrow_table = dt.to_pyarrow_table(filters=[("id", "<", 50)])
-    print(f"[PASS] Read with filter: id < 50")
-    print(f"[PASS] Num rows (should be 50): {arrow_table.num_rows}")
+    # Read with filter (ids are 0..n-1, so id < limit matches exactly `limit` rows)
+    limit = scaled(ROWS_PER_VERSION) // 2
+    arrow_table = dt.to_pyarrow_table(filters=[("id", "<", limit)])
+    print(f"[PASS] Read with filter: id < {limit}")
+    print(f"[PASS] Num rows (should be {limit}): {arrow_table.num_rows}")
+    assert arrow_table.num_rows == limit, f"Expected {limit} rows, got {arrow_table.num_rows}"
+    assert pc.all(pc.less(arrow_table["id"], limit), min_count=0).as_py(), "Filter returned ids past the limit"
 
 
 def test_time_travel_by_version():
@@ -119,21 +139,15 @@ def test_time_travel_by_version():
     print("\n=== Test: Time Travel by Version ===")
 
     table_path = get_table_path("delta_read_test")
+    rows = scaled(ROWS_PER_VERSION)
 
-    # Read version 0 (should have 100 rows)
-    dt_v0 = DeltaTable(table_path, version=0)
-    rows_v0 = len(dt_v0.to_pyarrow_table())
-    print(f"[PASS] Version 0 rows: {rows_v0} (expected: 100)")
-
-    # Read version 1 (should have 200 rows)
-    dt_v1 = DeltaTable(table_path, version=1)
-    rows_v1 = len(dt_v1.to_pyarrow_table())
-    print(f"[PASS] Version 1 rows: {rows_v1} (expected: 200)")
-
-    # Read version 2 / latest (should have 300 rows)
-    dt_v2 = DeltaTable(table_path, version=2)
-    rows_v2 = len(dt_v2.to_pyarrow_table())
-    print(f"[PASS] Version 2 rows: {rows_v2} (expected: 300)")
+    # Every version appends `rows` rows to the previous one
+    for version in range(VERSIONS):
+        dt = DeltaTable(table_path, version=version)
+        actual = len(dt.to_pyarrow_table())
+        expected = (version + 1) * rows
+        print(f"[PASS] Version {version} rows: {actual} (expected: {expected})")
+        assert actual == expected, f"Version {version}: expected {expected} rows, got {actual}"
 
 
 def test_read_table_history():
@@ -145,6 +159,7 @@ def test_read_table_history():
 
     history = dt.history()
     print(f"[PASS] Retrieved history with {len(history)} entries")
+    assert len(history) == VERSIONS, f"Expected {VERSIONS} history entries, got {len(history)}"
 
     for entry in history:
         version = entry.get("version", "N/A")
@@ -166,20 +181,46 @@ def test_read_file_uris():
         print(f"       - {f}")
 
 
+def test_read_file_stats():
+    """Test the data file statistics report and the files-scanned estimate."""
+    print("\n=== Test: Read File Stats ===")
+
+    table_path = get_table_path("delta_read_test")
+    dt = DeltaTable(table_path)
+
+    report = file_stats_report(dt)
+    for line in format_file_stats_report(report):
+        print(f"       - {line}")
+    assert report["files"] == len(dt.file_uris()), f"Expected {len(dt.file_uris())} files, got {report['files']}"
+    assert report["rows"] == VERSIONS * scaled(ROWS_PER_VERSION), f"Expected all rows, got {report['rows']}"
+    ids = report["columns"]["id"]
+    assert ids["coverage"] == 1.0, f"Expected id min/max in every file, got {ids['coverage']:.0%}"
+    # Every version appended its own id range, so no two files overlap
+    assert not ids["mean_overlap"], f"Expected disjoint id ranges, got {ids['mean_overlap']:.0%} overlap"
+    print(f"[PASS] Report covers {report['files']} files and {len(report['columns'])} columns")
+
+    last_version_start = (VERSIONS - 1) * scaled(ROWS_PER_VERSION)
+    for filters, expression in [
+        ([("id", ">=", last_version_start)], ds.field("id") >= last_version_start),
+        ([("value", "=", "version_1")], ds.field("value") == "version_1"),
+        ([("id", "<", 0)], ds.field("id") < 0),
+    ]:
+        estimate = estimate_files_scanned(dt, filters)
+        # The dataset's fragments carry the same statistics, so pyarrow prunes the same files
+        pruned = len(list(dt.to_pyarrow_dataset().get_fragments(filter=expression)))
+        assert estimate["files_scanned"] == pruned, \
+            f"{filters}: estimated {estimate['files_scanned']} files, the dataset scans {pruned}"
+        print(f"[PASS] {filters}: {estimate['files_scanned']} of {estimate['files']} files scanned")
+
+
 def run_all_read_tests():
     """Run all read operation tests."""
     print("\n" + "=" * 50)
     print("READ OPERATIONS TESTS")
     print("=" * 50)
 
-    # Connect to Hopsworks once
-    project = hopsworks.login(
-        host=HOPSWORKS_API_HOST,
-        port=HOPSWORKS_API_PORT,
-        api_key_value=HOPSWORKS_API_KEY
-    )
-    print(f"Connected to Hopsworks project: {project.name}")
-    set_project(project)
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
 
     # Setup test table with multiple versions
     setup_test_table_with_versions()
@@ -193,6 +234,7 @@ def run_all_read_tests():
         test_time_travel_by_version,
         test_read_table_history,
         test_read_file_uris,
+        test_read_file_stats,
     ]
 
     passed = 0
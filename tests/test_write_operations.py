@@ -1,20 +1,21 @@
 # -------------------------------
 # Phase 1: Write Operations Tests
 # -------------------------------
-# Tests: overwrite, append, partitioned writes, schema merge
+# Tests: overwrite, append, partitioned writes, schema merge, nested types
+#
+# Row counts are multiplied by the scale factor (--scale), so the same tests
+# run as load tests; assertions hold at any scale.
 
 from tests.config import (
-    HOPSWORKS_API_HOST,
-    HOPSWORKS_API_PORT,
-    HOPSWORKS_API_KEY,
     get_table_path,
-    set_project,
     cleanup_test_tables,
+    scaled,
 )
+from tests.session import login
+from tests.validation import assert_same_rows
 
 import pyarrow as pa
 import pandas as pd
-import hopsworks
 from deltalake import write_deltalake, DeltaTable
 
 
@@ -23,10 +24,11 @@ def test_write_overwrite():
     print("\n=== Test: Write Overwrite ===")
 
     table_path = get_table_path("delta_write_overwrite")
+    rows = scaled(100)
 
     df = pd.DataFrame({
-        "id": range(100),
-        "value": ["overwrite_test"] * 100
+        "id": range(rows),
+        "value": ["overwrite_test"] * rows
     })
     table = pa.Table.from_pandas(df, preserve_index=False)
 
@@ -35,8 +37,10 @@ def test_write_overwrite():
 
     # Verify by loading
     dt = DeltaTable(table_path)
+    result = dt.to_pyarrow_table()
     print(f"[PASS] Table version: {dt.version()}")
-    print(f"[PASS] Row count: {len(dt.to_pyarrow_table())}")
+    print(f"[PASS] Row count: {len(result)}")
+    assert len(result) == rows, f"Expected {rows} rows, got {len(result)}"
 
 
 def test_write_append():
@@ -44,11 +48,12 @@ def test_write_append():
     print("\n=== Test: Write Append ===")
 
     table_path = get_table_path("delta_write_append")
+    rows = scaled(100)
 
     # Initial write
     df1 = pd.DataFrame({
-        "id": range(100),
-        "value": ["batch_1"] * 100
+        "id": range(rows),
+        "value": ["batch_1"] * rows
     })
     table1 = pa.Table.from_pandas(df1, preserve_index=False)
     write_deltalake(table_path, table1, mode="overwrite")
@@ -56,8 +61,8 @@ def test_write_append():
 
     # Append
     df2 = pd.DataFrame({
-        "id": range(100, 200),
-        "value": ["batch_2"] * 100
+        "id": range(rows, 2 * rows),
+        "value": ["batch_2"] * rows
     })
     table2 = pa.Table.from_pandas(df2, preserve_index=False)
     write_deltalake(table_path, table2, mode="append")
@@ -74,6 +79,8 @@ def test_write_append():
     batch1_count = len(pdf[pdf["value"] == "batch_1"])
     batch2_count = len(pdf[pdf["value"] == "batch_2"])
     print(f"[PASS] Batch 1 rows: {batch1_count}, Batch 2 rows: {batch2_count}")
+    assert batch1_count == batch2_count == rows, f"Expected {rows} rows per batch"
+    assert pdf["id"].is_unique, "Appended ids overlap the initial ones"
 
 
 def test_write_partitioned():
@@ -81,11 +88,13 @@ def test_write_partitioned():
     print("\n=== Test: Write Partitioned ===")
 
     table_path = get_table_path("delta_write_partitioned")
+    rows = scaled(100)
+    categories = ["A", "B", "C"]
 
     df = pd.DataFrame({
-        "id": range(300),
-        "category": ["A"] * 100 + ["B"] * 100 + ["C"] * 100,
-        "value": [f"item_{i}" for i in range(300)]
+        "id": range(len(categories) * rows),
+        "category": [c for c in categories for _ in range(rows)],
+        "value": [f"item_{i}" for i in range(len(categories) * rows)]
     })
     table = pa.Table.from_pandas(df, preserve_index=False)
 
@@ -94,12 +103,17 @@ def test_write_partitioned():
 
     # Verify
     dt = DeltaTable(table_path)
+    result = dt.to_pyarrow_table()
     print(f"[PASS] Table version: {dt.version()}")
-    print(f"[PASS] Row count: {len(dt.to_pyarrow_table())}")
+    print(f"[PASS] Row count: {len(result)}")
+    counts = result.to_pandas()["category"].value_counts()
+    assert sorted(counts.index) == categories and (counts == rows).all(), \
+        f"Expected {rows} rows in each of {categories}, got {counts.to_dict()}"
 
     # List files to see partition structure
     files = dt.file_uris()
     print(f"[PASS] Number of data files: {len(files)}")
+    assert len(files) >= len(categories), f"Expected at least one file per partition, got {len(files)}"
     for f in files[:5]:  # Show first 5 files
         print(f"       - {f}")
 
@@ -112,11 +126,12 @@ def test_write_schema_evolution():
     import time
     unique_suffix = int(time.time()) % 10000
     table_path = get_table_path(f"delta_schema_evolve_{unique_suffix}")
+    rows = scaled(100)
 
     # Initial write with 2 columns
     df1 = pd.DataFrame({
-        "id": range(100),
-        "value": ["initial"] * 100
+        "id": range(rows),
+        "value": ["initial"] * rows
     })
     table1 = pa.Table.from_pandas(df1, preserve_index=False)
     write_deltalake(table_path, table1, mode="overwrite")
@@ -129,9 +144,9 @@ def test_write_schema_evolution():
 
     # Append with new column (schema evolution via merge)
     df2 = pd.DataFrame({
-        "id": range(100, 200),
-        "value": ["evolved"] * 100,
-        "new_column": ["new_data"] * 100
+        "id": range(rows, 2 * rows),
+        "value": ["evolved"] * rows,
+        "new_column": ["new_data"] * rows
     })
     table2 = pa.Table.from_pandas(df2, preserve_index=False)
 
@@ -149,7 +164,47 @@ def test_write_schema_evolution():
     new_schema = dt.schema()
     print(f"[PASS] Final version: {dt.version()}")
     print(f"[PASS] Final schema fields: {[f.name for f in new_schema.fields]}")
-    print(f"[PASS] Total rows: {len(dt.to_pyarrow_table())}")
+    total = len(dt.to_pyarrow_table())
+    print(f"[PASS] Total rows: {total}")
+    assert "new_column" in [f.name for f in new_schema.fields], "new_column missing after schema evolution"
+    # The overwrite fallback keeps only the second batch
+    assert total in (rows, 2 * rows), f"Expected {2 * rows} (or {rows} after overwrite) rows, got {total}"
+
+
+def test_write_nested_types():
+    """Test writing and reading back struct and list columns, compared with the validator."""
+    print("\n=== Test: Write Nested Types ===")
+
+    table_path = get_table_path("delta_write_nested")
+    rows = scaled(100)
+
+    table = pa.table({
+        "id": pa.array(range(rows), pa.int64()),
+        "features": pa.array(
+            [{"score": i * 0.5, "label": f"label_{i % 7}"} if i % 10 else None for i in range(rows)],
+            pa.struct([("score", pa.float64()), ("label", pa.string())]),
+        ),
+        "tags": pa.array([[f"tag_{j}" for j in range(i % 4)] if i % 9 else None for i in range(rows)],
+                         pa.list_(pa.string())),
+    })
+    write_deltalake(table_path, table, mode="overwrite")
+    print(f"[PASS] Wrote {rows} rows with a struct and a list column")
+
+    dt = DeltaTable(table_path)
+    assert_same_rows(table, dt.to_pyarrow_table())
+    assert_same_rows(table.to_pandas(), dt.to_pyarrow_dataset())
+    print("[PASS] Read back the same nested rows (Arrow and pandas input)")
+
+    # A changed list element must be reported, not hashed away
+    changed = table.set_column(2, "tags", pa.array([["changed"]] + table.column("tags").to_pylist()[1:],
+                                                    pa.list_(pa.string())))
+    try:
+        assert_same_rows(changed, dt.to_pyarrow_table())
+    except AssertionError as e:
+        assert "tags" in str(e), f"Expected the tags column to be reported: {e}"
+        print("[PASS] Changed list value detected")
+    else:
+        raise AssertionError("Changed list value was not detected")
 
 
 def test_hopsfs_schema():
@@ -159,10 +214,12 @@ def test_hopsfs_schema():
     table_path = get_table_path("delta_hopsfs_schema", schema="hopsfs")
     print(f"[INFO] Using hopsfs:// schema: {table_path}")
 
+    rows = scaled(100)
+
     # Write data using hopsfs:// schema
     df = pd.DataFrame({
-        "id": range(100),
-        "value": ["hopsfs_schema_test"] * 100
+        "id": range(rows),
+        "value": ["hopsfs_schema_test"] * rows
     })
     table = pa.Table.from_pandas(df, preserve_index=False)
 
@@ -178,7 +235,7 @@ def test_hopsfs_schema():
 
     # Verify data integrity
     pdf = result.to_pandas()
-    assert len(pdf) == 100, f"Expected 100 rows, got {len(pdf)}"
+    assert len(pdf) == rows, f"Expected {rows} rows, got {len(pdf)}"
     assert pdf["value"].iloc[0] == "hopsfs_schema_test", "Data mismatch"
     print("[PASS] Data integrity verified")
 
@@ -189,20 +246,15 @@ def run_all_write_tests():
     print("WRITE OPERATIONS TESTS")
     print("=" * 50)
 
-    # Connect to Hopsworks once
-    project = hopsworks.login(
-        host=HOPSWORKS_API_HOST,
-        port=HOPSWORKS_API_PORT,
-        api_key_value=HOPSWORKS_API_KEY
-    )
-    print(f"Connected to Hopsworks project: {project.name}")
-    set_project(project)
+    # Connect to Hopsworks once (needed for table cleanup)
+    login()
 
     tests = [
         test_write_overwrite,
         test_write_append,
         test_write_partitioned,
         test_write_schema_evolution,
+        test_write_nested_types,
         test_hopsfs_schema,
     ]
 
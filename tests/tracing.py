@@ -0,0 +1,191 @@
+# -------------------------------
+# Tracing of delta operations
+# -------------------------------
+# Records a span for every deltalake operation a test makes: write_deltalake,
+# DeltaTable loads, merge, update, delete, optimize (compact, z-order),
+# vacuum, restore and create_checkpoint. Each span has attributes: the
+# table, the version before and after, rows and bytes written and the
+# metrics dict the operation returned. The runner's --trace option also wraps
+# every test in a span, so operations are grouped by test.
+#
+# Spans are written in the Chrome trace event format (complete "X" events),
+# which Perfetto (ui.perfetto.dev), chrome://tracing and speedscope open
+# directly. Spans of one thread nest by time.
+#
+# install_tracing patches the deltalake functions and classes, so it must run
+# before test modules bind write_deltalake at import time. Operations in
+# processes spawned by a test (e.g. tests/test_concurrency.py) are not traced.
+# write_deltalake to a path records no versions: finding them would cost a
+# table load inside the span. Its own existence check shows up as a nested
+# DeltaTable span, with found=False when the table does not exist yet.
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import deltalake
+import deltalake.writer
+from deltalake import DeltaTable
+from deltalake.exceptions import TableNotFoundError
+from deltalake.table import TableMerger, TableOptimizer
+
+# Trace file written at the end of a run (CLI: --trace, env: DELTARS_TRACE)
+TRACE_FILE = os.environ.get("DELTARS_TRACE") or None
+
+# DeltaTable methods traced, as span names
+_TABLE_METHODS = ("update", "delete", "vacuum", "restore", "create_checkpoint")
+
+_events: list[dict] = []
+_thread_names: dict[tuple, str] = {}
+_events_lock = threading.Lock()
+_installed = False
+_origin = time.perf_counter()
+
+
+@contextmanager
+def span(name: str, category: str = "delta", **attributes):
+    """Record the block as one span; a no-op until install_tracing has run.
+
+    Yields the attribute dict, to which the block can add results.
+
+    Args:
+        name: Span name, e.g. "merge"
+        category: Span category ("delta" for operations, "test" for tests)
+        **attributes: Initial attributes, e.g. table
+    """
+    if not _installed:
+        yield attributes
+        return
+
+    start = time.perf_counter()
+    try:
+        yield attributes
+    except Exception as e:
+        attributes["error"] = str(e)
+        raise
+    finally:
+        end = time.perf_counter()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - _origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {k: v for k, v in attributes.items() if v is not None},
+        }
+        with _events_lock:
+            _events.append(event)
+            _thread_names.setdefault((event["pid"], event["tid"]), threading.current_thread().name)
+
+
+def _data_size(data) -> tuple[int | None, int | None]:
+    """Rows and in-memory bytes of the data passed to write_deltalake, if known."""
+    if hasattr(data, "num_rows") and hasattr(data, "nbytes"):
+        return data.num_rows, data.nbytes
+    if hasattr(data, "memory_usage"):
+        return len(data), int(data.memory_usage(deep=True).sum())
+    return None, None
+
+
+def _record_result(attributes: dict, result):
+    if isinstance(result, dict):
+        attributes["metrics"] = result
+    elif isinstance(result, list):
+        attributes["files"] = len(result)
+
+
+def _trace_write(original):
+    @functools.wraps(original)
+    def write_deltalake(table_or_uri, data, *args, **kwargs):
+        rows, size = _data_size(data)
+        table = table_or_uri if isinstance(table_or_uri, DeltaTable) else None
+        with span("write_deltalake",
+                  table=table.table_uri if table else str(table_or_uri),
+                  mode=kwargs.get("mode", "error"),
+                  rows=rows,
+                  bytes=size,
+                  version_before=table.version() if table else None) as attributes:
+            result = original(table_or_uri, data, *args, **kwargs)
+            if table:
+                attributes["version_after"] = table.version()
+            return result
+    return write_deltalake
+
+
+def _trace_method(cls, method_name: str, span_name: str, table_of):
+    """Replace cls.method_name with a traced version; table_of(self) -> (uri, version function)."""
+    original = getattr(cls, method_name)
+
+    @functools.wraps(original)
+    def traced(self, *args, **kwargs):
+        uri, version = table_of(self)
+        with span(span_name, table=uri, version_before=version()) as attributes:
+            result = original(self, *args, **kwargs)
+            attributes["version_after"] = version()
+            _record_result(attributes, result)
+            return result
+
+    setattr(cls, method_name, traced)
+
+
+def _trace_load(original):
+    @functools.wraps(original)
+    def __init__(self, table_uri, *args, **kwargs):
+        # write_deltalake to a path probes whether the table exists by loading
+        # it, so a missing table is an expected miss (found=False), not an error
+        missing = None
+        with span("DeltaTable", table=str(table_uri), version_requested=kwargs.get("version")) as attributes:
+            try:
+                original(self, table_uri, *args, **kwargs)
+            except TableNotFoundError as e:
+                attributes["found"] = False
+                missing = e
+            else:
+                attributes["version_after"] = self.version()
+        if missing is not None:
+            raise missing
+    return __init__
+
+
+def install_tracing():
+    """Start recording spans for deltalake operations (idempotent)."""
+    global _installed
+    if _installed:
+        return
+
+    traced_write = _trace_write(deltalake.write_deltalake)
+    deltalake.write_deltalake = traced_write
+    deltalake.writer.write_deltalake = traced_write
+    DeltaTable.__init__ = _trace_load(DeltaTable.__init__)
+
+    def of_table(dt):
+        return dt.table_uri, dt.version
+
+    for method_name in _TABLE_METHODS:
+        _trace_method(DeltaTable, method_name, method_name, of_table)
+    _trace_method(TableMerger, "execute", "merge", lambda m: (m._table.table_uri(), m._table.version))
+    _trace_method(TableOptimizer, "compact", "optimize.compact", lambda o: of_table(o.table))
+    _trace_method(TableOptimizer, "z_order", "optimize.z_order", lambda o: of_table(o.table))
+    _installed = True
+
+
+def write_trace(path: str) -> int:
+    """Write the spans recorded so far as a Chrome trace JSON file; returns the number of spans.
+
+    Args:
+        path: Output file, e.g. trace.json
+    """
+    with _events_lock:
+        events = list(_events)
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for (pid, tid), name in _thread_names.items()
+        ]
+    with open(path, "w") as f:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f, default=str)
+    return len(events)
@@ -0,0 +1,267 @@
+# -------------------------------
+# Order-independent dataset comparison
+# -------------------------------
+# Compares two datasets as multisets of rows without sorting them. Every
+# value is hashed, the column hashes of a row are combined into a row hash,
+# and two sums modulo 2**64 are kept: of the row hashes and of a remix of them
+# (so that differences cannot cancel out in one linear sum). The sums do not
+# depend on row order and are accumulated chunk by chunk, so Arrow datasets
+# are streamed rather than materialized. Checks run cheapest first:
+#   1. column names and row count
+#   2. per-column checksums (sum of value hashes) and row digests
+# Only on a mismatch are the differing rows looked up and reported.
+#
+# pyarrow has no vectorized per-value hash kernel, so values are hashed with
+# pandas' hash_pandas_object. To keep hashes independent of where the data
+# came from, every chunk (pandas input included) is first cast to a canonical
+# Arrow type per column (int64, float64, large_string, timestamp[ns], ...;
+# see _canonical_type) and converted to pandas the same way, with nullable
+# dtypes so integer columns with nulls keep their values. Columns whose
+# canonical types still differ cannot match and are named in the report.
+# hash_pandas_object cannot hash nested values (structs, lists, maps), so
+# those columns are cast with canonical child types and then JSON-encoded
+# per value; this is slower than the vectorized path but only for them.
+
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+# hash_pandas_object keys must be 16 bytes
+HASH_KEY = "deltars-rowhash1"
+
+# Rows hashed per chunk
+CHUNK_ROWS = 100_000
+
+# Multiplier used to combine column hashes into one row hash
+_COMBINE_MULTIPLIER = np.uint64(1000003)
+
+
+def _as_arrow(data):
+    """Return pandas DataFrames and pyarrow tables/datasets as is, wrap other Arrow streams (e.g. arro3)."""
+    if isinstance(data, (pd.DataFrame, pa.Table, ds.Dataset)):
+        return data
+    return pa.table(data)
+
+
+def _column_names(data) -> list[str]:
+    if isinstance(data, pd.DataFrame):
+        return list(data.columns)
+    return list(data.schema.names)
+
+
+def _num_rows(data) -> int:
+    if isinstance(data, ds.Dataset):
+        return data.count_rows()
+    return len(data) if isinstance(data, pd.DataFrame) else data.num_rows
+
+
+def _canonical_type(arrow_type: pa.DataType) -> pa.DataType:
+    """Type a column is cast to before hashing, so widths and encodings do not change the hash."""
+    if pa.types.is_dictionary(arrow_type):
+        return _canonical_type(arrow_type.value_type)
+    if pa.types.is_integer(arrow_type):
+        return pa.int64()
+    if pa.types.is_floating(arrow_type):
+        return pa.float64()
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type) or pa.types.is_string_view(arrow_type):
+        return pa.large_string()
+    if pa.types.is_binary(arrow_type) or pa.types.is_large_binary(arrow_type) or pa.types.is_binary_view(arrow_type):
+        return pa.large_binary()
+    if pa.types.is_timestamp(arrow_type):
+        # Delta stores microseconds, pandas defaults to nanoseconds
+        return pa.timestamp("ns", tz=arrow_type.tz)
+    if pa.types.is_struct(arrow_type):
+        return pa.struct([field.with_type(_canonical_type(field.type)) for field in arrow_type])
+    if pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type) or pa.types.is_fixed_size_list(arrow_type):
+        return pa.large_list(_canonical_type(arrow_type.value_type))
+    if pa.types.is_map(arrow_type):
+        return pa.map_(_canonical_type(arrow_type.key_type), _canonical_type(arrow_type.item_type))
+    return arrow_type
+
+
+def _hashable(array: pa.Array) -> pa.Array:
+    """Cast a column to its canonical type; nested values become JSON strings, which pandas can hash."""
+    array = array.cast(_canonical_type(array.type))
+    if not pa.types.is_nested(array.type):
+        return array
+    return pa.array(
+        [None if value is None else json.dumps(value, default=str, separators=(",", ":"))
+         for value in array.to_pylist()],
+        pa.large_string(),
+    )
+
+
+# Nullable pandas dtypes, so nulls do not turn integers into floats
+_PANDAS_TYPES = {
+    pa.int64(): pd.Int64Dtype(),
+    pa.float64(): pd.Float64Dtype(),
+    pa.bool_(): pd.BooleanDtype(),
+}
+
+
+def _arrow_chunks(data, columns: list[str], chunk_rows: int):
+    """Yield Arrow record batches of the given columns, in that column order."""
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), chunk_rows):
+            yield from pa.Table.from_pandas(data.iloc[start:start + chunk_rows][columns],
+                                            preserve_index=False).to_batches()
+    elif isinstance(data, ds.Dataset):
+        yield from data.to_batches(columns=columns, batch_size=chunk_rows)
+    else:
+        yield from data.select(columns).to_batches(max_chunksize=chunk_rows)
+
+
+def _iter_chunks(data, columns: list[str], chunk_rows: int):
+    """Yield pandas chunks of the given columns, in that column order, with canonical column types."""
+    for batch in _arrow_chunks(data, columns, chunk_rows):
+        arrays = [_hashable(batch.column(i)) for i in range(len(columns))]
+        yield pa.table(arrays, names=columns).to_pandas(types_mapper=_PANDAS_TYPES.get)
+
+
+def _canonical_types(data, columns: list[str]) -> dict:
+    """Canonical type of each column (from the schema, or the first rows of a DataFrame)."""
+    if isinstance(data, pd.DataFrame):
+        schema = pa.Table.from_pandas(data.iloc[:CHUNK_ROWS][columns], preserve_index=False).schema
+    else:
+        schema = data.schema
+    return {column: _canonical_type(schema.field(column).type) for column in columns}
+
+
+def _row_hashes(chunk: pd.DataFrame) -> tuple[np.ndarray, list[np.ndarray]]:
+    """Hash every value of a chunk; returns (row hashes, per-column value hashes)."""
+    column_hashes = [
+        pd.util.hash_pandas_object(chunk[column], index=False, hash_key=HASH_KEY).to_numpy()
+        for column in chunk.columns
+    ]
+    rows = np.zeros(len(chunk), dtype=np.uint64)
+    for hashes in column_hashes:
+        rows = rows * _COMBINE_MULTIPLIER ^ hashes
+    return rows, column_hashes
+
+
+def _remix(hashes: np.ndarray) -> np.ndarray:
+    """Non-linear bijection of 64-bit hashes (splitmix64 finalizer)."""
+    hashes = hashes ^ (hashes >> np.uint64(30))
+    hashes = hashes * np.uint64(0xBF58476D1CE4E5B9)
+    hashes = hashes ^ (hashes >> np.uint64(27))
+    hashes = hashes * np.uint64(0x94D049BB133111EB)
+    return hashes ^ (hashes >> np.uint64(31))
+
+
+def dataset_digest(data, columns: list[str] | None = None, chunk_rows: int = CHUNK_ROWS) -> dict:
+    """Compute an order-independent digest of a dataset.
+
+    Args:
+        data: pandas DataFrame, pyarrow Table or Dataset, or any Arrow stream
+        columns: Columns to include, in this order (default: all)
+        chunk_rows: Rows hashed per chunk
+
+    Returns:
+        Dict with rows, columns, column_checksums (name -> int) and
+        row_digest (sums of the row hashes and of their remix)
+    """
+    data = _as_arrow(data)
+    columns = columns or _column_names(data)
+    column_checksums = [0] * len(columns)
+    row_digest = [0, 0]
+    rows = 0
+
+    for chunk in _iter_chunks(data, columns, chunk_rows):
+        rows += len(chunk)
+        row_hashes, column_hashes = _row_hashes(chunk)
+        for k, hashes in enumerate((row_hashes, _remix(row_hashes))):
+            row_digest[k] = (row_digest[k] + int(hashes.sum(dtype=np.uint64))) % 2**64
+        for i, hashes in enumerate(column_hashes):
+            column_checksums[i] = (column_checksums[i] + int(hashes.sum(dtype=np.uint64))) % 2**64
+
+    return {
+        "rows": rows,
+        "columns": columns,
+        "column_checksums": dict(zip(columns, column_checksums)),
+        "row_digest": tuple(row_digest),
+    }
+
+
+def _differing_rows(expected, actual, columns: list[str], key_columns: list[str], max_report: int,
+                    chunk_rows: int) -> tuple[list[dict], list[dict]]:
+    """Find up to max_report rows missing from actual and unexpected in actual."""
+    def counts(data):
+        hashes = [_row_hashes(chunk)[0] for chunk in _iter_chunks(data, columns, chunk_rows)]
+        return pd.Series(np.concatenate(hashes) if hashes else np.array([], dtype=np.uint64)).value_counts()
+
+    difference = counts(expected).sub(counts(actual), fill_value=0)
+    missing = set(difference[difference > 0].index[:max_report])
+    unexpected = set(difference[difference < 0].index[:max_report])
+
+    def rows_with_hashes(data, wanted):
+        found = []
+        for chunk in _iter_chunks(data, columns, chunk_rows):
+            if len(found) >= max_report or not wanted:
+                break
+            match = np.isin(_row_hashes(chunk)[0], list(wanted))
+            found.extend(chunk.loc[match, key_columns].to_dict("records"))
+        return found[:max_report]
+
+    return rows_with_hashes(expected, missing), rows_with_hashes(actual, unexpected)
+
+
+def assert_same_rows(expected, actual, key_columns: list[str] | None = None, max_report: int = 5,
+                     chunk_rows: int = CHUNK_ROWS) -> dict:
+    """Assert that two datasets contain the same rows, in any order.
+
+    Column order is ignored; duplicate rows must occur equally often.
+
+    Args:
+        expected: pandas DataFrame, pyarrow Table or Dataset, or any Arrow stream
+        actual: Same types as expected
+        key_columns: Columns shown for differing rows (default: all columns)
+        max_report: Maximum number of missing and unexpected rows reported
+        chunk_rows: Rows hashed per chunk
+
+    Returns:
+        The digest of the (equal) datasets
+
+    Raises:
+        AssertionError: Naming the differing columns and the first differing rows
+    """
+    expected, actual = _as_arrow(expected), _as_arrow(actual)
+    columns = _column_names(expected)
+    actual_columns = _column_names(actual)
+    if set(columns) != set(actual_columns):
+        raise AssertionError(
+            f"Column mismatch: missing {sorted(set(columns) - set(actual_columns))}, "
+            f"unexpected {sorted(set(actual_columns) - set(columns))}"
+        )
+
+    expected_types, actual_types = _canonical_types(expected, columns), _canonical_types(actual, columns)
+    type_differences = [
+        f"{c} ({expected_types[c]} vs {actual_types[c]})" for c in columns if expected_types[c] != actual_types[c]
+    ]
+
+    expected_rows, actual_rows = _num_rows(expected), _num_rows(actual)
+    if expected_rows == actual_rows:
+        expected_digest = dataset_digest(expected, columns, chunk_rows)
+        actual_digest = dataset_digest(actual, columns, chunk_rows)
+        if expected_digest["row_digest"] == actual_digest["row_digest"]:
+            return expected_digest
+        differing_columns = [
+            c for c in columns
+            if expected_digest["column_checksums"][c] != actual_digest["column_checksums"][c]
+        ]
+        problem = f"Data mismatch in {expected_rows} rows; differing columns: {differing_columns or 'none (rows recombined)'}"
+    else:
+        problem = f"Row count mismatch: expected {expected_rows}, got {actual_rows}"
+
+    if type_differences:
+        problem += f"; column types differ: {', '.join(type_differences)}"
+    missing, unexpected = _differing_rows(expected, actual, columns, key_columns or columns, max_report, chunk_rows)
+    if missing and len(missing) == len(unexpected) and repr(missing) == repr(unexpected):
+        problem += " (the differing rows print the same and differ only in type)"
+    raise AssertionError(
+        f"{problem}\n"
+        f"First rows missing from actual: {missing}\n"
+        f"First unexpected rows in actual: {unexpected}"
+    )